@@ -0,0 +1,60 @@
+from playwright.async_api import async_playwright
+
+import config
+from browser_profile import block_requests_async, context_options, get_profile
+from service.metrics import METRICS
+
+
+class AsyncBrowserSession:
+    """One isolated browser context + page driven from the event loop"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+
+    async def close(self):
+        await self.context.close()
+
+
+class AsyncPlaywrightManager:
+    """
+    Async browser with the same launch profile as PlaywrightManager, minus
+    the persistent disk cache: sessions need separate contexts, which a
+    persistent (single-context) launch cannot provide.
+    """
+
+    def __init__(self, headless=None, profile=None):
+        self.profile = get_profile(profile)
+        self.headless = self.profile.headless if headless is None else headless
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    async def start(self):
+        with METRICS.timer("browser_start", profile=self.profile.name, persistent=False):
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=self.profile.args
+            )
+            self.context = await self.browser.new_context(**context_options(self.profile))
+            self.page = await self.context.new_page()
+            await block_requests_async(self.context, self.page, self.profile)
+
+        # Go to GeM homepage first
+        with METRICS.timer("navigation", step="home"):
+            await self.page.goto(config.GEM_HOME_URL, timeout=60000)
+
+    async def new_session(self):
+        """Open an extra isolated context (own cookies and captcha flow)"""
+        context = await self.browser.new_context(**context_options(self.profile))
+        page = await context.new_page()
+        await block_requests_async(context, page, self.profile)
+        return AsyncBrowserSession(context, page)
+
+    async def stop(self):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
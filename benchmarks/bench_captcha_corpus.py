@@ -0,0 +1,63 @@
+"""
+Replay the captcha corpus through a solver configuration.
+
+    python -m benchmarks.bench_captcha_corpus
+    python -m benchmarks.bench_captcha_corpus --no-adaptive --no-classifier --backend pytesseract
+    python -m benchmarks.bench_captcha_corpus --kind modal --workers 8 --agree 2
+
+Only captchas the portal accepted are replayed (their accepted guess is the
+label). Reports accuracy, p50/p95 solve latency and OCR passes per solve.
+"""
+
+import argparse
+import time
+
+import config
+from solver.captcha_corpus import CORPUS_PATH, CaptchaCorpus
+from solver.captcha_solver import PASS_COUNTER, ensemble_solve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(CORPUS_PATH))
+    parser.add_argument("--kind", choices=["search", "modal"], help="only one captcha source")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--backend", default=config.OCR_BACKEND, choices=["auto", "tesserocr", "pytesseract"])
+    parser.add_argument("--workers", type=int, default=1, help="solver pool size (1 = serial)")
+    parser.add_argument("--no-adaptive", action="store_true", help="always run all 25 passes")
+    parser.add_argument("--agree", type=int, default=config.SOLVER_AGREE_VOTES)
+    parser.add_argument("--no-classifier", action="store_true")
+    args = parser.parse_args()
+
+    # Solver configuration under test
+    config.OCR_BACKEND = args.backend
+    config.SOLVER_WORKERS = args.workers
+    config.SOLVER_ADAPTIVE = not args.no_adaptive
+    config.SOLVER_AGREE_VOTES = args.agree
+    config.CLASSIFIER_ENABLED = not args.no_classifier
+
+    corpus = CaptchaCorpus(args.corpus)
+    samples = corpus.labelled(kind=args.kind, limit=args.limit or None)
+    print(f"[BENCH] corpus {corpus.summary()} → replaying {len(samples)} labelled captchas")
+    corpus.close()
+    if not samples:
+        return
+
+    correct, runs, passes = 0, [], []
+    for image, label, _ in samples:
+        before = PASS_COUNTER.value
+        started = time.perf_counter()
+        text, _ = ensemble_solve(image)
+        runs.append(time.perf_counter() - started)
+        passes.append(PASS_COUNTER.value - before)
+        correct += text == label
+
+    runs.sort()
+    print(f"[BENCH] accuracy        : {correct / len(samples):.1%} ({correct}/{len(samples)})")
+    print(f"[BENCH] latency p50     : {runs[len(runs) // 2] * 1000:.1f} ms")
+    print(f"[BENCH] latency p95     : {runs[min(len(runs) - 1, int(len(runs) * 0.95))] * 1000:.1f} ms")
+    print(f"[BENCH] passes per solve: {sum(passes) / len(passes):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: glyph classifier vs tesseract ensemble vs gated combination.
+
+    python -m benchmarks.bench_glyph_classifier --images labelled/ [--limit 100]
+
+Uses the trained model at data/solver/glyph_model.npz; labels come from
+file names as in tools.train_glyph_classifier.
+"""
+
+import argparse
+import time
+
+import config
+from solver import captcha_solver
+from solver.glyph_classifier import GlyphClassifier, MODEL_PATH
+from tools.train_glyph_classifier import load_labelled
+
+
+def run(name, solve, samples):
+    correct, runs = 0, []
+    for img, label in samples:
+        started = time.perf_counter()
+        text, _ = solve(img)
+        runs.append(time.perf_counter() - started)
+        correct += text == label
+
+    runs.sort()
+    print(
+        f"[BENCH] {name:<12} accuracy {correct / max(1, len(samples)):6.1%} | "
+        f"p50 {runs[len(runs) // 2] * 1000:8.1f} ms | "
+        f"p95 {runs[min(len(runs) - 1, int(len(runs) * 0.95))] * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True)
+    parser.add_argument("--limit", type=int, default=0)
+    args = parser.parse_args()
+
+    samples = load_labelled(args.images)
+    if args.limit:
+        samples = samples[:args.limit]
+    print(f"[BENCH] {len(samples)} labelled captchas")
+
+    model = GlyphClassifier.load(MODEL_PATH)
+    run("classifier", model.classify, samples)
+
+    config.CLASSIFIER_ENABLED = False
+    run("ensemble", captcha_solver.ensemble_solve, samples)
+
+    config.CLASSIFIER_ENABLED = True
+    run("gated", captcha_solver.ensemble_solve, samples)
+
+
+if __name__ == "__main__":
+    main()
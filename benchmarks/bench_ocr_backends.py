@@ -0,0 +1,68 @@
+"""
+Benchmark: per-captcha OCR latency, pytesseract (subprocess) vs tesserocr (in-process).
+
+    python -m benchmarks.bench_ocr_backends --images captchas/ --limit 50
+
+Every captcha runs the full 25-pass ensemble (no early exit) on each
+backend, serially, so the numbers isolate the OCR engine cost.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from solver.captcha_solver import ALLOWED, ocr_passes, safe_ocr_pass, smart_vote
+from solver.ocr_backends import BACKENDS, get_backend
+
+
+def solve_with(backend, img):
+    passes = ocr_passes(img)
+    results = [safe_ocr_pass(variant, psm, backend) for _, variant, psm in passes]
+    return smart_vote([r for r in results if r])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True, help="directory of captcha images (png/jpg)")
+    parser.add_argument("--limit", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in (".png", ".jpg", ".jpeg"))
+    if args.limit:
+        paths = paths[:args.limit]
+    images = [Image.open(p).copy() for p in paths]
+    print(f"[BENCH] {len(images)} captchas")
+
+    answers = {}
+    for name in BACKENDS:
+        try:
+            get_backend(ALLOWED, name)
+        except ImportError as e:
+            print(f"[BENCH] {name:<12} unavailable: {e}")
+            continue
+        solve_with(name, images[0])  # warm-up (engine init)
+
+        runs, answers[name] = [], []
+        for img in images:
+            started = time.perf_counter()
+            answers[name].append(solve_with(name, img))
+            runs.append(time.perf_counter() - started)
+
+        runs.sort()
+        print(
+            f"[BENCH] {name:<12} mean {statistics.mean(runs) * 1000:7.1f} ms | "
+            f"p50 {runs[len(runs) // 2] * 1000:7.1f} ms | "
+            f"p95 {runs[min(len(runs) - 1, int(len(runs) * 0.95))] * 1000:7.1f} ms"
+        )
+
+    if len(answers) == 2:
+        a, b = answers.values()
+        same = sum(x == y for x, y in zip(a, b))
+        print(f"[BENCH] identical answers: {same}/{len(images)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: bytes transferred and load time per navigation, full vs. lean profile.
+
+    python -m benchmarks.bench_page_load [--rounds 5] [--profiles full lean]
+
+Each profile gets a fresh browser that loads the GeM homepage and then
+view_contracts `--rounds` times (the reset_to_home / go_to_gem_contracts
+pair every category pays). The first round of the lean profile fills its
+disk cache; later rounds (and later runs) show the cached cost.
+"""
+
+import argparse
+import statistics
+import time
+
+import config
+from browser_profile import NAV_STATS_JS, PROFILES
+from playwright_manager import PlaywrightManager
+
+CONTRACTS_URL = config.GEM_HOME_URL + "view_contracts"
+
+
+def run_profile(name, rounds):
+    browser = PlaywrightManager(profile=name)
+    started = time.perf_counter()
+    browser.start()
+    startup = time.perf_counter() - started
+
+    samples = {"home": [], "view_contracts": []}
+    try:
+        for _ in range(rounds):
+            for step, url in (("home", config.GEM_HOME_URL), ("view_contracts", CONTRACTS_URL)):
+                t = time.perf_counter()
+                browser.page.goto(url, timeout=60000, wait_until="load")
+                wall_ms = (time.perf_counter() - t) * 1000
+                stats = browser.page.evaluate(NAV_STATS_JS)
+                samples[step].append((wall_ms, stats["bytes"], stats["requests"], stats["cached"]))
+    finally:
+        browser.stop()
+    return startup, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<6} {'page':<15} {'first KB':>9} {'warm KB':>9} {'median ms':>10} {'requests':>9} {'cached':>7}")
+    for name in args.profiles:
+        startup, samples = run_profile(name, args.rounds)
+        for step, rows in samples.items():
+            warm = rows[1:] or rows
+            print(
+                f"{name:<6} {step:<15} {rows[0][1] / 1024:>9.1f} "
+                f"{statistics.mean(r[1] for r in warm) / 1024:>9.1f} "
+                f"{statistics.median(r[0] for r in rows):>10.0f} "
+                f"{statistics.mean(r[2] for r in warm):>9.0f} {statistics.mean(r[3] for r in warm):>7.0f}"
+            )
+        print(f"{name:<6} {'startup':<15} {startup:>9.1f}s")
+
+
+if __name__ == "__main__":
+    main()
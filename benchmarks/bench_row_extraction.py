@@ -0,0 +1,128 @@
+"""
+Benchmark: per-field locator extraction vs. one-shot bulk extraction.
+
+    python -m benchmarks.bench_row_extraction --html saved_results.html
+    python -m benchmarks.bench_row_extraction --cards 50 --drop-every 7
+
+Without --html a synthetic results page is generated; --drop-every removes
+one brand span every N cards to show how global nth(i * k) indexing shifts
+every later row while the per-card extractor stays aligned.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from controller.row_extractor import CARD_FIELDS, extract_cards
+
+
+# --------------------------------------------------
+# BASELINE (THE OLD process_rows FIELD READS)
+# --------------------------------------------------
+def legacy_extract(page):
+    def nodes(cls):
+        return page.locator(f"span.{cls}")
+
+    bid_nodes = nodes("ajxtag_order_number")
+    item_nodes = nodes("ajxtag_item_title")
+    qty_nodes = nodes("ajxtag_quantity")
+    value_nodes = nodes("ajxtag_totalvalue")
+    buyer_nodes = nodes("ajxtag_buyer_dept_org")
+    mode_nodes = nodes("ajxtag_buying_mode")
+    date_nodes = nodes("ajxtag_contract_date")
+    status_nodes = nodes("ajxtag_order_status")
+
+    def text(loc, k):
+        if k >= loc.count():
+            return ""
+        return loc.nth(k).inner_text().strip()
+
+    records = []
+    for i in range(bid_nodes.count()):
+        records.append({
+            "index": i,
+            "bid_no": text(bid_nodes, i),
+            "product": text(item_nodes, i * 3),
+            "brand": text(item_nodes, i * 3 + 1),
+            "model": text(item_nodes, i * 3 + 2),
+            "ordered_quantity": text(qty_nodes, i),
+            "total_value": text(value_nodes, i * 2),
+            "price": text(value_nodes, i * 2 + 1),
+            "buyer_dept_org": text(buyer_nodes, i * 3),
+            "organization_name": text(buyer_nodes, i * 3 + 1),
+            "buyer_designation": text(buyer_nodes, i * 3 + 2),
+            "state": text(mode_nodes, i * 4),
+            "buyer_department": text(mode_nodes, i * 4 + 1),
+            "office_zone": text(mode_nodes, i * 4 + 2),
+            "buying_mode": text(mode_nodes, i * 4 + 3),
+            "contract_date": text(date_nodes, i),
+            "order_status": text(status_nodes, i),
+        })
+    return records
+
+
+# --------------------------------------------------
+# SYNTHETIC RESULTS PAGE
+# --------------------------------------------------
+def synthetic_page(cards, drop_every=0):
+    blocks = []
+    for i in range(cards):
+        spans = []
+        for cls, names in CARD_FIELDS.items():
+            for name in names:
+                if drop_every and name == "brand" and i % drop_every == drop_every - 1:
+                    continue
+                value = f"C{i}" if name == "bid_no" else f"{name}-{i}"
+                spans.append(f'<p><span class="{cls}">{value}</span></p>')
+        blocks.append(f'<div class="border block"><div class="col">{"".join(spans)}</div></div>')
+    return f"<html><body><div id='pagi_content'>{''.join(blocks)}</div></body></html>"
+
+
+def _time(fn, page, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(page)
+        runs.append(time.perf_counter() - started)
+    return result, runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html", help="saved GeM results page")
+    parser.add_argument("--cards", type=int, default=30, help="synthetic cards when no --html")
+    parser.add_argument("--drop-every", type=int, default=0, help="drop a brand span every N cards")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.html:
+        html = Path(args.html).read_text(encoding="utf-8")
+    else:
+        html = synthetic_page(args.cards, args.drop_every)
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(html)
+
+        legacy, legacy_runs = _time(legacy_extract, page, args.repeat)
+        bulk, bulk_runs = _time(extract_cards, page, args.repeat)
+
+        browser.close()
+
+    mismatched = sum(1 for a, b in zip(legacy, bulk) if a != b)
+    legacy_med = statistics.median(legacy_runs)
+    bulk_med = statistics.median(bulk_runs)
+
+    print(f"[BENCH] cards: {len(bulk)}")
+    print(f"[BENCH] per-field locators : {legacy_med * 1000:8.1f} ms (median of {args.repeat})")
+    print(f"[BENCH] bulk evaluate      : {bulk_med * 1000:8.1f} ms (median of {args.repeat})")
+    print(f"[BENCH] speed-up           : {legacy_med / max(bulk_med, 1e-9):8.1f}x")
+    print(f"[BENCH] rows that differ   : {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
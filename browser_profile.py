@@ -0,0 +1,131 @@
+"""
+Browser launch profiles and per-navigation load report.
+
+- full: the original setup (headed, maximised, nothing blocked).
+- lean: headless, fixed small viewport, trimmed Chromium features,
+  images/fonts/media and third-party trackers blocked, and a persistent
+  user-data dir so the HTTP disk cache survives between runs.
+
+Blocking goes through CDP Network.setBlockedURLs rather than page.route():
+Playwright disables the HTTP cache for any context with routes, which
+would defeat the disk cache. Captcha images are inline data: URIs and are
+never matched.
+"""
+
+from collections import namedtuple
+from pathlib import Path
+
+import config
+
+BROWSER_DATA_DIR = Path(__file__).resolve().parent / "data" / "browser"
+
+BrowserProfile = namedtuple("BrowserProfile", "name headless args viewport persistent blocked")
+
+LEAN_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--no-first-run",
+    "--mute-audio",
+    "--disable-gpu",
+]
+
+BLOCKED_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "ogg",
+]
+
+BLOCKED_URL_PATTERNS = (
+    [f"*.{ext}" for ext in BLOCKED_EXTENSIONS]
+    + [f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS]
+    + [f"*{host}*" for host in config.BLOCKED_HOSTS]
+)
+
+PROFILES = {
+    "full": BrowserProfile("full", False, ["--start-maximized"], None, False, ()),
+    "lean": BrowserProfile("lean", True, LEAN_ARGS, config.VIEWPORT, True, tuple(BLOCKED_URL_PATTERNS)),
+}
+
+
+def get_profile(name=None):
+    return PROFILES[name or config.BROWSER_PROFILE]
+
+
+def context_options(profile):
+    options = {"viewport": profile.viewport}
+    if profile.viewport:
+        options.update(device_scale_factor=1, reduced_motion="reduce")
+    return options
+
+
+def block_requests(context, page, profile):
+    """Install the profile's URL block list on a page (sync API)"""
+    if not profile.blocked:
+        return
+    cdp = context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.setBlockedURLs", {"urls": list(profile.blocked)})
+
+
+async def block_requests_async(context, page, profile):
+    if not profile.blocked:
+        return
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.setBlockedURLs", {"urls": list(profile.blocked)})
+
+
+# --------------------------------------------------
+# NAVIGATION REPORT
+# --------------------------------------------------
+NAV_STATS_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const res = performance.getEntriesByType('resource');
+    const end = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd) : 0;
+    return {
+        url: location.href,
+        load_ms: nav && end ? end - nav.startTime : null,
+        bytes: (nav ? nav.transferSize : 0) + res.reduce((n, r) => n + (r.transferSize || 0), 0),
+        requests: res.length + 1,
+        cached: res.filter(r => r.transferSize === 0 && r.decodedBodySize > 0).length,
+    };
+}
+"""
+
+
+class NavigationReport:
+    def __init__(self, profile_name):
+        self.profile_name = profile_name
+        self.entries = []
+
+    def record(self, step, stats):
+        if not stats:
+            return
+        self.entries.append((step, stats))
+        load = f"{stats['load_ms']:.0f} ms" if stats["load_ms"] is not None else "n/a"
+        print(f"[NAV] {step:<14} {stats['bytes'] / 1024:>8.1f} KB | {load:>8} | "
+              f"{stats['requests']} requests ({stats['cached']} cached)")
+
+    def measure(self, page, step):
+        try:
+            self.record(step, page.evaluate(NAV_STATS_JS))
+        except Exception:
+            pass
+
+    def print_summary(self):
+        if not self.entries:
+            return
+        print(f"\n[NAV] Page-load report ({self.profile_name} profile)")
+        by_step = {}
+        for step, stats in self.entries:
+            by_step.setdefault(step, []).append(stats)
+        for step, items in by_step.items():
+            loads = [s["load_ms"] for s in items if s["load_ms"] is not None]
+            kb = sum(s["bytes"] for s in items) / 1024 / len(items)
+            avg_load = sum(loads) / len(loads) if loads else 0
+            print(f"[NAV] {step:<14} x{len(items):<4} avg {kb:>8.1f} KB | avg {avg_load:>7.0f} ms")
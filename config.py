@@ -2,7 +2,7 @@
 
 GEM_HOME_URL = "https://gem.gov.in/"
 
-HEADLESS = False
+HEADLESS = None  # None = the browser profile decides (lean: headless, full: headed)
 SLOW_MO = 50
 DEFAULT_TIMEOUT = 30000
 
@@ -10,3 +10,131 @@ VIEWPORT = {
     "width": 1280,
     "height": 800
 }
+
+# Worker pool (parallel category crawling)
+WORKERS = 1
+
+# Sharded multi-process crawl (run.py --processes N): one browser per process, shards by "hash" or "size"
+PROCESSES = 1
+SHARD_STRATEGY = "hash"
+SHARD_PROGRESS_SECONDS = 15
+
+# Async engine (categories crawled concurrently on one event loop)
+ASYNC_CONCURRENCY = 4
+
+# Direct HTTP transport (browser only bootstraps the session). Paths and fields
+# follow the view_contracts form ids; they are not verified against recorded traffic
+HTTP_POOL_SIZE = 8
+HTTP_TIMEOUT = 30
+HTTP_PATHS = {
+    "contracts": "view_contracts",
+    "search": "view_contracts/contract_search",
+    "order_captcha": "view_contracts/order_captcha",
+    "order_link": "view_contracts/order_details",
+}
+HTTP_FIELDS = {
+    "csrf": "csrf_bd_gem_nk",
+    "category": "category",  # the category's site id (category catalog), as the select2 submits it
+    "from_date": "from_date_contract_search1",
+    "to_date": "to_date_contract_search1",
+    "search_captcha": "captcha_code1",
+    "order": "order_no",
+    "order_captcha": "captcha_code",
+}
+
+# Captcha solver pool (parallel tesseract passes; 1 = serial in-line solving)
+SOLVER_WORKERS = 8
+SOLVER_POOL = "thread"  # "thread" (tesseract already runs out of process) or "process"
+
+# Adaptive early-exit voting (best passes first, stop once they agree)
+SOLVER_ADAPTIVE = True
+SOLVER_AGREE_VOTES = 3
+SOLVER_EARLY_CONFIDENCE = 0.7
+
+# OCR backend: "auto" (in-process tesserocr if installed, else pytesseract),
+# "tesserocr" or "pytesseract"
+OCR_BACKEND = "auto"
+TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+TESSDATA_PATH = None
+
+# Glyph classifier (fast first pass; tesseract ensemble only when unsure)
+CLASSIFIER_ENABLED = True
+CLASSIFIER_MIN_CONFIDENCE = 0.8
+CLASSIFIER_K = 3
+
+# Captcha corpus (every solved captcha + accepted/rejected outcome)
+CAPTURE_CAPTCHAS = True
+
+# Captcha retries (low-confidence guesses are never submitted; failed rows are re-queued)
+CAPTCHA_MIN_CONFIDENCE = 0.55
+CAPTCHA_MAX_ATTEMPTS = 10
+CAPTCHA_VERDICT_TIMEOUT = 8000
+ROW_RETRY_ROUNDS = 2
+
+# Crawl state (data/state/crawl_state.sqlite): resume date windows, skip known bids
+CRAWL_STATE = True
+CRAWL_INITIAL_DAYS = 2
+
+# Output sink: csv | jsonl | parquet | sqlite, written in batches by one writer thread
+OUTPUT_FORMAT = "csv"
+OUTPUT_NAME = "contracts_merged"  # a sharded run writes contracts_shard-<n> per process and merges afterwards
+OUTPUT_BATCH_SIZE = 50
+OUTPUT_FLUSH_SECONDS = 5
+
+# Database persistence: "sqlite" (data/db/contracts.sqlite), "mysql" (DB_* env vars) or None
+DB_BACKEND = "sqlite"
+DB_TABLE = "contracts"
+DB_POOL_SIZE = 4
+DB_BATCH_SIZE = 200
+
+# Date-window planner: a listing that ends at SEARCH_RESULT_CAP cards with no next page is assumed truncated and split
+SEARCH_RESULT_CAP = 100
+WINDOW_TARGET_FILL = 0.5
+WINDOW_MAX_DAYS = 31
+BACKFILL_SINCE = None  # datetime.date to backfill from (run.py --since)
+
+# Results walker: follow "load more" / pagination / infinite scroll up to this many pages per search
+RESULTS_MAX_PAGES = 200
+
+# Browser profile: "lean" (headless, blocked images/fonts/trackers, persistent disk cache) or "full"
+BROWSER_PROFILE = "lean"
+BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "twitter.com",
+    "hotjar.com",
+    "clarity.ms",
+    "youtube.com",
+]
+
+# Session pool: warmed contexts parked on view_contracts (0 = navigate from home per category).
+# Off by default: the pool needs a plain (non-persistent) browser, which gives up the lean
+# profile's on-disk HTTP cache; worth it only when navigation dominates the run
+SESSION_POOL_SIZE = 0
+SESSION_MAX_AGE = 1200
+SESSION_MAX_USES = 50
+
+# Metrics: per-stage timers/counters as JSON lines in logs/metrics.log; METRICS_PORT serves /metrics (Prometheus text)
+METRICS_LOG = True
+METRICS_PORT = None  # e.g. 9108
+
+# Adaptive rate limit against the portal (token bucket + AIMD), requests/s shared by all workers of a process
+RATE_INITIAL = 1.0
+RATE_MIN = 0.2
+RATE_MAX = 5.0
+RATE_BURST = 3
+RATE_INCREASE = 0.1  # req/s gained per second of healthy traffic
+RATE_DECREASE = 0.5  # rate multiplier on timeouts, error pages and throttling
+RATE_LATENCY_TARGET = 4.0  # seconds; slower answers stop the increase, twice this counts as congestion
+RATE_THROTTLE_PAUSE = 30  # seconds every request waits after a throttling signal (doubles while it repeats)
+RATE_SHARE = 1.0  # fraction of these rates one process may use (1/N per process of a sharded run)
+
+# Daemon (run.py --daemon): headless crawl cycles fed from a durable SQLite work queue
+DAEMON_INTERVAL = 6 * 3600  # seconds between cycle starts
+QUEUE_LEASE_SECONDS = 900  # renewed by a heartbeat while a category runs
+QUEUE_MAX_ATTEMPTS = 5
+QUEUE_BACKOFF_BASE = 60
+QUEUE_BACKOFF_MAX = 3600
@@ -0,0 +1,293 @@
+import asyncio
+
+import config
+from controller.captcha_retry import MODAL_CAPTCHA, SEARCH_CAPTCHA, AsyncCaptchaRetryManager, RetryStats
+from controller.contracts_controller import SELECT2_OPTIONS_JS, SET_CATEGORY_JS, ContractsController
+from controller.page_waits import AsyncPageWaiter, WaitReport
+from controller.results_walker import AsyncResultsWalker
+from controller.row_extractor import extract_cards_async
+from service.metrics import METRICS
+from service.output_sink import flush_all
+from service.rate_limiter import ERROR_PAGE_JS, THROTTLE_MARKERS, PortalThrottled, default_limiter
+
+
+class AsyncContractsController(ContractsController):
+    """
+    playwright.async_api twin of ContractsController.
+
+    Output, crawl state and the window planner are inherited; every page
+    interaction (captcha retries, results walker, row re-queue rounds) is a
+    coroutine so many controllers can share one event loop.
+    """
+
+    def _make_waiter(self, report):
+        return AsyncPageWaiter(self.page, report)
+
+    def _make_captchas(self, stats):
+        return AsyncCaptchaRetryManager(self.page, stats, limiter=self.limiter)
+
+    # --------------------------------------------------
+    # RESET TO HOME
+    # --------------------------------------------------
+    async def reset_to_home(self):
+        print("[NAV] Resetting to https://gem.gov.in/")
+        await self.page.goto("https://gem.gov.in/", timeout=60000, wait_until="domcontentloaded")
+        await self.waits.selector("home", "ul#nav", budget_ms=3000)
+
+    # --------------------------------------------------
+    # NAVIGATION
+    # --------------------------------------------------
+    async def go_to_gem_contracts(self):
+        await self.page.wait_for_selector("ul#nav", timeout=60000)
+        await self.page.click('ul#nav a[title="View Contracts "]')
+        await self.waits.selector(
+            "contracts_menu", 'ul#nav a[href="https://gem.gov.in/view_contracts"]', budget_ms=1000
+        )
+        await self.page.click('ul#nav a[href="https://gem.gov.in/view_contracts"]')
+        await self.waits.selector("contracts_page", "#captchaimg1", budget_ms=3000, state="attached")
+
+    # --------------------------------------------------
+    # DATE FILTER
+    # --------------------------------------------------
+    async def set_date_filter(self):
+        from_date, to_date = self._date_window()
+
+        await self.page.evaluate(
+            """
+            (d) => {
+                document.querySelector('#from_date_contract_search1').value = d.from;
+                document.querySelector('#to_date_contract_search1').value = d.to;
+                document.querySelector('#from_date_contract_search1').dispatchEvent(new Event('change'));
+                document.querySelector('#to_date_contract_search1').dispatchEvent(new Event('change'));
+            }
+            """,
+            {
+                "from": from_date.strftime("%d-%m-%Y"),
+                "to": to_date.strftime("%d-%m-%Y")
+            }
+        )
+
+    # --------------------------------------------------
+    # CATEGORY (KEYWORD → EXACT MATCH)
+    # --------------------------------------------------
+    async def process_category(self, category_name):
+        entry = self.catalog.lookup(category_name)
+        if entry and entry.get("site_id"):
+            if await self.page.evaluate(SET_CATEGORY_JS, {"id": entry["site_id"], "text": entry["name"]}):
+                print(f"[CATEGORY] Selected '{entry['name']}' (id {entry['site_id']})")
+                return
+
+        await self.page.click(".select2-selection")
+        await self.page.wait_for_selector("input.select2-search__field")
+
+        search = self.page.locator("input.select2-search__field")
+        await search.clear()
+        await search.fill(category_name)
+        await self.waits.select2_results(budget_ms=1500)
+
+        found = await self.page.evaluate(SELECT2_OPTIONS_JS)
+        if self.catalog.harvest(found, query=category_name):
+            self.catalog.save()
+
+        i = self._match_option(category_name, found)
+        if i is None:
+            raise self._category_not_found(category_name)
+
+        await self.page.locator("li.select2-results__option:not(.select2-results__message)").nth(i).click()
+        await self.waits.select2_closed(budget_ms=1000)
+
+    # --------------------------------------------------
+    # MAIN SEARCH CAPTCHA
+    # --------------------------------------------------
+    async def solve_main_captcha_and_search(self):
+        if not await self.captchas.solve(SEARCH_CAPTCHA):
+            raise Exception("Main captcha failed")
+
+    # --------------------------------------------------
+    # NO RESULT FOUND CHECK
+    # --------------------------------------------------
+    async def has_no_result(self):
+        locator = self.page.locator('div[style*="color:red"]')
+        if await locator.count() > 0:
+            text = await locator.first.inner_text()
+            return "No Result Found" in text
+        return False
+
+    async def _check_error_page(self):
+        try:
+            marker = await self.page.evaluate(ERROR_PAGE_JS, list(THROTTLE_MARKERS))
+        except Exception:
+            return
+        if marker:
+            raise PortalThrottled(f"Portal error page: '{marker}'")
+
+    # --------------------------------------------------
+    # ROW + POPUP PROCESS
+    # --------------------------------------------------
+    async def result_cards(self):
+        if await self.has_no_result():
+            return []
+
+        await self.page.wait_for_selector("span.ajxtag_order_number", timeout=30000)
+        return await extract_cards_async(self.page)
+
+    async def process_rows(self, category_name, cards=None):
+        if cards is None:
+            cards = await self.result_cards()
+        if not cards:
+            print(f"[RESULT] ❌ No Result Found → {category_name}")
+            return 0, False
+
+        bid_nodes = self.page.locator("span.ajxtag_order_number")
+
+        total = 0
+        walker = AsyncResultsWalker(self.page, self.waits, limiter=self.limiter, cap=self.planner.cap)
+        async for page in walker.pages(cards):
+            total += len(page.rows)
+            print(f"[INFO] Page {page.number}: {len(page.rows)} tenders ({total} so far)")
+
+            # Seen-bid lookups are SQLite reads: off the event loop
+            queue, round_no = await asyncio.to_thread(self._unseen, page.rows), 0
+            while queue:
+                failed = [
+                    (i, card) for i, card in queue
+                    if not await self._process_row(i, card, category_name, bid_nodes, serial_no=page.offset + i + 1)
+                ]
+                queue = self._next_round(category_name, round_no, failed)
+                round_no += 1
+
+        return total, walker.truncated
+
+    async def _process_row(self, i, card, category_name, bid_nodes, serial_no=None):
+        bid_no = card["bid_no"]
+        print(f"[ROW] Processing {bid_no}")
+
+        try:
+            with METRICS.timer("modal", bid_no=bid_no):
+                # The hidden modal keeps the last row's image: wait for this row's
+                old_src = await self.captchas.current_src(MODAL_CAPTCHA)
+                async with self.limiter.request_async("modal_open"):
+                    await bid_nodes.nth(i).click()
+                    if not await self.waits.captcha_image(MODAL_CAPTCHA.image, old_src):
+                        raise Exception("modal captcha did not load (timeout)")
+
+                if not await self.captchas.solve(MODAL_CAPTCHA):
+                    raise Exception("modal captcha failed")
+                download_link = await self.page.locator("a#dwnbtn").get_attribute("href")
+        except Exception as e:
+            print(f"[ROW] ⚠️  {bid_no}: {e} → re-queued")
+            METRICS.count("rows_requeued")
+            await self._close_modal()
+            return False
+
+        self._append_row(self._build_row(serial_no or i + 1, category_name, card, download_link))
+
+        print(f"[ROW] Saved {bid_no}")
+        await self._close_modal()
+        return True
+
+    async def _close_modal(self):
+        try:
+            await self.page.click("button[data-dismiss='modal']", timeout=5000)
+        except Exception:
+            pass
+        await self.waits.modal_closed(budget_ms=2000)
+
+    # --------------------------------------------------
+    # SINGLE CATEGORY (ONE SEARCH PER PLANNED WINDOW)
+    # --------------------------------------------------
+    async def search_window(self, category_name):
+        with METRICS.timer("navigation"):
+            async with self.limiter.request_async("navigation"):
+                await self.reset_to_home()
+                await self.go_to_gem_contracts()
+                await self._check_error_page()
+        with METRICS.timer("category_select", category=category_name):
+            await self.process_category(category_name)
+        with METRICS.timer("date_filter"):
+            await self.set_date_filter()
+        await self.solve_main_captcha_and_search()
+
+        print("[RESULT] Results loaded")
+        return await self.result_cards()
+
+    async def crawl_category(self, category_name):
+        # Crawl state, sink checkpoints (fsync, DB upsert) and planner updates are
+        # blocking I/O: they run in a thread so other categories keep going
+        pending = await asyncio.to_thread(self._plan_windows, category_name)
+        while pending:
+            self._mark_window(pending.pop(0))
+            results, truncated = await self.process_rows(category_name, await self.search_window(category_name))
+            await asyncio.to_thread(self._window_searched, category_name, pending, results, truncated)
+
+    # --------------------------------------------------
+    # MAIN LOOP (ALL CATEGORIES, SEQUENTIAL ON THIS PAGE)
+    # --------------------------------------------------
+    async def run(self):
+        try:
+            for idx, row in enumerate(self.categories, start=1):
+                category_name = row["category_name"]
+
+                print("\n" + "=" * 70)
+                print(f"🚀 CATEGORY {idx}/{len(self.categories)} → {category_name}")
+                print("=" * 70)
+
+                await self.crawl_category(category_name)
+        finally:
+            await asyncio.to_thread(self.sink.checkpoint)
+            self.captchas.close()
+
+        self.waits.report.print_summary()
+        self.captchas.stats.print_summary()
+
+
+# --------------------------------------------------
+# CONCURRENT ENGINE (MANY CONTEXTS, ONE EVENT LOOP)
+# --------------------------------------------------
+async def run_categories(manager, categories, concurrency=config.ASYNC_CONCURRENCY):
+    """
+    Crawl categories concurrently: one AsyncContractsController per isolated
+    session, all pulling from a shared queue, so the idle time of one
+    category's navigation/captcha/modal waits overlaps with the others.
+    """
+    work = asyncio.Queue()
+    for row in categories:
+        work.put_nowait(row["category_name"])
+
+    done, failed = [], []
+    report = WaitReport()
+    captcha_stats = RetryStats()
+
+    async def worker(worker_id):
+        session = await manager.new_session()
+        contracts = AsyncContractsController(session, wait_report=report, captcha_stats=captcha_stats)
+        try:
+            while True:
+                try:
+                    category_name = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                print(f"[ASYNC] Worker {worker_id} → {category_name}")
+                try:
+                    await contracts.crawl_category(category_name)
+                    done.append(category_name)
+                except Exception as e:
+                    print(f"[ASYNC] ❌ Worker {worker_id} failed on {category_name}: {e}")
+                    failed.append(category_name)
+        finally:
+            contracts.captchas.close()
+            await session.close()
+
+    workers = max(1, min(concurrency, work.qsize()))
+    try:
+        await asyncio.gather(*(worker(i + 1) for i in range(workers)))
+    finally:
+        flush_all()
+
+    report.print_summary()
+    captcha_stats.print_summary()
+    default_limiter().print_summary()
+    METRICS.print_summary()
+    print(f"[ASYNC] {len(done)} done, {len(failed)} failed")
+    return {"done": done, "failed": failed}
@@ -0,0 +1,325 @@
+"""
+Confidence-gated captcha retries for the search form and the row modal.
+
+- Low-confidence guesses are never submitted: the image is refreshed and
+  the new one is solved speculatively in the background as soon as its
+  src changes, while the page is prepared for the next attempt.
+- Acceptance is read from the portal, not assumed: the submit's POST
+  response is checked for a captcha error, then the page is watched until
+  it shows the result (search results / download link) or a rejection
+  (new captcha image or an error message).
+- Every attempt, skip, rejection and success is counted so the run can
+  report attempts per success.
+
+AsyncCaptchaRetryManager is the playwright.async_api twin (same stats,
+verdicts and gates) used by the async engine.
+"""
+
+import asyncio
+import base64
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from controller.page_waits import FORGET_RESULTS_JS, IMAGE_SRC_JS
+from solver import captcha_corpus
+from service.metrics import ATTEMPT_BUCKETS, METRICS
+from service.rate_limiter import default_limiter
+from solver.captcha_solver import ensemble_solve, ensemble_solve_async
+
+CaptchaSpec = namedtuple("CaptchaSpec", "kind image input submit")
+
+SEARCH_CAPTCHA = CaptchaSpec("search", "#captchaimg1", "#captcha_code1", "#searchlocation1")
+MODAL_CAPTCHA = CaptchaSpec("modal", "#captchaimg", "#captcha_code", "#modelsbt")
+
+CAPTCHA_ERROR_RE = re.compile(r"(invalid|wrong|incorrect|mismatch)\w*\s+(security\s+)?(code|captcha)", re.I)
+
+VERDICT_JS = """
+(a) => {
+    if (a.kind === 'search') {
+        // Cards of an earlier search were tagged data-stale before the submit
+        if (document.querySelector('span.ajxtag_order_number:not([data-stale])')) return 'accepted';
+        if ([...document.querySelectorAll('div[style*="color:red"]:not([data-stale])')]
+                .some(d => d.innerText.includes('No Result Found'))) return 'accepted';
+    } else {
+        const link = document.querySelector('a#dwnbtn');
+        const href = link && link.getAttribute('href');
+        if (href && href !== '#' && !href.startsWith('javascript')) return 'accepted';
+    }
+    const img = document.querySelector(a.image);
+    if (img && img.getAttribute('src') !== a.src) return 'rejected';
+    if (new RegExp(a.error, 'i').test(document.body.innerText)) return 'rejected';
+    return false;
+}
+"""
+
+SRC_CHANGED_JS = """
+(a) => {
+    const img = document.querySelector(a.image);
+    const src = img && img.getAttribute('src');
+    return !!src && src !== a.src && src.includes(',');
+}
+"""
+
+
+class RetryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def add(self, kind, field, n=1):
+        with self._lock:
+            s = self.counts.setdefault(
+                kind, {"attempts": 0, "skipped": 0, "submitted": 0, "rejected": 0, "success": 0, "failed": 0}
+            )
+            s[field] += n
+        METRICS.count(f"captcha_{field}", n, kind=kind)
+
+    def print_summary(self):
+        if not self.counts:
+            return
+        print("\n[CAPTCHA] Retry report")
+        for kind, s in sorted(self.counts.items()):
+            per_success = s["attempts"] / s["success"] if s["success"] else float("inf")
+            print(
+                f"[CAPTCHA] {kind:<7} attempts {s['attempts']:>5} | skipped {s['skipped']:>4} | "
+                f"submitted {s['submitted']:>4} | rejected {s['rejected']:>4} | "
+                f"success {s['success']:>4} | failed {s['failed']:>4} | "
+                f"attempts/success {per_success:.2f}"
+            )
+
+
+class CaptchaRetryManager:
+    def __init__(self, page, stats=None, max_attempts=config.CAPTCHA_MAX_ATTEMPTS,
+                 min_confidence=config.CAPTCHA_MIN_CONFIDENCE, limiter=None):
+        self.page = page
+        self.stats = stats or RetryStats()
+        self.limiter = limiter or default_limiter()
+        self.max_attempts = max_attempts
+        self.min_confidence = min_confidence
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="captcha-spec")
+
+    # --------------------------------------------------
+    # IMAGE + SPECULATIVE SOLVE
+    # --------------------------------------------------
+    def current_src(self, spec):
+        """src of the captcha image now on the page (None if there is none yet)"""
+        try:
+            return self.page.evaluate(IMAGE_SRC_JS, spec.image)
+        except Exception:
+            return None
+
+    def _read(self, spec):
+        src = self.page.locator(spec.image).get_attribute("src")
+        return src, base64.b64decode(src.split(",")[1])
+
+    def _wait_new_image(self, spec, old_src, timeout=5000):
+        try:
+            self.page.wait_for_function(SRC_CHANGED_JS, arg={"image": spec.image, "src": old_src}, timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def _presolve(self, spec, old_src, refresh, timeout=5000):
+        """Refresh if needed, then start solving the new image in the background"""
+        if refresh:
+            self.limiter.acquire()  # a new image is a request to the portal
+            self.page.click(spec.image)
+        if not self._wait_new_image(spec, old_src, timeout):
+            return None
+        src, img_bytes = self._read(spec)
+        future = self._executor.submit(ensemble_solve, img_bytes)
+
+        # Page work overlaps with the solve
+        self.page.fill(spec.input, "")
+        return src, img_bytes, future
+
+    # --------------------------------------------------
+    # VERDICT FROM THE PORTAL
+    # --------------------------------------------------
+    def _submit(self, spec, text, old_src):
+        # An earlier search's cards / the last row's download link must not read as this verdict
+        self.page.evaluate(FORGET_RESULTS_JS, spec.kind)
+        self.page.fill(spec.input, text)
+        timeout = config.CAPTCHA_VERDICT_TIMEOUT
+
+        try:
+            with self.page.expect_response(lambda r: r.request.method == "POST", timeout=timeout) as info:
+                self.page.click(spec.submit)
+            if CAPTCHA_ERROR_RE.search(info.value.text() or ""):
+                return False
+        except Exception:
+            pass  # no POST seen / unreadable body: fall back to the page
+
+        try:
+            verdict = self.page.wait_for_function(
+                VERDICT_JS,
+                arg={"kind": spec.kind, "image": spec.image, "src": old_src, "error": CAPTCHA_ERROR_RE.pattern},
+                timeout=timeout
+            ).json_value()
+        except Exception:
+            return None
+        return verdict == "accepted"
+
+    # --------------------------------------------------
+    # MAIN LOOP
+    # --------------------------------------------------
+    def solve(self, spec):
+        """Solve and submit until accepted; True on success"""
+        pending = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            self.stats.add(spec.kind, "attempts")
+
+            # Wall-clock the page waits for an answer (near zero when presolved)
+            with METRICS.timer("captcha_solve", kind=spec.kind, speculative=bool(pending)):
+                if pending:
+                    src, img_bytes, future = pending
+                    text, conf = future.result()
+                else:
+                    src, img_bytes = self._read(spec)
+                    text, conf = ensemble_solve(img_bytes)
+            pending = None
+
+            sha1 = captcha_corpus.capture(img_bytes, spec.kind, text, conf)
+            print(f"[CAPTCHA] {spec.kind} attempt {attempt}: '{text}' ({conf:.2f})")
+
+            if not text or len(text) < 4 or conf < self.min_confidence:
+                self.stats.add(spec.kind, "skipped")
+                pending = self._presolve(spec, src, refresh=True)
+                continue
+
+            self.stats.add(spec.kind, "submitted")
+            with METRICS.timer("captcha_submit", kind=spec.kind) as span, \
+                    self.limiter.request(spec.kind) as portal:
+                accepted = self._submit(spec, text, src)
+                span["accepted"] = accepted
+                # A rejected captcha holds the rate; no verdict at all counts as a timeout
+                portal["outcome"] = {True: "ok", False: "rejected", None: "timeout"}[accepted]
+            if accepted is not None:
+                captcha_corpus.record_outcome(sha1, accepted)
+            if accepted:
+                self.stats.add(spec.kind, "success")
+                METRICS.observe("captcha_attempts", attempt, ATTEMPT_BUCKETS, kind=spec.kind, outcome="success")
+                return True
+
+            self.stats.add(spec.kind, "rejected")
+            # The portal usually swaps the image itself on rejection
+            pending = (
+                self._presolve(spec, src, refresh=False, timeout=1500)
+                or self._presolve(spec, src, refresh=True)
+            )
+
+        self.stats.add(spec.kind, "failed")
+        METRICS.observe("captcha_attempts", self.max_attempts, ATTEMPT_BUCKETS, kind=spec.kind, outcome="failed")
+        return False
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class AsyncCaptchaRetryManager(CaptchaRetryManager):
+    """CaptchaRetryManager for playwright.async_api pages; speculative solves run as tasks"""
+
+    async def current_src(self, spec):
+        try:
+            return await self.page.evaluate(IMAGE_SRC_JS, spec.image)
+        except Exception:
+            return None
+
+    async def _read(self, spec):
+        src = await self.page.locator(spec.image).get_attribute("src")
+        return src, base64.b64decode(src.split(",")[1])
+
+    async def _wait_new_image(self, spec, old_src, timeout=5000):
+        try:
+            await self.page.wait_for_function(SRC_CHANGED_JS, arg={"image": spec.image, "src": old_src},
+                                              timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _presolve(self, spec, old_src, refresh, timeout=5000):
+        if refresh:
+            await self.limiter.acquire_async()
+            await self.page.click(spec.image)
+        if not await self._wait_new_image(spec, old_src, timeout):
+            return None
+        src, img_bytes = await self._read(spec)
+        task = asyncio.ensure_future(ensemble_solve_async(img_bytes, self._executor))
+
+        await self.page.fill(spec.input, "")
+        return src, img_bytes, task
+
+    async def _submit(self, spec, text, old_src):
+        await self.page.evaluate(FORGET_RESULTS_JS, spec.kind)
+        await self.page.fill(spec.input, text)
+        timeout = config.CAPTCHA_VERDICT_TIMEOUT
+
+        try:
+            async with self.page.expect_response(lambda r: r.request.method == "POST", timeout=timeout) as info:
+                await self.page.click(spec.submit)
+            response = await info.value
+            if CAPTCHA_ERROR_RE.search(await response.text() or ""):
+                return False
+        except Exception:
+            pass
+
+        try:
+            handle = await self.page.wait_for_function(
+                VERDICT_JS,
+                arg={"kind": spec.kind, "image": spec.image, "src": old_src, "error": CAPTCHA_ERROR_RE.pattern},
+                timeout=timeout
+            )
+            verdict = await handle.json_value()
+        except Exception:
+            return None
+        return verdict == "accepted"
+
+    async def solve(self, spec):
+        pending = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            self.stats.add(spec.kind, "attempts")
+
+            with METRICS.timer("captcha_solve", kind=spec.kind, speculative=bool(pending)):
+                if pending:
+                    src, img_bytes, task = pending
+                    text, conf = await task
+                else:
+                    src, img_bytes = await self._read(spec)
+                    text, conf = await ensemble_solve_async(img_bytes, self._executor)
+            pending = None
+
+            sha1 = captcha_corpus.capture(img_bytes, spec.kind, text, conf)
+            print(f"[CAPTCHA] {spec.kind} attempt {attempt}: '{text}' ({conf:.2f})")
+
+            if not text or len(text) < 4 or conf < self.min_confidence:
+                self.stats.add(spec.kind, "skipped")
+                pending = await self._presolve(spec, src, refresh=True)
+                continue
+
+            self.stats.add(spec.kind, "submitted")
+            with METRICS.timer("captcha_submit", kind=spec.kind) as span:
+                async with self.limiter.request_async(spec.kind) as portal:
+                    accepted = await self._submit(spec, text, src)
+                    span["accepted"] = accepted
+                    portal["outcome"] = {True: "ok", False: "rejected", None: "timeout"}[accepted]
+            if accepted is not None:
+                captcha_corpus.record_outcome(sha1, accepted)
+            if accepted:
+                self.stats.add(spec.kind, "success")
+                METRICS.observe("captcha_attempts", attempt, ATTEMPT_BUCKETS, kind=spec.kind, outcome="success")
+                return True
+
+            self.stats.add(spec.kind, "rejected")
+            pending = (
+                await self._presolve(spec, src, refresh=False, timeout=1500)
+                or await self._presolve(spec, src, refresh=True)
+            )
+
+        self.stats.add(spec.kind, "failed")
+        METRICS.observe("captcha_attempts", self.max_attempts, ATTEMPT_BUCKETS, kind=spec.kind, outcome="failed")
+        return False
@@ -1,70 +1,237 @@
+import atexit
 import csv
-import base64
-import io
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from PIL import Image
 
-from solver.captcha_solver import ensemble_solve
+import config
+from controller.captcha_retry import MODAL_CAPTCHA, SEARCH_CAPTCHA, CaptchaRetryManager
+from controller.page_waits import PageWaiter
+from controller.results_walker import ResultsWalker
+from controller.row_extractor import extract_cards
+from service.category_catalog import default_catalog, normalize, signature
+from service.contract_schema import OUTPUT_COLUMNS
+from service.crawl_state import default_state
+from service.db_service import DatabaseService
+from service.metrics import METRICS
+from service.output_sink import open_sink
+from service.rate_limiter import ERROR_PAGE_JS, THROTTLE_MARKERS, PortalThrottled, default_limiter
+from service.window_planner import WindowPlanner, window_days
+from solver import captcha_corpus
+
+# One output sink (and writer thread) per process, shared by every controller
+# so pool workers never interleave partial rows
+_OUTPUT_LOCK = threading.Lock()
+_SINK = None
+
+
+BASE_PATH = Path(__file__).resolve().parents[1]
+
+# The category select2 is the first one on view_contracts; its options are
+# AJAX-loaded, so an unseen id is added as a new <option> before selecting
+SET_CATEGORY_JS = """
+(c) => {
+    const sel = document.querySelector('select.select2-hidden-accessible');
+    if (!sel) return false;
+    let opt = [...sel.options].find(o => o.value === c.id);
+    if (!opt) {
+        opt = new Option(c.text, c.id, true, true);
+        sel.appendChild(opt);
+    }
+    sel.value = c.id;
+    if (window.jQuery) jQuery(sel).trigger('change');
+    else sel.dispatchEvent(new Event('change', {bubbles: true}));
+    return sel.value === c.id;
+}
+"""
+
+# {id, text} of every suggestion in one round trip (ids from select2's jQuery data)
+SELECT2_OPTIONS_JS = """
+() => [...document.querySelectorAll('li.select2-results__option:not(.select2-results__message)')]
+    .map(li => {
+        const d = window.jQuery ? jQuery(li).data('data') : null;
+        return {id: d && d.id != null ? String(d.id) : null, text: (d && d.text) || li.innerText.trim()};
+    })
+"""
 
 
 class ContractsController:
-    def __init__(self, browser):
+    CATEGORY_CSV = BASE_PATH / "data" / "Datasets" / "categories.csv"
+    OUTPUT_DIR = BASE_PATH / "data" / "scrapped"
+
+    def __init__(self, browser, wait_report=None, captcha_stats=None, state=None, sessions=None, limiter=None):
         self.browser = browser
         self.page = browser.page
-
-        base_path = Path(__file__).resolve().parents[1]
-
-        self.category_csv = base_path / "data" / "Datasets" / "categories.csv"
-        self.output_dir = base_path / "data" / "scrapped"
+        self.sessions = sessions
+        self._started = time.perf_counter()
+        self.limiter = limiter or default_limiter()
+        self.waits = self._make_waiter(wait_report)
+        self.captchas = self._make_captchas(captcha_stats)
+        self.state = state or default_state()
+        self.planner = WindowPlanner(self.state)
+        self.catalog = default_catalog()
+        self.window = None
+        self.failed_rows = []
+        self.rows_saved = 0
+
+        self.category_csv = self.CATEGORY_CSV
+        self.output_dir = self.OUTPUT_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.output_csv = self.output_dir / "contracts_merged.csv"
-        self._init_output_csv()
+        self.sink = self._init_output()
 
         with open(self.category_csv, newline="", encoding="utf-8") as f:
             self.categories = list(csv.DictReader(f))
 
+    def _make_waiter(self, report):
+        return PageWaiter(self.page, report)
+
+    def _make_captchas(self, stats):
+        return CaptchaRetryManager(self.page, stats, limiter=self.limiter)
+
     # --------------------------------------------------
-    # OUTPUT CSV
+    # OUTPUT SINK
     # --------------------------------------------------
-    def _init_output_csv(self):
-        if not self.output_csv.exists():
-            with open(self.output_csv, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "serial_no",
-                    "category_name",
-                    "bid_no",
-                    "product",
-                    "brand",
-                    "model",
-                    "ordered_quantity",
-                    "price",
-                    "total_value",
-                    "buyer_dept_org",
-                    "organization_name",
-                    "buyer_designation",
-                    "state",
-                    "buyer_department",
-                    "office_zone",
-                    "buying_mode",
-                    "contract_date",
-                    "order_status",
-                    "download_link"
-                ])
+    def _init_output(self):
+        global _SINK
+        with _OUTPUT_LOCK:
+            if _SINK is not None:
+                return _SINK
+
+            # Rows written before crawl state existed count as already seen
+            if self.output_csv.exists() and not self.state.summary()["seen_bids"]:
+                imported = self.state.import_csv(self.output_csv)
+                if imported:
+                    print(f"[STATE] Imported {imported} known bids from {self.output_csv.name}")
+
+            # Registered before the sink so atexit (LIFO) closes it after the last flush
+            db = None
+            if config.DB_BACKEND:
+                db = DatabaseService(config.DB_BACKEND)
+                db.create_table()
+                atexit.register(db.close)
+
+            _SINK = open_sink(self.output_dir, OUTPUT_COLUMNS, name=config.OUTPUT_NAME)
+            # Bids only count as seen once their rows are on disk
+            state = self.state
+            _SINK.on_flush(lambda rows: [
+                state.mark_seen(r["bid_no"], r["category_name"], r["contract_date"]) for r in rows
+            ])
+            # Each flushed batch is also upserted into the database in one round trip
+            if db:
+                _SINK.on_flush(db.upsert_many)
+            return _SINK
+
+    @staticmethod
+    def _build_row(serial_no, category_name, card, download_link):
+        # Card keys match the output column names (see row_extractor.CARD_FIELDS)
+        return (
+            [serial_no, category_name]
+            + [card.get(col, "") for col in OUTPUT_COLUMNS[2:-1]]
+            + [download_link]
+        )
+
+    def _checkpoint(self):
+        # Rows must be on disk (and their bids marked seen) before the crawl state moves past them
+        if not self.sink.checkpoint():
+            raise Exception(f"Output not written: {self.sink.error}")
 
     def _append_row(self, row):
-        with open(self.output_csv, "a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(row)
+        if not self.rows_saved:
+            print(f"[SESSION] First row {time.perf_counter() - self._started:.1f}s after start")
+        # Source strings; typed backends and the database convert on write
+        self.sink.put(dict(zip(OUTPUT_COLUMNS, row)))
+        self.rows_saved += 1
+        METRICS.count("rows_saved")
+
+    # --------------------------------------------------
+    # CRAWL STATE (DATE WINDOWS + KNOWN BIDS)
+    # --------------------------------------------------
+    def _start_window(self, category_name):
+        """Pick the date range still to search; False if the category is up to date"""
+        self.window = self.state.next_window(category_name, since=config.BACKFILL_SINCE)
+        if self.window is None:
+            print(f"[STATE] ⏭️  {category_name} already crawled up to today")
+            return False
+
+        from_date, to_date = self.window
+        print(f"[STATE] {category_name}: {from_date:%d-%m-%Y} → {to_date:%d-%m-%Y}")
+        self._range_ok = True
+        self._mark_window(self.window)
+        return True
+
+    def _mark_window(self, window):
+        self.window = window
+        self._window_marks = (len(self.failed_rows), self.rows_saved)
+
+    def _finish_window(self, category_name, results=None, truncated=False):
+        # A window with given-up rows is kept but does not advance the next
+        # search, and neither does any later window of the same range
+        failed_before, saved_before = self._window_marks
+        self._range_ok = self._range_ok and len(self.failed_rows) == failed_before
+        self._checkpoint()
+        self.state.finish_window(
+            category_name, *self.window,
+            rows=self.rows_saved - saved_before,
+            complete=self._range_ok
+        )
+        if results is not None:
+            self.planner.observe(category_name, self.window, results, truncated)
+        self.window = None
+
+    def _new_cards(self, cards):
+        """[(index, card)] for bids not stored yet; index stays the on-page position"""
+        return self._unseen(list(enumerate(cards)))
+
+    def _unseen(self, rows):
+        known = self.state.seen([card["bid_no"] for _, card in rows])
+        if known:
+            print(f"[STATE] Skipping {len(known)} known rows")
+        return [(i, card) for i, card in rows if card["bid_no"] not in known]
+
+    # --------------------------------------------------
+    # READY PAGE (SESSION POOL OR FULL NAVIGATION)
+    # --------------------------------------------------
+    def open_contracts_page(self):
+        if self.sessions:
+            # The pool parked this page earlier (paced there); only the error check happens now
+            self._bind_page(self.sessions.checkout())
+            try:
+                self._check_error_page()
+            except PortalThrottled:
+                self.limiter.record("throttled", kind="navigation")
+                raise
+            return
+        with self.limiter.request("navigation"):
+            self.reset_to_home()
+            self.go_to_gem_contracts()
+            self._check_error_page()
+
+    def _check_error_page(self):
+        """Raise PortalThrottled when the portal answered with an error / rate-limit page"""
+        try:
+            marker = self.page.evaluate(ERROR_PAGE_JS, list(THROTTLE_MARKERS))
+        except Exception:
+            return
+        if marker:
+            raise PortalThrottled(f"Portal error page: '{marker}'")
+
+    def _bind_page(self, page):
+        # Everything that drives the page follows the checked-out session
+        self.page = page
+        self.waits.page = page
+        self.captchas.page = page
 
     # --------------------------------------------------
     # RESET TO HOME
     # --------------------------------------------------
     def reset_to_home(self):
         print("[NAV] Resetting to https://gem.gov.in/")
-        self.page.goto("https://gem.gov.in/", timeout=60000)
-        self.page.wait_for_timeout(3000)
+        self.page.goto("https://gem.gov.in/", timeout=60000, wait_until="domcontentloaded")
+        self.waits.selector("home", "ul#nav", budget_ms=3000)
+        self._measure_navigation("home")
 
     # --------------------------------------------------
     # NAVIGATION
@@ -72,16 +239,30 @@ class ContractsController:
     def go_to_gem_contracts(self):
         self.page.wait_for_selector("ul#nav", timeout=60000)
         self.page.click('ul#nav a[title="View Contracts "]')
-        self.page.wait_for_timeout(1000)
+        self.waits.selector(
+            "contracts_menu", 'ul#nav a[href="https://gem.gov.in/view_contracts"]', budget_ms=1000
+        )
         self.page.click('ul#nav a[href="https://gem.gov.in/view_contracts"]')
-        self.page.wait_for_timeout(3000)
+        self.waits.selector("contracts_page", "#captchaimg1", budget_ms=3000, state="attached")
+        self._measure_navigation("view_contracts")
+
+    def _measure_navigation(self, step):
+        # Bytes / load time per navigation (PlaywrightManager's NavigationReport)
+        report = getattr(self.browser, "nav_report", None)
+        if report:
+            report.measure(self.page, step)
 
     # --------------------------------------------------
     # DATE FILTER
     # --------------------------------------------------
-    def set_date_filter(self):
+    def _date_window(self):
+        if self.window:
+            return self.window
         to_date = datetime.today()
-        from_date = to_date - timedelta(days=2)
+        return to_date - timedelta(days=config.CRAWL_INITIAL_DAYS), to_date
+
+    def set_date_filter(self):
+        from_date, to_date = self._date_window()
 
         self.page.evaluate(
             """
@@ -102,42 +283,67 @@ class ContractsController:
     # CATEGORY (KEYWORD → EXACT MATCH)
     # --------------------------------------------------
     def process_category(self, category_name):
+        # Known site id (exact or signature match only): set the select directly,
+        # no typing or dropdown scan; anything else goes through the dropdown
+        entry = self.catalog.lookup(category_name)
+        if entry and entry.get("site_id"):
+            if self.page.evaluate(SET_CATEGORY_JS, {"id": entry["site_id"], "text": entry["name"]}):
+                print(f"[CATEGORY] Selected '{entry['name']}' (id {entry['site_id']})")
+                return
+
         self.page.click(".select2-selection")
         self.page.wait_for_selector("input.select2-search__field")
 
         search = self.page.locator("input.select2-search__field")
         search.clear()
         search.fill(category_name)
-        self.page.wait_for_timeout(1500)
-
-        options = self.page.locator(
-            "li.select2-results__option:not(.select2-results__message)"
-        )
+        self.waits.select2_results(budget_ms=1500)
+
+        # Every suggestion refreshes the catalog, so next time this is a direct pick
+        found = self.page.evaluate(SELECT2_OPTIONS_JS)
+        if self.catalog.harvest(found, query=category_name):
+            self.catalog.save()
+
+        i = self._match_option(category_name, found)
+        if i is None:
+            raise self._category_not_found(category_name)
+
+        self.page.locator("li.select2-results__option:not(.select2-results__message)").nth(i).click()
+        self.waits.select2_closed(budget_ms=1000)
+
+    def _category_not_found(self, category_name):
+        closest = self.catalog.closest(category_name)
+        hint = f" (closest catalog name: '{closest}')" if closest else ""
+        return Exception(f"Category not found: {category_name}{hint}")
+
+    @staticmethod
+    def _match_option(category_name, options):
+        """Index of the suggestion naming this category (exact, then same signature)"""
+        for key in (normalize, signature):
+            target = key(category_name)
+            for i, option in enumerate(options):
+                if key(option["text"]) == target:
+                    return i
+        return None
 
-        target = category_name.lower()
-        for i in range(options.count()):
-            if options.nth(i).inner_text().strip().lower() == target:
-                options.nth(i).click()
-                self.page.wait_for_timeout(1000)
-                return
+    # --------------------------------------------------
+    # CAPTCHA (SOLVE + CAPTURE TO CORPUS)
+    # --------------------------------------------------
+    @staticmethod
+    def _capture(img_bytes, kind, text, conf):
+        return captcha_corpus.capture(img_bytes, kind, text, conf)
 
-        raise Exception(f"Category not found: {category_name}")
+    @staticmethod
+    def _captcha_outcome(sha1, accepted):
+        captcha_corpus.record_outcome(sha1, accepted)
 
     # --------------------------------------------------
     # MAIN SEARCH CAPTCHA
     # --------------------------------------------------
     def solve_main_captcha_and_search(self):
-        src = self.page.locator("#captchaimg1").get_attribute("src")
-        img = Image.open(io.BytesIO(base64.b64decode(src.split(",")[1])))
-
-        text, conf = ensemble_solve(img)
-        if not text or conf < 0.55:
+        if not self.captchas.solve(SEARCH_CAPTCHA):
             raise Exception("Main captcha failed")
 
-        self.page.fill("#captcha_code1", text)
-        self.page.click("#searchlocation1")
-        self.page.wait_for_timeout(4000)
-
     # --------------------------------------------------
     # NO RESULT FOUND CHECK  ✅ NEW
     # --------------------------------------------------
@@ -151,112 +357,164 @@ class ContractsController:
     # --------------------------------------------------
     # ROW + POPUP PROCESS
     # --------------------------------------------------
-    def process_rows(self, category_name):
+    def result_cards(self):
+        """Cards of the loaded search results ([] for "No Result Found")"""
         # 🔴 IMPORTANT CHECK
         if self.has_no_result():
-            print(f"[RESULT] ❌ No Result Found → {category_name}")
-            return
+            return []
 
         self.page.wait_for_selector("span.ajxtag_order_number", timeout=30000)
+        return extract_cards(self.page)
+
+    def process_rows(self, category_name, cards=None):
+        """Process every result row of the current search (all pages); returns (listed, truncated)"""
+        if cards is None:
+            cards = self.result_cards()
+        if not cards:
+            print(f"[RESULT] ❌ No Result Found → {category_name}")
+            return 0, False
 
         bid_nodes = self.page.locator("span.ajxtag_order_number")
-        item_nodes = self.page.locator("span.ajxtag_item_title")
-        qty_nodes = self.page.locator("span.ajxtag_quantity")
-        value_nodes = self.page.locator("span.ajxtag_totalvalue")
-        buyer_nodes = self.page.locator("span.ajxtag_buyer_dept_org")
-        mode_nodes = self.page.locator("span.ajxtag_buying_mode")
-        date_nodes = self.page.locator("span.ajxtag_contract_date")
-        status_nodes = self.page.locator("span.ajxtag_order_status")
-
-        total = bid_nodes.count()
-        print(f"[INFO] Total tenders: {total}")
-
-        for i in range(total):
-            bid_no = bid_nodes.nth(i).inner_text().strip()
-
-            product = item_nodes.nth(i * 3).inner_text().strip()
-            brand = item_nodes.nth(i * 3 + 1).inner_text().strip()
-            model = item_nodes.nth(i * 3 + 2).inner_text().strip()
-
-            qty = qty_nodes.nth(i).inner_text().strip()
-            total_value = value_nodes.nth(i * 2).inner_text().strip()
-            price = value_nodes.nth(i * 2 + 1).inner_text().strip()
-
-            buyer_dept = buyer_nodes.nth(i * 3).inner_text().strip()
-            org_name = buyer_nodes.nth(i * 3 + 1).inner_text().strip()
-            designation = buyer_nodes.nth(i * 3 + 2).inner_text().strip()
-
-            state = mode_nodes.nth(i * 4).inner_text().strip()
-            buyer_department = mode_nodes.nth(i * 4 + 1).inner_text().strip()
-            office_zone = mode_nodes.nth(i * 4 + 2).inner_text().strip()
-            buying_mode = mode_nodes.nth(i * 4 + 3).inner_text().strip()
-
-            contract_date = date_nodes.nth(i).inner_text().strip()
-            order_status = status_nodes.nth(i).inner_text().strip()
-
-            print(f"[ROW] Processing {bid_no}")
-
-            bid_nodes.nth(i).click()
-            self.page.wait_for_timeout(2000)
-
-            self.page.wait_for_selector("#captchaimg", timeout=15000)
-            src = self.page.locator("#captchaimg").get_attribute("src")
-            img = Image.open(io.BytesIO(base64.b64decode(src.split(",")[1])))
-
-            text, conf = ensemble_solve(img)
-            if not text or conf < 0.55:
-                self.page.click("button[data-dismiss='modal']")
-                continue
-
-            self.page.fill("#captcha_code", text)
-            self.page.click("#modelsbt")
-            self.page.wait_for_timeout(3000)
-
-            self.page.wait_for_selector("a#dwnbtn", timeout=15000)
-            download_link = self.page.locator("a#dwnbtn").get_attribute("href")
-
-            self._append_row([
-                i + 1,
-                category_name,
-                bid_no,
-                product,
-                brand,
-                model,
-                qty,
-                price,
-                total_value,
-                buyer_dept,
-                org_name,
-                designation,
-                state,
-                buyer_department,
-                office_zone,
-                buying_mode,
-                contract_date,
-                order_status,
-                download_link
-            ])
 
-            print(f"[ROW] Saved {bid_no}")
-            self.page.click("button[data-dismiss='modal']")
-            self.page.wait_for_timeout(2000)
+        total = 0
+        walker = ResultsWalker(self.page, self.waits, limiter=self.limiter, cap=self.planner.cap)
+        for page in walker.pages(cards):
+            total += len(page.rows)
+            print(f"[INFO] Page {page.number}: {len(page.rows)} tenders ({total} so far)")
+
+            # Rows whose modal captcha fails are re-queued and retried after the
+            # rest of the page (not the run: numbered pages are gone once left)
+            queue, round_no = self._unseen(page.rows), 0
+            while queue:
+                failed = [
+                    (i, card) for i, card in queue
+                    if not self._process_row(i, card, category_name, bid_nodes, serial_no=page.offset + i + 1)
+                ]
+                queue = self._next_round(category_name, round_no, failed)
+                round_no += 1
+
+        return total, walker.truncated
+
+    def _next_round(self, category_name, round_no, failed):
+        """Rows to retry after round round_no (0 = first pass); [] once the rest are given up"""
+        if failed and round_no < config.ROW_RETRY_ROUNDS:
+            print(f"[ROW] Retry round {round_no + 1}: {len(failed)} re-queued rows")
+            return failed
+        for i, card in failed:
+            print(f"[ROW] ❌ Gave up on {card['bid_no']}")
+            self.failed_rows.append((category_name, card["bid_no"]))
+            METRICS.count("rows_failed")
+        return []
+
+    def _process_row(self, i, card, category_name, bid_nodes, serial_no=None):
+        bid_no = card["bid_no"]
+        print(f"[ROW] Processing {bid_no}")
+
+        try:
+            with METRICS.timer("modal", bid_no=bid_no):
+                # The hidden modal keeps the last row's image: wait for this row's
+                old_src = self.captchas.current_src(MODAL_CAPTCHA)
+                with self.limiter.request("modal_open"):
+                    bid_nodes.nth(i).click()
+                    if not self.waits.captcha_image(MODAL_CAPTCHA.image, old_src):
+                        raise Exception("modal captcha did not load (timeout)")
+
+                if not self.captchas.solve(MODAL_CAPTCHA):
+                    raise Exception("modal captcha failed")
+                download_link = self.page.locator("a#dwnbtn").get_attribute("href")
+        except Exception as e:
+            print(f"[ROW] ⚠️  {bid_no}: {e} → re-queued")
+            METRICS.count("rows_requeued")
+            self._close_modal()
+            return False
+
+        self._append_row(self._build_row(serial_no or i + 1, category_name, card, download_link))
+
+        print(f"[ROW] Saved {bid_no}")
+        self._close_modal()
+        return True
+
+    def _close_modal(self):
+        try:
+            self.page.click("button[data-dismiss='modal']", timeout=5000)
+        except Exception:
+            pass
+        self.waits.modal_closed(budget_ms=2000)
 
     # --------------------------------------------------
-    # MAIN LOOP (ALL CATEGORIES)
+    # SINGLE CATEGORY (ONE SEARCH PER PLANNED WINDOW)
     # --------------------------------------------------
-    def run(self):
-        for idx, row in enumerate(self.categories, start=1):
-            category_name = row["category_name"]
-
-            print("\n" + "=" * 70)
-            print(f"🚀 CATEGORY {idx}/{len(self.categories)} → {category_name}")
-            print("=" * 70)
-
-            self.reset_to_home()
-            self.go_to_gem_contracts()
+    def search_window(self, category_name):
+        with METRICS.timer("navigation", pooled=bool(self.sessions)):
+            self.open_contracts_page()
+        with METRICS.timer("category_select", category=category_name):
             self.process_category(category_name)
+        with METRICS.timer("date_filter"):
             self.set_date_filter()
-            self.solve_main_captcha_and_search()
+        self.solve_main_captcha_and_search()
+
+        print("[RESULT] Results loaded")
+        return self.result_cards()
+
+    def crawl_category(self, category_name):
+        pending = self._plan_windows(category_name)
+        while pending:
+            self._mark_window(pending.pop(0))
+            results, truncated = self.process_rows(category_name, self.search_window(category_name))
+            self._window_searched(category_name, pending, results, truncated)
+
+    # Planner decisions shared with the async engine (which runs them off the event loop)
+    def _plan_windows(self, category_name):
+        """Windows still to search for the category, oldest first ([] if it is up to date)"""
+        if not self._start_window(category_name):
+            return []
+        pending = self.planner.plan(category_name, *self.window)
+        if len(pending) > 1:
+            print(f"[PLAN] {category_name}: {len(pending)} windows of ≤{window_days(pending[0])} days")
+        return pending
+
+    def _window_searched(self, category_name, pending, results, truncated):
+        """Split, finish or merge after the current window's search; updates pending in place"""
+        if self.planner.should_split(self.window, truncated):
+            # Re-search the halves, rows saved here are skipped there
+            halves = self.planner.split(self.window)
+            print(f"[PLAN] Listing cut off at {results} results → splitting into "
+                  f"{window_days(halves[0])} + {window_days(halves[1])} days")
+            # Buffered rows are only marked seen once written: flush so the halves skip them
+            self._checkpoint()
+            pending[:0] = halves
+            return
+        if truncated:
+            print("[PLAN] ⚠️  Single day listing cut off, rows may be missing")
 
-            print("[RESULT] Results loaded")
-            self.process_rows(category_name)
+        self._finish_window(category_name, results=results, truncated=truncated)
+
+        if not results and self.planner.merge_pending(category_name, pending):
+            print(f"[PLAN] Empty window → merged ahead, {len(pending)} windows left")
+
+    # --------------------------------------------------
+    # MAIN LOOP (ALL CATEGORIES)
+    # --------------------------------------------------
+    def run(self):
+        try:
+            for idx, row in enumerate(self.categories, start=1):
+                category_name = row["category_name"]
+
+                print("\n" + "=" * 70)
+                print(f"🚀 CATEGORY {idx}/{len(self.categories)} → {category_name}")
+                print("=" * 70)
+
+                self.crawl_category(category_name)
+        finally:
+            # Whatever is buffered reaches disk even if a category blew up
+            self.sink.checkpoint()
+
+        self.waits.report.print_summary()
+        self.captchas.stats.print_summary()
+        if getattr(self.browser, "nav_report", None):
+            self.browser.nav_report.print_summary()
+        if self.sessions:
+            self.sessions.print_summary()
+        self.limiter.print_summary()
+        METRICS.print_summary()
+        print(f"[STATE] {self.state.summary()}")
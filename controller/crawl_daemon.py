@@ -0,0 +1,240 @@
+import csv
+import os
+import socket
+import threading
+import time
+
+import config
+from browser_profile import BROWSER_DATA_DIR
+from playwright_manager import PlaywrightManager
+from session_pool import SessionPool
+from controller.contracts_controller import ContractsController
+from service.metrics import METRICS
+from service.output_sink import flush_all
+from service.rate_limiter import default_limiter
+from service.work_queue import WorkQueue
+
+# Errors Playwright raises once the browser process or its page is gone
+BROWSER_GONE = ("Target closed", "Browser has been closed", "browser has disconnected",
+                "Target page, context or browser has been closed", "Connection closed")
+
+
+class CrawlDaemon:
+    """
+    Unattended, headless crawl loop.
+
+    Every DAEMON_INTERVAL seconds a cycle enqueues all categories from
+    categories.csv (optional "priority" column, higher first) into the
+    durable WorkQueue; the loop then leases one category at a time and runs
+    the normal planner crawl on it. A lease is renewed by a heartbeat thread
+    while the crawl runs, failures go back with backoff, and a crashed
+    browser is restarted without consuming an attempt.
+    """
+
+    def __init__(self, work_queue=None, interval=config.DAEMON_INTERVAL, once=False,
+                 headless=True, owner=None, name="daemon"):
+        self.queue = work_queue or WorkQueue()
+        self.interval = interval
+        self.once = once
+        self.headless = headless
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        # Browser dir + storage_state names; unique per concurrently running process
+        self.name = name
+
+        self.browser = None
+        self.browser_closed = False
+        self.sessions = None
+        self.contracts = None
+        self.limiter = default_limiter()
+        self.restarts = 0
+        self.crashes = {}
+        self.cycle_started = None
+        self.cycle_counts = {"done": 0, "failed": 0}
+
+    # --------------------------------------------------
+    # BROWSER (START / CRASH RESTART)
+    # --------------------------------------------------
+    def _start_browser(self):
+        use_sessions = config.SESSION_POOL_SIZE > 0
+        self.browser = PlaywrightManager(
+            headless=self.headless, user_data_dir=BROWSER_DATA_DIR / f"{config.BROWSER_PROFILE}-{self.name}",
+            persistent=False if use_sessions else None
+        )
+        self.browser_closed = False
+        self.browser.start(open_home=not use_sessions)
+        # A persistent context has no Browser object (manager.browser is None):
+        # its close event is what reports the Chromium process going away
+        self.browser.context.on("close", lambda _: self._on_browser_closed())
+        if self.browser.browser:
+            self.browser.browser.on("disconnected", lambda _: self._on_browser_closed())
+        self.sessions = SessionPool(self.browser, name=self.name) if use_sessions else None
+        self.contracts = ContractsController(self.browser, sessions=self.sessions)
+
+    def _stop_browser(self):
+        for close in (self.sessions and self.sessions.close, self.browser and self.browser.stop):
+            if not close:
+                continue
+            try:
+                close()
+            except Exception as e:
+                print(f"[DAEMON] ⚠️  Error while closing browser: {e}")
+        self.browser = self.sessions = self.contracts = None
+
+    def _on_browser_closed(self):
+        self.browser_closed = True
+
+    def _browser_alive(self):
+        if self.browser_closed:
+            return False
+        try:
+            return not self.contracts.page.is_closed()
+        except Exception:
+            return False
+
+    def _ensure_browser(self):
+        """(Re)start the browser until it comes up, backing off between tries"""
+        if self.browser and self._browser_alive():
+            return
+        delay = 5
+        while True:
+            if self.browser:
+                print("[DAEMON] 💥 Browser is gone → restarting")
+                self.restarts += 1
+                METRICS.count("browser_restarts")
+                self._stop_browser()
+            try:
+                self._start_browser()
+                return
+            except Exception as e:
+                print(f"[DAEMON] ❌ Browser failed to start: {e} (retry in {delay}s)")
+                self._stop_browser()
+                time.sleep(delay)
+                delay = min(delay * 2, 300)
+
+    @staticmethod
+    def _is_crash(error):
+        return any(marker.lower() in str(error).lower() for marker in BROWSER_GONE)
+
+    # --------------------------------------------------
+    # SCHEDULE
+    # --------------------------------------------------
+    def schedule_cycle(self):
+        with open(ContractsController.CATEGORY_CSV, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            self.queue.enqueue(row["category_name"], priority=int(row.get("priority") or 0))
+
+        self.cycle_started = time.time()
+        self.cycle_counts = {"done": 0, "failed": 0}
+        print(f"\n[DAEMON] 🗓️  Cycle scheduled: {len(rows)} categories | queue {self.queue.summary()}")
+        METRICS.log("cycle_start", categories=len(rows), queue=self.queue.summary())
+
+    def _finish_cycle(self):
+        elapsed = time.time() - self.cycle_started
+        print(f"[DAEMON] ✅ Cycle finished in {elapsed / 60:.1f} min → {self.cycle_counts['done']} done, "
+              f"{self.cycle_counts['failed']} failed | queue {self.queue.summary()}")
+        METRICS.log("cycle_end", seconds=round(elapsed, 1), restarts=self.restarts, rate=self.limiter.snapshot(),
+                    **self.cycle_counts)
+        self.limiter.print_summary()
+        METRICS.print_summary()
+        self.cycle_started = None
+
+    # --------------------------------------------------
+    # ONE CATEGORY (LEASED, WITH HEARTBEAT)
+    # --------------------------------------------------
+    def _heartbeat(self, category, stop):
+        while not stop.wait(self.queue.lease_seconds / 3):
+            if not self.queue.renew(category, self.owner):
+                print(f"[DAEMON] ⚠️  Lost the lease on {category}")
+                return
+
+    def _crawl(self, job):
+        stop = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job.category, stop), name="lease-heartbeat",
+                                daemon=True)
+        beat.start()
+        try:
+            with METRICS.timer("category", category=job.category, attempt=job.attempts + 1):
+                self.contracts.crawl_category(job.category)
+        finally:
+            stop.set()
+            beat.join()
+
+    def wait_for_portal(self):
+        """Backpressure from the rate limiter: no new category while the portal is throttling us"""
+        pause = self.limiter.backpressure()
+        if pause:
+            print(f"[DAEMON] ⏸️  Portal throttling → next category in {pause:.0f}s "
+                  f"(rate {self.limiter.rate:.2f} req/s)")
+            METRICS.count("scheduler_pauses")
+            time.sleep(pause)
+
+    def process(self, job):
+        """Crawl one leased category; returns "done", "failed" or "released" (browser crash)"""
+        print(f"\n[DAEMON] 🚀 {job.category} (priority {job.priority}, attempt {job.attempts + 1})")
+        self._ensure_browser()
+        try:
+            self._crawl(job)
+        except Exception as e:
+            crashed = self._is_crash(e) or not self._browser_alive()
+            if crashed:
+                self.crashes[job.category] = self.crashes.get(job.category, 0) + 1
+            if crashed and self.crashes[job.category] <= 2:
+                # Not the category's fault (twice at most): retry it right away on a fresh browser
+                print(f"[DAEMON] 💥 Browser crashed during {job.category}: {e}")
+                self.queue.release(job.category)
+                self._ensure_browser()
+                return "released"
+            status, delay = self.queue.fail(job.category, e)
+            self.cycle_counts["failed"] += 1
+            METRICS.count("daemon_jobs", outcome="failed")
+            print(f"[DAEMON] ❌ {job.category}: {e} → {status}"
+                  f"{f', retry in {delay:.0f}s' if status == 'queued' else ''}")
+            return "failed"
+
+        self.queue.complete(job.category)
+        self.crashes.pop(job.category, None)
+        self.cycle_counts["done"] += 1
+        METRICS.count("daemon_jobs", outcome="done")
+        return "done"
+
+    # --------------------------------------------------
+    # MAIN LOOP
+    # --------------------------------------------------
+    def run(self):
+        print(f"[DAEMON] Owner {self.owner} | interval {self.interval}s | queue {self.queue.summary()}")
+        released = self.queue.release_owner(self.owner)
+        if released:
+            print(f"[DAEMON] Re-queued {released} categories left leased by a previous run")
+        next_cycle = time.time()
+        job = None
+        try:
+            while True:
+                if time.time() >= next_cycle and self.cycle_started is None:
+                    self.schedule_cycle()
+                    next_cycle = self.cycle_started + self.interval
+
+                self.wait_for_portal()
+                job = self.queue.lease(self.owner)
+                if job:
+                    self.process(job)
+                    job = None
+                    continue
+
+                if self.cycle_started is not None and not self.queue.pending():
+                    self._finish_cycle()
+                    if self.once:
+                        return
+
+                # Idle until the next retry or the next cycle, whichever is first
+                waits = [next_cycle - time.time(), 60]
+                ready_in = self.queue.next_ready_in()
+                if ready_in is not None:
+                    waits.append(ready_in)
+                time.sleep(max(1.0, min(waits)))
+        finally:
+            if job:
+                self.queue.release(job.category)
+            flush_all()
+            self._stop_browser()
+            print(f"[DAEMON] Stopped | {self.restarts} browser restarts | queue {self.queue.summary()}")
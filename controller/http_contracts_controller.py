@@ -0,0 +1,125 @@
+import config
+from controller.contracts_controller import ContractsController
+from service.http_transport import CaptchaRejected, GemHttpTransport
+from service.metrics import ATTEMPT_BUCKETS, METRICS
+from solver.captcha_solver import ensemble_solve
+
+
+class HttpContractsController(ContractsController):
+    """
+    ContractsController that uses the browser only to bootstrap the session.
+
+    After go_to_gem_contracts() the cookies are copied into a pooled
+    requests session; searches, row captchas and download links are then
+    plain HTTP calls (service.http_transport).
+    """
+
+    def __init__(self, browser, transport=None, wait_report=None, **kwargs):
+        super().__init__(browser, wait_report=wait_report, **kwargs)
+        self.transport = transport
+
+    # --------------------------------------------------
+    # SESSION BOOTSTRAP
+    # --------------------------------------------------
+    def bootstrap(self):
+        with METRICS.timer("navigation", step="bootstrap"):
+            self.reset_to_home()
+            self.go_to_gem_contracts()
+        if self.transport is None:
+            self.transport = GemHttpTransport.from_browser(self.browser)
+        else:
+            self.transport.load_cookies(self.page.context.cookies())
+        print("[HTTP] Session bootstrapped from browser")
+
+    def _solve(self, img_bytes, kind):
+        text, conf = ensemble_solve(img_bytes)
+        return text, conf, self._capture(img_bytes, kind, text, conf)
+
+    # --------------------------------------------------
+    # SEARCH + ROWS OVER HTTP
+    # --------------------------------------------------
+    def _site_id(self, category_name):
+        # The form posts the select2 option id, not the name
+        entry = self.catalog.lookup(category_name)
+        if not entry or not entry.get("site_id"):
+            raise Exception(f"No site id for '{category_name}' in the category catalog "
+                            f"(run python -m tools.harvest_categories first)")
+        return entry["site_id"]
+
+    def search(self, category_name, max_attempts=config.CAPTCHA_MAX_ATTEMPTS):
+        from_date, to_date = self._date_window()
+        category_id = self._site_id(category_name)
+
+        for attempt in range(1, max_attempts + 1):
+            with METRICS.timer("captcha_solve", kind="search"):
+                text, conf, sha1 = self._solve(self.transport.search_captcha(), "search")
+            if not text or conf < config.CAPTCHA_MIN_CONFIDENCE:
+                print(f"[HTTP] Search captcha low confidence (attempt {attempt})")
+                continue
+            try:
+                with METRICS.timer("captcha_submit", kind="search", category=category_name):
+                    cards = self.transport.search(category_id, from_date, to_date, text)
+            except CaptchaRejected:
+                self._captcha_outcome(sha1, False)
+                print(f"[HTTP] Search captcha rejected (attempt {attempt})")
+                continue
+            self._captcha_outcome(sha1, True)
+            METRICS.observe("captcha_attempts", attempt, ATTEMPT_BUCKETS, kind="search", outcome="success")
+            return cards
+
+        METRICS.observe("captcha_attempts", max_attempts, ATTEMPT_BUCKETS, kind="search", outcome="failed")
+        raise Exception("Main captcha failed")
+
+    def fetch_download_link(self, bid_no, max_attempts=config.CAPTCHA_MAX_ATTEMPTS):
+        # Each attempt fetches a fresh order captcha; low confidence guesses are not submitted
+        for attempt in range(1, max_attempts + 1):
+            with METRICS.timer("captcha_solve", kind="modal"):
+                text, conf, sha1 = self._solve(self.transport.order_captcha(bid_no), "modal")
+            if not text or conf < config.CAPTCHA_MIN_CONFIDENCE:
+                continue
+            with METRICS.timer("captcha_submit", kind="modal", bid_no=bid_no):
+                link = self.transport.download_link(bid_no, text)
+            self._captcha_outcome(sha1, bool(link))
+            if link:
+                METRICS.observe("captcha_attempts", attempt, ATTEMPT_BUCKETS, kind="modal", outcome="success")
+                return link
+
+        print(f"[HTTP] Order captcha failed for {bid_no} after {max_attempts} attempts")
+        METRICS.observe("captcha_attempts", max_attempts, ATTEMPT_BUCKETS, kind="modal", outcome="failed")
+        return None
+
+    # Planner loop (windows, splits, merges) is inherited from ContractsController
+    def search_window(self, category_name):
+        if self.transport is None:
+            self.bootstrap()
+        return self.search(category_name)
+
+    def process_rows(self, category_name, cards=None):
+        if not cards:
+            print(f"[RESULT] ❌ No Result Found → {category_name}")
+            return 0, False
+
+        print(f"[INFO] Total tenders: {len(cards)}")
+        # Failed rows are re-queued after the rest, as in ContractsController.process_rows
+        queue, round_no = self._new_cards(cards), 0
+        while queue:
+            failed = [(i, card) for i, card in queue if not self._fetch_row(i, card, category_name)]
+            queue = self._next_round(category_name, round_no, failed)
+            round_no += 1
+
+        # One response, no further pages: a full one may be cut off at the site's cap
+        return len(cards), len(cards) >= self.planner.cap
+
+    def _fetch_row(self, i, card, category_name):
+        bid_no = card["bid_no"]
+        print(f"[ROW] Processing {bid_no}")
+
+        with METRICS.timer("modal", bid_no=bid_no):
+            download_link = self.fetch_download_link(bid_no)
+        if not download_link:
+            METRICS.count("rows_requeued")
+            return False
+
+        self._append_row(self._build_row(i + 1, category_name, card, download_link))
+        print(f"[ROW] Saved {bid_no}")
+        return True
@@ -0,0 +1,208 @@
+import time
+import threading
+
+
+# --------------------------------------------------
+# PAGE SIGNALS (JS PREDICATES)
+# --------------------------------------------------
+HREF_READY_JS = """
+(sel) => {
+    const a = document.querySelector(sel);
+    const href = a && a.getAttribute('href');
+    return !!href && href !== '#' && !href.startsWith('javascript');
+}
+"""
+
+SELECT2_LOADED_JS = """
+() => {
+    const box = document.querySelector('.select2-results__options');
+    if (!box) return false;
+    if (box.querySelector('.loading-results')) return false;
+    return box.querySelectorAll('li.select2-results__option').length > 0;
+}
+"""
+
+SELECT2_CLOSED_JS = """
+() => !document.querySelector('.select2-container--open')
+"""
+
+# Cards / "No Result" left over from an earlier search are tagged data-stale
+# (FORGET_RESULTS_JS) before a submit, so only a fresh answer counts
+SEARCH_DONE_JS = """
+() => !!document.querySelector('span.ajxtag_order_number:not([data-stale])')
+    || [...document.querySelectorAll('div[style*="color:red"]:not([data-stale])')]
+        .some(d => d.innerText.includes('No Result Found'))
+"""
+
+FORGET_RESULTS_JS = """
+(kind) => {
+    if (kind === 'search') {
+        document.querySelectorAll('span.ajxtag_order_number, div[style*="color:red"]')
+            .forEach(el => el.setAttribute('data-stale', ''));
+    } else {
+        const link = document.querySelector('a#dwnbtn');
+        if (link) link.removeAttribute('href');
+    }
+}
+"""
+
+# The modal stays in the DOM when hidden: wait for a shown image that is not the last row's
+CAPTCHA_READY_JS = """
+(a) => {
+    const img = document.querySelector(a.image);
+    const src = img && img.getAttribute('src');
+    return !!src && src !== a.src && src.includes(',') && img.getClientRects().length > 0;
+}
+"""
+
+IMAGE_SRC_JS = """
+(sel) => {
+    const img = document.querySelector(sel);
+    return img ? img.getAttribute('src') : null;
+}
+"""
+
+MODAL_CLOSED_JS = """
+() => !document.querySelector('.modal.show, .modal.in')
+"""
+
+
+class WaitReport:
+    """
+    Per-step timing for event-driven waits.
+
+    Each step records how long it actually waited and the fixed sleep
+    ("budget") it replaced, so the report shows the wall-clock time saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = {}
+
+    def record(self, step, waited, budget, timed_out):
+        with self._lock:
+            s = self.steps.setdefault(
+                step, {"count": 0, "waited": 0.0, "budget": 0.0, "fallbacks": 0}
+            )
+            s["count"] += 1
+            s["waited"] += waited
+            s["budget"] += budget
+            s["fallbacks"] += int(timed_out)
+
+    def saved(self):
+        return sum(s["budget"] - s["waited"] for s in self.steps.values())
+
+    def print_summary(self):
+        if not self.steps:
+            return
+
+        print("\n" + "=" * 70)
+        print("⏱️  WAIT REPORT (event-driven vs fixed sleeps)")
+        print("=" * 70)
+        print(f"{'step':<22}{'n':>6}{'waited s':>11}{'fixed s':>10}{'saved s':>10}{'fallback':>10}")
+        for step, s in sorted(self.steps.items()):
+            print(
+                f"{step:<22}{s['count']:>6}{s['waited']:>11.1f}{s['budget']:>10.1f}"
+                f"{s['budget'] - s['waited']:>10.1f}{s['fallbacks']:>10}"
+            )
+        print(f"[WAIT] Total wall-clock saved: {self.saved():.1f}s")
+
+
+class PageWaiter:
+    """
+    Waits on real page signals instead of fixed wait_for_timeout sleeps.
+
+    Every wait has a fallback timeout; hitting it is not an error (the old
+    code would have slept anyway), it is just counted in the report.
+    """
+
+    def __init__(self, page, report=None):
+        self.page = page
+        self.report = report or WaitReport()
+
+    def _timed(self, step, budget_ms, fallback_ms, fn):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            fn(fallback_ms if fallback_ms is not None else budget_ms)
+        except Exception:
+            timed_out = True
+        self.report.record(step, time.perf_counter() - started, budget_ms / 1000, timed_out)
+        return not timed_out
+
+    def selector(self, step, selector, budget_ms, state="visible", fallback_ms=None):
+        return self._timed(
+            step, budget_ms, fallback_ms,
+            lambda t: self.page.wait_for_selector(selector, state=state, timeout=t)
+        )
+
+    def condition(self, step, js, budget_ms, arg=None, fallback_ms=None):
+        return self._timed(
+            step, budget_ms, fallback_ms,
+            lambda t: self.page.wait_for_function(js, arg=arg, timeout=t)
+        )
+
+    def network_idle(self, step, budget_ms, fallback_ms=None):
+        return self._timed(
+            step, budget_ms, fallback_ms,
+            lambda t: self.page.wait_for_load_state("networkidle", timeout=t)
+        )
+
+    # --------------------------------------------------
+    # GEM-SPECIFIC SIGNALS
+    # --------------------------------------------------
+    def select2_results(self, step="select2_results", budget_ms=1500, fallback_ms=None):
+        return self.condition(step, SELECT2_LOADED_JS, budget_ms, fallback_ms=fallback_ms)
+
+    def select2_closed(self, step="category_selected", budget_ms=1000, fallback_ms=None):
+        return self.condition(step, SELECT2_CLOSED_JS, budget_ms, fallback_ms=fallback_ms)
+
+    def search_results(self, step="search_results", budget_ms=4000, fallback_ms=None):
+        # AJAX search: let the XHR settle, then wait for results / "No Result"
+        def wait(t):
+            started = time.perf_counter()
+            try:
+                self.page.wait_for_load_state("networkidle", timeout=t)
+            except Exception:
+                pass
+            left = max(1, t - int((time.perf_counter() - started) * 1000))
+            self.page.wait_for_function(SEARCH_DONE_JS, timeout=left)
+
+        return self._timed(step, budget_ms, fallback_ms, wait)
+
+    def href_ready(self, selector, step="download_link", budget_ms=3000, fallback_ms=15000):
+        return self.condition(step, HREF_READY_JS, budget_ms, arg=selector, fallback_ms=fallback_ms)
+
+    def captcha_image(self, image, old_src, step="modal_captcha", budget_ms=2000, fallback_ms=15000):
+        """A visible captcha image whose src differs from old_src (the previous row's)"""
+        return self.condition(step, CAPTCHA_READY_JS, budget_ms, arg={"image": image, "src": old_src},
+                              fallback_ms=fallback_ms)
+
+    def modal_closed(self, step="modal_closed", budget_ms=2000, fallback_ms=None):
+        return self.condition(step, MODAL_CLOSED_JS, budget_ms, fallback_ms=fallback_ms)
+
+
+class AsyncPageWaiter(PageWaiter):
+    """PageWaiter for playwright.async_api pages (same signals, same report)"""
+
+    async def _timed(self, step, budget_ms, fallback_ms, fn):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            await fn(fallback_ms if fallback_ms is not None else budget_ms)
+        except Exception:
+            timed_out = True
+        self.report.record(step, time.perf_counter() - started, budget_ms / 1000, timed_out)
+        return not timed_out
+
+    async def search_results(self, step="search_results", budget_ms=4000, fallback_ms=None):
+        async def wait(t):
+            started = time.perf_counter()
+            try:
+                await self.page.wait_for_load_state("networkidle", timeout=t)
+            except Exception:
+                pass
+            left = max(1, t - int((time.perf_counter() - started) * 1000))
+            await self.page.wait_for_function(SEARCH_DONE_JS, timeout=left)
+
+        return await self._timed(step, budget_ms, fallback_ms, wait)
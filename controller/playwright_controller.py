@@ -1,18 +1,17 @@
 import csv
-import base64
-import io
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from PIL import Image
 
-from solver.captcha_solver import ensemble_solve
+import config
+from controller.captcha_retry import SEARCH_CAPTCHA, CaptchaRetryManager
 
 
 class ContractsController:
     def __init__(self, browser):
         self.browser = browser
         self.page = browser.page
+        self.captchas = CaptchaRetryManager(self.page)
 
         self.csv_path = (
             Path(__file__).resolve().parents[1]
@@ -61,56 +60,42 @@ class ContractsController:
             print("[CSV] All suggested categories already exist in file")
             return
 
+        # Number the rows up front so a retry never re-numbers or half-applies them
+        start_no = len(self.csv_rows) + 1
+        rows = [[start_no + i, cat] for i, cat in enumerate(categories_to_add)]
+
         # Retry logic for file writing (in case file is locked)
         max_retries = 3
-        for attempt in range(max_retries):
+        for attempt in range(max_retries + 1):
             try:
-                with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-                    writer = csv.writer(f)
-
-                    for cat in categories_to_add:
-                        si_no = len(self.csv_rows) + 1
-                        writer.writerow([si_no, cat])
-                        
-                        # Add to in-memory list
-                        self.csv_rows.append({
-                            "si_no": si_no,
-                            "category_name": cat
-                        })
-                        self.csv_category_set.add(cat.lower())
-                        print(f"[CSV] ✅ Added: {cat}")
-                
-                print(f"[CSV] Successfully added {len(categories_to_add)} new categories")
-                print(f"[CSV] Total categories now: {len(self.csv_rows)}")
-                break  # Success, exit retry loop
-                
-            except PermissionError as e:
+                self._write_category_rows(rows)
+                break
+            except PermissionError:
                 if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # 2s, 4s, 6s
+                    wait_time = (attempt + 1) * 2  # 2s, 4s
                     print(f"[CSV] ⚠️  File is locked, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
                     time.sleep(wait_time)
-                else:
+                elif attempt == max_retries - 1:
                     print(f"[CSV] ❌ ERROR: Could not write to CSV after {max_retries} attempts")
                     print(f"[CSV] Please close the CSV file in Excel/Notepad and press Enter to continue...")
                     input()
-                    # Try one more time after user confirmation
-                    try:
-                        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-                            writer = csv.writer(f)
-                            for cat in categories_to_add:
-                                si_no = len(self.csv_rows) + 1
-                                writer.writerow([si_no, cat])
-                                self.csv_rows.append({
-                                    "si_no": si_no,
-                                    "category_name": cat
-                                })
-                                self.csv_category_set.add(cat.lower())
-                                print(f"[CSV] ✅ Added: {cat}")
-                        print(f"[CSV] Successfully added {len(categories_to_add)} new categories")
-                        print(f"[CSV] Total categories now: {len(self.csv_rows)}")
-                    except Exception as final_error:
-                        print(f"[CSV] ❌ Final attempt failed: {final_error}")
-                        raise
+                else:
+                    print("[CSV] ❌ Final attempt failed")
+                    raise
+
+        # In-memory state only changes once the rows are on disk
+        for si_no, cat in rows:
+            self.csv_rows.append({"si_no": si_no, "category_name": cat})
+            self.csv_category_set.add(cat.lower())
+            print(f"[CSV] ✅ Added: {cat}")
+
+        print(f"[CSV] Successfully added {len(rows)} new categories")
+        print(f"[CSV] Total categories now: {len(self.csv_rows)}")
+
+    def _write_category_rows(self, rows):
+        """Single open + writerows for the whole batch"""
+        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
 
     # --------------------------------------------------
     # NAVIGATION
@@ -161,63 +146,14 @@ class ContractsController:
     # --------------------------------------------------
     # CAPTCHA
     # --------------------------------------------------
-    def _get_captcha_image(self):
-        """Extract CAPTCHA image from page"""
-        try:
-            src = self.page.locator("#captchaimg1").get_attribute("src")
-            img_bytes = base64.b64decode(src.split(",")[1])
-            return Image.open(io.BytesIO(img_bytes))
-        except Exception as e:
-            print(f"[CAPTCHA] ❌ Error getting image: {e}")
-            raise
-
-    def _refresh_captcha(self):
-        """Click on CAPTCHA image to refresh it"""
-        try:
-            self.page.click("#captchaimg1")
-            self.page.wait_for_timeout(1000)
-        except Exception as e:
-            print(f"[CAPTCHA] ❌ Error refreshing: {e}")
-
-    def solve_and_submit_captcha(self, max_attempts=10):
-        """Solve CAPTCHA using ensemble solver with retry logic"""
-        attempt = 1
-
-        while attempt <= max_attempts:
-            print(f"[CAPTCHA] Attempt {attempt}/{max_attempts}")
-            
-            try:
-                # Get CAPTCHA image and solve
-                img = self._get_captcha_image()
-                text, confidence = ensemble_solve(img)
-
-                print(f"[OCR] Result: '{text}' | Confidence: {confidence:.2f}")
-
-                # Check if confidence is acceptable
-                if not text or len(text) < 4 or confidence < 0.55:
-                    print(f"[CAPTCHA] Low confidence or invalid text, refreshing...")
-                    self._refresh_captcha()
-                    attempt += 1
-                    continue
-
-                # Fill CAPTCHA and submit
-                self.page.fill("#captcha_code1", text)
-                self.page.click("#searchlocation1")
-                
-                # Wait for page to process
-                self.page.wait_for_timeout(3000)
-                
-                print(f"[CAPTCHA] ✅ Submitted with text: '{text}'")
-                return True
-                
-            except Exception as e:
-                print(f"[CAPTCHA] ❌ Error in attempt {attempt}: {e}")
-                attempt += 1
-                if attempt <= max_attempts:
-                    self._refresh_captcha()
-
-        print(f"[CAPTCHA] ❌ Failed after {max_attempts} attempts")
-        return False
+    def solve_and_submit_captcha(self, max_attempts=config.CAPTCHA_MAX_ATTEMPTS):
+        """
+        Solve and submit the search CAPTCHA with CaptchaRetryManager: low
+        confidence guesses are refreshed, acceptance is read from the portal
+        within CAPTCHA_VERDICT_TIMEOUT, and a missing verdict records no outcome.
+        """
+        self.captchas.max_attempts = max_attempts
+        return self.captchas.solve(SEARCH_CAPTCHA)
 
     # --------------------------------------------------
     # CATEGORY PROCESS (CORE LOGIC)
@@ -0,0 +1,227 @@
+"""
+Walk every page of a contracts search instead of only the first screen.
+
+ResultsWalker.pages() is a generator of ResultPage batches. It recognises
+three loading styles:
+
+- "load more" button: clicked *before* the current batch is handed out, so
+  the next rows load in the background while the caller works through the
+  modals of this batch (appended rows don't disturb earlier indices);
+- infinite scroll: the list is scrolled to the bottom before handing out
+  the batch, for the same overlap;
+- numbered pagination ("next"): the page is replaced, so it can only be
+  followed once the caller is done with the current batch.
+
+AsyncResultsWalker is the same walk for playwright.async_api pages, as an
+async generator.
+
+All of it happens on the single search, so the search captcha is solved
+once per category window however many results there are.
+
+After the walk, .listed is the number of cards the search listed and
+.truncated says whether the site may have cut it short: the walk stopped
+at RESULTS_MAX_PAGES, or the listing ended at SEARCH_RESULT_CAP cards with
+no further page. Only then does the planner split the window.
+"""
+
+from collections import namedtuple
+
+import config
+from controller.row_extractor import extract_cards, extract_cards_async
+
+# offset: cards on earlier (replaced) pages, for serial numbers
+# rows:   [(index on the current DOM, card)]
+ResultPage = namedtuple("ResultPage", "number offset rows")
+
+# Finds the control that loads more rows and tags it so it can be clicked by selector
+NEXT_CONTROL_JS = """
+() => {
+    const usable = el => el && el.offsetParent !== null && !el.disabled
+        && !el.classList.contains('disabled')
+        && !(el.parentElement && el.parentElement.classList.contains('disabled'));
+    const tag = (el, mode) => {
+        el.setAttribute('data-results-walker', mode);
+        return {mode, selector: `[data-results-walker="${mode}"]`};
+    };
+    const clickable = [...document.querySelectorAll('a, button, input[type=button]')];
+
+    const more = clickable.find(el =>
+        usable(el) && /^(load|show|view)\\s+more/i.test((el.innerText || el.value || '').trim()));
+    if (more) return tag(more, 'more');
+
+    const next = document.querySelector('a[rel=next], .pagination li.next a, .pagination .next, a.page-link[aria-label=Next]')
+        || clickable.find(el => /^(next|›|»|>)$/i.test((el.innerText || '').trim()));
+    if (usable(next)) return tag(next, 'page');
+
+    return null;
+}
+"""
+
+# Scrolls to the bottom; true only if the page actually moved (a list that
+# fits the viewport cannot load more by scrolling)
+SCROLL_JS = """
+() => {
+    const before = window.scrollY;
+    window.scrollTo(0, document.body.scrollHeight);
+    return window.scrollY > before;
+}
+"""
+
+COUNT_JS = "() => document.querySelectorAll('span.ajxtag_order_number').length"
+
+MORE_LOADED_JS = "(n) => document.querySelectorAll('span.ajxtag_order_number').length > n"
+
+PAGE_CHANGED_JS = """
+(first) => {
+    const el = document.querySelector('span.ajxtag_order_number');
+    return !!el && el.innerText.trim() !== first;
+}
+"""
+
+
+class ResultsWalker:
+    def __init__(self, page, waits, max_pages=config.RESULTS_MAX_PAGES, limiter=None,
+                 cap=config.SEARCH_RESULT_CAP):
+        self.page = page
+        self.waits = waits
+        self.max_pages = max_pages
+        self.limiter = limiter
+        self.cap = cap
+        self.listed = 0
+        self.truncated = False
+
+    def _control(self):
+        try:
+            return self.page.evaluate(NEXT_CONTROL_JS)
+        except Exception:
+            return None
+
+    def _throttle(self):
+        # Next rows are fetched while earlier ones are processed, so pace only (no latency feedback)
+        if self.limiter:
+            self.limiter.acquire()
+
+    def _load_more(self, control):
+        """Start loading the next rows; False if nothing can load (click failed, no scroll)"""
+        try:
+            if control:
+                self._throttle()
+                self.page.click(control["selector"])
+                return True
+            return bool(self.page.evaluate(SCROLL_JS))
+        except Exception:
+            return False
+
+    def _end(self):
+        # No further page: a listing that stops exactly at the site's cap may still be cut off
+        # (one that ran past it was not capped at all)
+        self.truncated = self.listed == self.cap
+
+    def pages(self, first_cards=None):
+        cards = first_cards if first_cards is not None else extract_cards(self.page)
+        seen = 0      # cards already handed out from the current DOM
+        offset = 0    # cards on earlier, replaced pages
+        self.listed = 0
+        self.truncated = False
+
+        for number in range(1, self.max_pages + 1):
+            control = self._control()
+
+            # Start loading the next rows before handing these out
+            loading = control is None or control["mode"] == "more"
+            if loading:
+                loading = self._load_more(control)
+
+            yield ResultPage(number, offset, list(enumerate(cards))[seen:])
+            seen = len(cards)
+            self.listed = offset + seen
+
+            if control and control["mode"] == "page":
+                first = cards[0]["bid_no"] if cards else ""
+                self._throttle()
+                try:
+                    self.page.click(control["selector"])
+                except Exception:
+                    return self._end()
+                if not self.waits.condition("results_next_page", PAGE_CHANGED_JS, budget_ms=4000, arg=first):
+                    return self._end()
+                offset += seen
+                seen = 0
+            elif not loading or not self.waits.condition(
+                "results_more", MORE_LOADED_JS, budget_ms=1500 if control else 800, arg=seen
+            ):
+                return self._end()  # nothing appended: last page
+
+            cards = extract_cards(self.page)
+            if len(cards) <= seen and not (control and control["mode"] == "page"):
+                return self._end()
+        self.truncated = True
+        print(f"[RESULT] ⚠️  Stopped after {self.max_pages} pages")
+
+
+class AsyncResultsWalker(ResultsWalker):
+    """ResultsWalker for playwright.async_api pages (same signals, same truncation rule)"""
+
+    async def _control(self):
+        try:
+            return await self.page.evaluate(NEXT_CONTROL_JS)
+        except Exception:
+            return None
+
+    async def _throttle(self):
+        if self.limiter:
+            await self.limiter.acquire_async()
+
+    async def _load_more(self, control):
+        try:
+            if control:
+                await self._throttle()
+                await self.page.click(control["selector"])
+                return True
+            return bool(await self.page.evaluate(SCROLL_JS))
+        except Exception:
+            return False
+
+    async def pages(self, first_cards=None):
+        cards = first_cards if first_cards is not None else await extract_cards_async(self.page)
+        seen = 0
+        offset = 0
+        self.listed = 0
+        self.truncated = False
+
+        for number in range(1, self.max_pages + 1):
+            control = await self._control()
+
+            loading = control is None or control["mode"] == "more"
+            if loading:
+                loading = await self._load_more(control)
+
+            yield ResultPage(number, offset, list(enumerate(cards))[seen:])
+            seen = len(cards)
+            self.listed = offset + seen
+
+            if control and control["mode"] == "page":
+                first = cards[0]["bid_no"] if cards else ""
+                await self._throttle()
+                try:
+                    await self.page.click(control["selector"])
+                except Exception:
+                    self._end()
+                    return
+                if not await self.waits.condition("results_next_page", PAGE_CHANGED_JS, budget_ms=4000, arg=first):
+                    self._end()
+                    return
+                offset += seen
+                seen = 0
+            elif not loading or not await self.waits.condition(
+                "results_more", MORE_LOADED_JS, budget_ms=1500 if control else 800, arg=seen
+            ):
+                self._end()
+                return
+
+            cards = await extract_cards_async(self.page)
+            if len(cards) <= seen and not (control and control["mode"] == "page"):
+                self._end()
+                return
+        self.truncated = True
+        print(f"[RESULT] ⚠️  Stopped after {self.max_pages} pages")
@@ -0,0 +1,65 @@
+"""
+Bulk extraction of GeM contract result cards.
+
+One page.evaluate walks every result card and returns structured records.
+Fields are grouped per card (the closest ancestor of an order number that
+holds no other order number), so a card with a missing span cannot shift
+the data of the cards after it the way global nth(i * k) indexing does.
+"""
+
+from service.metrics import METRICS
+
+# span class → field names, in the order the spans appear inside a card
+CARD_FIELDS = {
+    "ajxtag_order_number": ["bid_no"],
+    "ajxtag_item_title": ["product", "brand", "model"],
+    "ajxtag_quantity": ["ordered_quantity"],
+    "ajxtag_totalvalue": ["total_value", "price"],
+    "ajxtag_buyer_dept_org": ["buyer_dept_org", "organization_name", "buyer_designation"],
+    "ajxtag_buying_mode": ["state", "buyer_department", "office_zone", "buying_mode"],
+    "ajxtag_contract_date": ["contract_date"],
+    "ajxtag_order_status": ["order_status"],
+}
+
+EXTRACT_CARDS_JS = """
+(fields) => {
+    const bids = [...document.querySelectorAll('span.ajxtag_order_number')];
+
+    const cardOf = (bid) => {
+        let node = bid;
+        while (node.parentElement
+               && node.parentElement.querySelectorAll('span.ajxtag_order_number').length === 1) {
+            node = node.parentElement;
+        }
+        return node;
+    };
+
+    return bids.map((bid, index) => {
+        const card = cardOf(bid);
+        const record = {index};
+        for (const [cls, names] of Object.entries(fields)) {
+            const spans = card === bid ? [] : [...card.querySelectorAll('span.' + cls)];
+            names.forEach((name, k) => {
+                record[name] = spans[k] ? spans[k].innerText.trim() : '';
+            });
+        }
+        record.bid_no = bid.innerText.trim();
+        return record;
+    });
+}
+"""
+
+
+def extract_cards(page):
+    """Return one dict per result card (keys from CARD_FIELDS + 'index')"""
+    with METRICS.timer("row_extract") as span:
+        cards = page.evaluate(EXTRACT_CARDS_JS, CARD_FIELDS)
+        span["cards"] = len(cards)
+    return cards
+
+
+async def extract_cards_async(page):
+    with METRICS.timer("row_extract") as span:
+        cards = await page.evaluate(EXTRACT_CARDS_JS, CARD_FIELDS)
+        span["cards"] = len(cards)
+    return cards
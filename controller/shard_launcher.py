@@ -0,0 +1,282 @@
+"""
+Multi-process sharded crawl: one browser + ContractsController per process.
+
+    python run.py --processes 8 [--shard-by hash|size]
+
+OCR (OpenCV + tesseract) and driving Chromium are CPU bound, so threads
+in one process (worker_pool) stop scaling; here every shard is a separate
+Python process with its own GIL, PlaywrightManager, session pool and
+browser dir.
+
+- Sharding: by a stable hash of the category name, or by estimated size
+  (crawl-state density x days still to search, largest first into the
+  least-loaded shard).
+- Balancing: the shards only decide who goes first. All categories sit in
+  one SQLite WorkQueue; a process leases from its own shard and steals from
+  the others once it is empty.
+- Output: each process writes contracts_shard-<n>; after the run the shards
+  are merged into contracts_merged without duplicate bid_nos.
+- Console: child output goes to logs/shard-<n>.log; this process prints a
+  single progress view. Ctrl-C stops every child (SIGTERM → flush, release
+  the lease, close the browser) and still merges what was written.
+"""
+
+import multiprocessing
+import os
+import signal
+import statistics
+import sys
+import time
+import zlib
+
+import config
+from controller.contracts_controller import BASE_PATH, ContractsController
+from controller.crawl_daemon import CrawlDaemon
+from service.category_catalog import normalize
+from service.crawl_state import default_state
+from service.contract_schema import OUTPUT_COLUMNS
+from service.output_sink import flush_all, install_signal_handlers, merge_shards
+from service.work_queue import WorkQueue
+
+LOG_DIR = BASE_PATH / "logs"
+SHARD_QUEUE_PATH = BASE_PATH / "data" / "state" / "shard_queue.sqlite"
+
+
+def shard_name(shard):
+    return f"contracts_shard-{shard}"
+
+
+# --------------------------------------------------
+# SHARDING
+# --------------------------------------------------
+def hash_shards(categories, processes):
+    """Stable across runs and machines (unlike hash(), which is salted per process)"""
+    return {c: zlib.crc32(normalize(c).encode("utf-8")) % processes for c in categories}
+
+
+def estimate_sizes(categories, state=None, since=None):
+    """Expected results per category: smoothed results/day x days still to search"""
+    state = state or default_state()
+    densities = {c: state.density(c) for c in categories}
+    known = [d for d in densities.values() if d]
+    fallback = statistics.median(known) if known else 1.0
+
+    sizes = {}
+    for c in categories:
+        window = state.next_window(c, since=since)
+        days = max(1, (window[1] - window[0]).days) if window else 0
+        sizes[c] = (densities[c] or fallback) * days
+    return sizes
+
+
+def size_shards(sizes, processes):
+    """Longest-processing-time-first: biggest category into the least-loaded shard"""
+    loads = [0.0] * processes
+    shards = {}
+    for c, size in sorted(sizes.items(), key=lambda kv: kv[1], reverse=True):
+        shard = loads.index(min(loads))
+        shards[c] = shard
+        loads[shard] += size
+    return shards
+
+
+# --------------------------------------------------
+# CHILD PROCESS
+# --------------------------------------------------
+def _shard_main(shard, queue_path, events, since, processes):
+    """Entry point of one shard process (spawned, so config is re-imported)"""
+    # Ctrl-C is handled by the launcher; SIGTERM flushes and unwinds like Ctrl-C.
+    # Own process group, so the terminal's SIGINT cannot kill this shard's Chromium first
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    install_signal_handlers()
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log = open(LOG_DIR / f"shard-{shard}.log", "a", buffering=1, encoding="utf-8")
+    sys.stdout = sys.stderr = log
+
+    config.BACKFILL_SINCE = since
+    config.OUTPUT_NAME = shard_name(shard)
+    config.HEADLESS = True
+    # Every process runs its own limiter: together they stay within the configured rates
+    config.RATE_SHARE = 1.0 / processes
+
+    worker = ShardWorker(shard, WorkQueue(queue_path), events)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        print(f"[SHARD] {shard} stopped")
+
+
+class ShardWorker:
+    """Drains the shared queue (own shard first) with a CrawlDaemon's browser/crash handling"""
+
+    def __init__(self, shard, work_queue, events):
+        self.shard = shard
+        self.events = events
+        self.daemon = CrawlDaemon(
+            work_queue=work_queue, headless=True, owner=f"shard-{shard}:{os.getpid()}", name=f"shard{shard}"
+        )
+
+    def _rows(self):
+        contracts = self.daemon.contracts
+        return contracts.rows_saved if contracts else 0
+
+    def run(self):
+        queue, daemon = self.daemon.queue, self.daemon
+        job = None
+        try:
+            while True:
+                daemon.wait_for_portal()
+                job = queue.lease(daemon.owner, shard=self.shard)
+                if job is None:
+                    if not queue.pending():
+                        return
+                    # Only retries in backoff (or other shards' leases) left
+                    time.sleep(min(max(1.0, queue.next_ready_in() or 5.0), 30.0))
+                    continue
+
+                self.events.put(("start", self.shard, job.category, job.shard))
+                rows_before = self._rows()
+                outcome = daemon.process(job)
+                # A browser restart replaces the controller (and its row counter)
+                rows = max(0, self._rows() - rows_before) if outcome != "released" else 0
+                self.events.put(("end", self.shard, job.category, outcome, rows, daemon.limiter.rate))
+                job = None
+        finally:
+            if job:
+                queue.release(job.category)
+            flush_all()
+            daemon._stop_browser()
+            self.events.put(("exit", self.shard, daemon.restarts))
+
+
+# --------------------------------------------------
+# LAUNCHER (PARENT PROCESS)
+# --------------------------------------------------
+class ProgressView:
+    def __init__(self, total, processes):
+        self.total = total
+        self.started = time.time()
+        self.done = self.failed = self.rows = 0
+        self.current = {shard: None for shard in range(processes)}
+        self.per_shard = {shard: [0, 0] for shard in range(processes)}  # categories, rows
+        self.rates = {shard: None for shard in range(processes)}  # each shard's limiter, req/s
+        self.stolen = 0
+        self.exited = set()
+        self._printed = 0.0
+
+    def update(self, event):
+        kind, shard = event[0], event[1]
+        if kind == "start":
+            self.current[shard] = event[2]
+            self.stolen += int(event[3] is not None and event[3] != shard)
+        elif kind == "end":
+            _, _, category, outcome, rows, rate = event
+            self.current[shard] = None
+            self.rates[shard] = rate
+            self.rows += rows
+            self.per_shard[shard][1] += rows
+            if outcome == "done":
+                self.done += 1
+                self.per_shard[shard][0] += 1
+            elif outcome == "failed":
+                self.failed += 1
+        elif kind == "exit":
+            self.current[shard] = None
+            self.exited.add(shard)
+
+    def print(self, force=False):
+        if not force and time.time() - self._printed < config.SHARD_PROGRESS_SECONDS:
+            return
+        self._printed = time.time()
+        minutes = (time.time() - self.started) / 60
+        rate = self.rows / minutes if minutes else 0.0
+        print(f"\n[SHARDS] {self.done}/{self.total} categories | {self.failed} failed attempts | "
+              f"{self.rows} rows | {rate:.1f} rows/min | {self.stolen} stolen | {minutes:.1f} min")
+        for shard, current in self.current.items():
+            cats, rows = self.per_shard[shard]
+            rate = f"{self.rates[shard]:.2f} req/s" if self.rates[shard] is not None else "- req/s"
+            status = "exited" if shard in self.exited else (f"▶ {current}" if current else "idle")
+            print(f"[SHARDS]  #{shard:<2} {cats:>4} done {rows:>6} rows | {rate:>11} | {status}")
+
+
+class ShardedLauncher:
+    def __init__(self, categories, processes=config.PROCESSES, strategy=config.SHARD_STRATEGY,
+                 queue_path=SHARD_QUEUE_PATH):
+        self.categories = [row["category_name"] for row in categories]
+        self.processes = max(1, min(processes, len(self.categories) or 1))
+        self.strategy = strategy
+        self.queue_path = queue_path
+
+    def plan(self):
+        """{category: shard} and {category: priority}; bigger estimates go first"""
+        if self.strategy == "size":
+            sizes = estimate_sizes(self.categories, since=config.BACKFILL_SINCE)
+            return size_shards(sizes, self.processes), {c: int(s) for c, s in sizes.items()}
+        return hash_shards(self.categories, self.processes), {c: 0 for c in self.categories}
+
+    def _enqueue(self):
+        shards, priorities = self.plan()
+        queue = WorkQueue(self.queue_path)
+        # No shard is running yet: leases left by an interrupted run are stale
+        stale = queue.release_all()
+        if stale:
+            print(f"[SHARDS] Re-queued {stale} categories left leased by an interrupted run")
+        for category in self.categories:
+            queue.enqueue(category, priority=priorities[category], shard=shards[category])
+        counts = [list(shards.values()).count(s) for s in range(self.processes)]
+        print(f"[SHARDS] {len(self.categories)} categories → {self.processes} processes "
+              f"({self.strategy}: {counts} per shard) | logs in {LOG_DIR}/shard-<n>.log")
+        return queue
+
+    def _stop(self, procs):
+        print("\n⚠️  Stopping shard processes (flushing output)...")
+        for p in procs:
+            if p.is_alive():
+                p.terminate()  # SIGTERM → install_signal_handlers in the child
+        deadline = time.time() + 60
+        for p in procs:
+            p.join(max(0.1, deadline - time.time()))
+            if p.is_alive():
+                print(f"[SHARDS] ❌ {p.name} did not stop in time → killed")
+                p.kill()
+                p.join()
+
+    def run(self):
+        queue = self._enqueue()
+        ctx = multiprocessing.get_context("spawn")
+        events = ctx.Queue()
+        procs = [
+            ctx.Process(target=_shard_main, name=f"shard-{shard}",
+                        args=(shard, self.queue_path, events, config.BACKFILL_SINCE, self.processes))
+            for shard in range(self.processes)
+        ]
+        for p in procs:
+            p.start()
+
+        view = ProgressView(len(self.categories), self.processes)
+        try:
+            while any(p.is_alive() for p in procs) or not events.empty():
+                try:
+                    event = events.get(timeout=1)
+                except Exception:
+                    event = None
+                if event:
+                    view.update(event)
+                view.print(force=bool(event) and event[0] == "exit")
+            for p in procs:
+                p.join()
+        except KeyboardInterrupt:
+            self._stop(procs)
+        finally:
+            while not events.empty():
+                view.update(events.get_nowait())
+            view.print(force=True)
+            merge_shards(ContractsController.OUTPUT_DIR, [shard_name(s) for s in range(self.processes)], OUTPUT_COLUMNS,
+                         name=config.OUTPUT_NAME)
+
+        summary = queue.summary()
+        print(f"[SHARDS] Finished in {(time.time() - view.started) / 60:.1f} min | queue {summary}")
+        return {"done": view.done, "rows": view.rows, "queue": summary}
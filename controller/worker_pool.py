@@ -0,0 +1,122 @@
+import queue
+import threading
+import time
+
+import config
+from browser_profile import BROWSER_DATA_DIR
+from playwright_manager import PlaywrightManager
+from session_pool import SessionPool
+from controller.captcha_retry import RetryStats
+from controller.contracts_controller import ContractsController
+from controller.page_waits import WaitReport
+from service.metrics import METRICS
+from service.output_sink import flush_all
+from service.rate_limiter import default_limiter
+
+
+class CategoryWorkerPool:
+    """
+    Crawl categories in parallel.
+
+    Every worker thread owns its own PlaywrightManager (sync Playwright objects
+    are bound to the thread that created them), so each worker has an isolated
+    browser context, page and captcha flow. Idle workers pull the next category
+    from a shared queue; rows go through ContractsController's locked writer
+    into the single contracts_merged.csv.
+    """
+
+    def __init__(self, categories, workers=config.WORKERS, headless=config.HEADLESS):
+        self.categories = [row["category_name"] for row in categories]
+        self.workers = max(1, min(workers, len(self.categories) or 1))
+        self.headless = headless
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.done = []
+        self.failed = []
+        self.wait_report = WaitReport()
+        self.captcha_stats = RetryStats()
+        # Politeness: every request of every worker goes through this one adaptive limiter
+        self.limiter = default_limiter()
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+    def _worker(self, worker_id):
+        use_sessions = config.SESSION_POOL_SIZE > 0
+        browser = PlaywrightManager(
+            headless=self.headless, user_data_dir=BROWSER_DATA_DIR / f"{config.BROWSER_PROFILE}-{worker_id}",
+            persistent=False if use_sessions else None
+        )
+        sessions = None
+        try:
+            browser.start(open_home=not use_sessions)
+            if use_sessions:
+                sessions = SessionPool(browser, name=str(worker_id))
+            contracts = ContractsController(
+                browser, wait_report=self.wait_report, captcha_stats=self.captcha_stats, sessions=sessions,
+                limiter=self.limiter
+            )
+        except Exception as e:
+            print(f"[POOL] ❌ Worker {worker_id} failed to start: {e}")
+            browser.stop()
+            return
+
+        try:
+            while True:
+                # All workers share one adaptive limiter; while it reports throttling, start nothing new
+                pause = self.limiter.backpressure()
+                if pause:
+                    print(f"[POOL] ⏸️  Worker {worker_id} waits {pause:.0f}s (portal throttling)")
+                    time.sleep(pause)
+
+                try:
+                    category_name = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+
+                print(f"[POOL] Worker {worker_id} → {category_name}")
+                try:
+                    contracts.crawl_category(category_name)
+                    with self._stats_lock:
+                        self.done.append(category_name)
+                except Exception as e:
+                    print(f"[POOL] ❌ Worker {worker_id} failed on {category_name}: {e}")
+                    with self._stats_lock:
+                        self.failed.append(category_name)
+                finally:
+                    self._queue.task_done()
+        finally:
+            if sessions:
+                sessions.close()
+            browser.stop()
+
+    # --------------------------------------------------
+    # MAIN LOOP
+    # --------------------------------------------------
+    def run(self):
+        for category_name in self.categories:
+            self._queue.put(category_name)
+
+        print(f"[POOL] {len(self.categories)} categories | {self.workers} workers "
+              f"| {self.limiter.rate:.2f} req/s shared")
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._worker, args=(i + 1,), daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        flush_all()
+        elapsed = time.perf_counter() - started
+        self.wait_report.print_summary()
+        self.captcha_stats.print_summary()
+        self.limiter.print_summary()
+        METRICS.print_summary()
+        print(f"[POOL] Finished in {elapsed:.1f}s → {len(self.done)} done, "
+              f"{len(self.failed)} failed")
+        return {"done": self.done, "failed": self.failed, "elapsed": elapsed}
@@ -1,29 +1,61 @@
 from playwright.sync_api import sync_playwright
 
+import config
+from browser_profile import BROWSER_DATA_DIR, NavigationReport, block_requests, context_options, get_profile
+from service.metrics import METRICS
+
 
 class PlaywrightManager:
-    def __init__(self, headless=False):
-        self.headless = headless
+    def __init__(self, headless=None, profile=None, user_data_dir=None, persistent=None):
+        self.profile = get_profile(profile)
+        self.headless = self.profile.headless if headless is None else headless
+        # A SessionPool needs a regular browser to open its own contexts
+        self.persistent = self.profile.persistent if persistent is None else persistent
+        # One dir per concurrently running browser (Chromium locks it)
+        self.user_data_dir = user_data_dir or BROWSER_DATA_DIR / f"{self.profile.name}-0"
+        self.nav_report = NavigationReport(self.profile.name)
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
 
-    def start(self):
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=["--start-maximized"]
-        )
-        self.context = self.browser.new_context(
-            viewport=None
-        )
-        self.page = self.context.new_page()
+    def start(self, open_home=True):
+        with METRICS.timer("browser_start", profile=self.profile.name, persistent=self.persistent):
+            self._launch()
 
         # Go to GeM homepage first
-        self.page.goto("https://gem.gov.in", timeout=60000)
+        if open_home:
+            with METRICS.timer("navigation", step="home"):
+                self.page.goto(config.GEM_HOME_URL, timeout=60000)
+            self.nav_report.measure(self.page, "start")
+
+    def _launch(self):
+        self.playwright = sync_playwright().start()
+
+        if self.persistent:
+            # Persistent context = on-disk HTTP cache reused across runs
+            self.user_data_dir.mkdir(parents=True, exist_ok=True)
+            self.context = self.playwright.chromium.launch_persistent_context(
+                str(self.user_data_dir),
+                headless=self.headless,
+                args=self.profile.args,
+                **context_options(self.profile)
+            )
+            self.browser = self.context.browser
+            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+        else:
+            self.browser = self.playwright.chromium.launch(
+                headless=self.headless,
+                args=self.profile.args
+            )
+            self.context = self.browser.new_context(**context_options(self.profile))
+            self.page = self.context.new_page()
+
+        block_requests(self.context, self.page, self.profile)
 
     def stop(self):
+        if self.context and self.persistent:
+            self.context.close()
         if self.browser:
             self.browser.close()
         if self.playwright:
@@ -1,23 +1,117 @@
+import argparse
+import asyncio
+import csv
+from datetime import date
+
+import config
 from playwright_manager import PlaywrightManager
 from controller.contracts_controller import ContractsController
+from controller.http_contracts_controller import HttpContractsController
+from controller.worker_pool import CategoryWorkerPool
+from controller.crawl_daemon import CrawlDaemon
+from controller.shard_launcher import ShardedLauncher
+from controller.async_contracts_controller import run_categories
+from async_playwright_manager import AsyncPlaywrightManager
+from service.metrics import METRICS
+from service.output_sink import flush_all, install_signal_handlers
+from session_pool import SessionPool
+
+
+def _load_categories():
+    with open(ContractsController.CATEGORY_CSV, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def run_pool(workers):
+    """Crawl all categories with a pool of isolated browser workers"""
+    print(f"\n[INIT] Starting worker pool ({workers} workers)...")
+    try:
+        CategoryWorkerPool(_load_categories(), workers=workers).run()
+    except KeyboardInterrupt:
+        print("\n⚠️  Process interrupted by user")
+    finally:
+        flush_all()
+
+
+def run_sharded(processes, strategy):
+    """Crawl all categories with one browser process per shard, merged into contracts_merged"""
+    print(f"\n[INIT] Starting {processes} shard processes ({strategy} sharding)...")
+    ShardedLauncher(_load_categories(), processes=processes, strategy=strategy).run()
+
+
+def run_daemon(interval, once=False, owner=None):
+    """Headless, unattended crawl cycles from the durable work queue (no input() prompt)"""
+    print(f"\n[INIT] Starting daemon (cycle every {interval}s{', single cycle' if once else ''})...")
+    try:
+        CrawlDaemon(interval=interval, once=once, owner=owner).run()
+    except KeyboardInterrupt:
+        print("\n⚠️  Daemon stopped")
 
 
-def main():
+async def _run_async(concurrency):
+    browser = AsyncPlaywrightManager(headless=config.HEADLESS)
+    await browser.start()
+    try:
+        await run_categories(browser, _load_categories(), concurrency=concurrency)
+    finally:
+        await browser.stop()
+
+
+def run_async(concurrency):
+    """Sync entry point for the asyncio engine"""
+    print(f"\n[INIT] Starting async engine ({concurrency} concurrent categories)...")
+    try:
+        asyncio.run(_run_async(concurrency))
+    except KeyboardInterrupt:
+        print("\n⚠️  Process interrupted by user")
+
+
+def main(workers=config.WORKERS, engine="sync", transport="browser", metrics_port=config.METRICS_PORT,
+         daemon=False, interval=config.DAEMON_INTERVAL, once=False, owner=None,
+         processes=config.PROCESSES, shard_by=config.SHARD_STRATEGY):
     print("="*70)
     print("🚀 GeM Contracts Automation System")
     print("="*70)
+    install_signal_handlers()
+    METRICS.serve(metrics_port)
+    METRICS.log("run_start", workers=workers, engine=engine, transport=transport, profile=config.BROWSER_PROFILE,
+                daemon=daemon)
+
+    if daemon:
+        run_daemon(interval, once=once, owner=owner)
+        return
+
+    if processes > 1:
+        run_sharded(processes, shard_by)
+        return
+
+    if engine == "async":
+        run_async(workers if workers > 1 else config.ASYNC_CONCURRENCY)
+        return
+
+    if workers > 1:
+        run_pool(workers)
+        return
     
+    # Warmed sessions replace the per-category home → menu navigation (browser transport only)
+    use_sessions = transport == "browser" and config.SESSION_POOL_SIZE > 0
+
     # Initialize browser
     print("\n[INIT] Launching browser...")
-    browser = PlaywrightManager(headless=False)  # Set to True for headless
-    browser.start()
+    browser = PlaywrightManager(headless=config.HEADLESS, persistent=False if use_sessions else None)
+    browser.start(open_home=not use_sessions)
+    sessions = SessionPool(browser) if use_sessions else None
 
     try:
         # Create controller
-        contracts = ContractsController(browser)
+        if transport == "http":
+            contracts = HttpContractsController(browser)
+        else:
+            contracts = ContractsController(browser, sessions=sessions)
         
         # Navigate to GeM contracts page
-        contracts.go_to_gem_contracts()
+        if not sessions:
+            contracts.go_to_gem_contracts()
         
         # Main processing loop - will break when data is found
         contracts.run()
@@ -33,10 +127,39 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        flush_all()
         # Keep browser open for inspection
         input("\nPress ENTER to close browser...")
+        if sessions:
+            sessions.close()
         browser.stop()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="GeM contracts scraper")
+    parser.add_argument("--workers", type=int, default=config.WORKERS,
+                        help="parallel browser workers (1 = interactive single browser)")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                        help="sync Playwright (default) or the asyncio engine")
+    parser.add_argument("--transport", choices=["browser", "http"], default="browser",
+                        help="http = browser bootstraps the session, searches go over plain HTTP")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="backfill every category from this date (YYYY-MM-DD) instead of resuming")
+    parser.add_argument("--metrics-port", type=int, default=config.METRICS_PORT,
+                        help="serve Prometheus text metrics on 127.0.0.1:<port>/metrics")
+    parser.add_argument("--processes", type=int, default=config.PROCESSES,
+                        help="shard categories across this many browser processes (one per CPU core)")
+    parser.add_argument("--shard-by", choices=["hash", "size"], default=config.SHARD_STRATEGY,
+                        help="processes: split categories by name hash or by estimated result count")
+    parser.add_argument("--daemon", action="store_true",
+                        help="headless scheduled cycles from the durable work queue (data/state/work_queue.sqlite)")
+    parser.add_argument("--interval", type=int, default=config.DAEMON_INTERVAL,
+                        help="daemon: seconds between crawl cycle starts")
+    parser.add_argument("--once", action="store_true", help="daemon: run one cycle until the queue drains, then exit")
+    parser.add_argument("--owner", default=None,
+                        help="daemon: stable lease owner id, so a restart re-queues its own leases at once")
+    args = parser.parse_args()
+    config.BACKFILL_SINCE = args.since
+    main(workers=args.workers, engine=args.engine, transport=args.transport, metrics_port=args.metrics_port,
+         daemon=args.daemon, interval=args.interval, once=args.once, owner=args.owner,
+         processes=args.processes, shard_by=args.shard_by)
@@ -0,0 +1,173 @@
+"""
+Local catalog of GeM contract categories.
+
+data/Datasets/category_catalog.json holds, per category, the display name,
+the site's select2 option id and known aliases. Names are indexed by three
+keys, all plain dict lookups:
+
+- exact:      lowercased, punctuation stripped, whitespace collapsed
+- signature:  the exact key's tokens singularised, de-duplicated and sorted
+              ("Trocars, Surgical" == "surgical trocar")
+- alias:      both keys of every alias
+
+lookup() only trusts those keys. closest() offers the nearest spelling for
+messages; a category is never picked by a guessed name.
+
+Entries without a site id come from categories.csv; ids are filled in
+incrementally whenever the select2 dropdown is used (see
+ContractsController.process_category), after which the category is picked
+by setting the select value directly.
+"""
+
+import csv
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from difflib import get_close_matches
+from pathlib import Path
+
+CATALOG_PATH = Path(__file__).resolve().parents[1] / "data" / "Datasets" / "category_catalog.json"
+CATEGORY_CSV = CATALOG_PATH.parent / "categories.csv"
+
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+
+
+def normalize(name):
+    return " ".join(_PUNCT_RE.sub(" ", name.lower()).split())
+
+
+def _singular(token):
+    if len(token) > 3 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def signature(name):
+    return " ".join(sorted({_singular(t) for t in normalize(name).split()}))
+
+
+class CategoryCatalog:
+    def __init__(self, path=CATALOG_PATH):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self.entries = []
+        self._exact = {}
+        self._fuzzy = {}
+        self._dirty = False
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for entry in json.load(f)["categories"]:
+                    self._index(entry)
+
+    # --------------------------------------------------
+    # INDEX
+    # --------------------------------------------------
+    def _index(self, entry):
+        self.entries.append(entry)
+        for name in [entry["name"]] + entry.get("aliases", []):
+            self._index_name(name, entry)
+
+    def _index_name(self, name, entry):
+        self._exact.setdefault(normalize(name), entry)
+        self._fuzzy.setdefault(signature(name), entry)
+
+    def lookup(self, name, fuzzy=True):
+        """Catalog entry for a name (exact, then signature unless fuzzy=False) or None"""
+        with self._lock:
+            entry = self._exact.get(normalize(name))
+            if entry or not fuzzy:
+                return entry
+            return self._fuzzy.get(signature(name))
+
+    def closest(self, name, cutoff=0.8):
+        """Catalog name spelled most like this one, or None (a hint, not a match)"""
+        with self._lock:
+            close = get_close_matches(normalize(name), self._exact.keys(), n=1, cutoff=cutoff)
+            return self._exact[close[0]]["name"] if close else None
+
+    # --------------------------------------------------
+    # UPDATE
+    # --------------------------------------------------
+    def add(self, name, site_id=None, alias_of=None):
+        """
+        Record a category (and its site id when known).
+
+        alias_of: the name the caller asked for, kept as an alias when the
+        site spells it differently.
+        """
+        with self._lock:
+            entry = self._exact.get(normalize(name)) or (alias_of and self.lookup(alias_of))
+            if entry is None:
+                entry = {"name": name, "site_id": None, "aliases": []}
+                self._index(entry)
+                self._dirty = True
+
+            if site_id is not None and entry.get("site_id") != str(site_id):
+                entry["site_id"] = str(site_id)
+                entry["name"] = name  # the site's spelling wins
+                entry["harvested_at"] = datetime.now().isoformat(timespec="seconds")
+                self._index_name(name, entry)
+                self._dirty = True
+
+            if alias_of and normalize(alias_of) != normalize(entry["name"]) \
+                    and alias_of not in entry["aliases"]:
+                entry["aliases"].append(alias_of)
+                self._index_name(alias_of, entry)
+                self._dirty = True
+            return entry
+
+    def harvest(self, options, query=None):
+        """Add select2 options [{id, text}] seen on the page; returns how many were new or changed"""
+        with self._lock:
+            before = self._dirty
+            self._dirty = False
+            for option in options:
+                text = (option.get("text") or "").strip()
+                if not text:
+                    continue
+                is_query = query and signature(text) == signature(query)
+                self.add(text, option.get("id"), alias_of=query if is_query else None)
+            changed, self._dirty = self._dirty, before or self._dirty
+            return changed
+
+    def import_csv(self, csv_path=CATEGORY_CSV):
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("category_name", "").strip():
+                    self.add(row["category_name"].strip())
+
+    def missing_ids(self):
+        with self._lock:
+            return [e["name"] for e in self.entries if not e.get("site_id")]
+
+    def save(self):
+        """Atomic write, only when something changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "categories": self.entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def default_catalog():
+    """Shared catalog, seeded from categories.csv on first use"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = CategoryCatalog()
+            if not _catalog.entries and CATEGORY_CSV.exists():
+                _catalog.import_csv()
+                _catalog.save()
+        return _catalog
@@ -0,0 +1,122 @@
+"""
+Typed schema for scraped contract rows.
+
+The portal renders every field as text ("198000.000", "07/1/2026 14:12",
+"1,200"). Text outputs (csv, jsonl) keep those strings as scraped; typed
+stores (parquet, the sqlite sink, the database) convert each row with
+typed_row() on write so their columns hold numbers and datetimes.
+
+Types: str, int, float, datetime and "category" (low-cardinality text that
+is dictionary-encoded in Parquet).
+"""
+
+import re
+from datetime import datetime
+
+SCHEMA = [
+    ("serial_no", int),
+    ("category_name", "category"),
+    ("bid_no", str),
+    ("product", str),
+    ("brand", str),
+    ("model", str),
+    ("ordered_quantity", float),
+    ("price", float),
+    ("total_value", float),
+    ("buyer_dept_org", "category"),
+    ("organization_name", str),
+    ("buyer_designation", str),
+    ("state", "category"),
+    ("buyer_department", str),
+    ("office_zone", str),
+    ("buying_mode", "category"),
+    ("contract_date", datetime),
+    ("order_status", "category"),
+    ("download_link", str),
+]
+
+OUTPUT_COLUMNS = [name for name, _ in SCHEMA]
+COLUMN_TYPES = dict(SCHEMA)
+
+# Portal dates are day-first; ISO covers rows already converted by this module
+DATE_FORMATS = (
+    "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y",
+    "%d-%m-%Y %H:%M", "%d-%m-%Y",
+    "%d-%b-%Y %H:%M", "%d-%b-%Y",
+)
+
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+MISSING = {"", "n/a", "na", "-", "null", "none"}
+
+
+# --------------------------------------------------
+# CONVERTERS
+# --------------------------------------------------
+def parse_number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = str(value).replace(",", "").strip()
+    if text.lower() in MISSING:
+        return None
+    match = NUMBER_RE.search(text)
+    return float(match.group()) if match else None
+
+
+def parse_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    text = " ".join(str(value).split())
+    if text.lower() in MISSING:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def parse_text(value):
+    if value is None:
+        return None
+    text = " ".join(str(value).split())
+    return None if text.lower() in MISSING else text
+
+
+def _convert(kind, value):
+    if kind is int:
+        number = parse_number(value)
+        return int(number) if number is not None else None
+    if kind is float:
+        return parse_number(value)
+    if kind is datetime:
+        return parse_datetime(value)
+    return parse_text(value)
+
+
+def typed_row(record):
+    """Column dict with every value converted to its schema type (None when missing)"""
+    return {name: _convert(kind, record.get(name)) for name, kind in SCHEMA}
+
+
+# --------------------------------------------------
+# ARROW
+# --------------------------------------------------
+def arrow_schema(pa, extra=()):
+    """pyarrow schema for SCHEMA (+ extra (name, pa type) fields); categories are dictionary-encoded"""
+    arrow_types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        datetime: pa.timestamp("s"),
+        str: pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+    }
+    fields = [pa.field(name, arrow_types[kind]) for name, kind in SCHEMA]
+    return pa.schema(fields + [pa.field(name, typ) for name, typ in extra])
+
+
+def dictionary_columns():
+    return [name for name, kind in SCHEMA if kind == "category"]
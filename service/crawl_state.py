@@ -0,0 +1,194 @@
+"""
+Persistent crawl state for checkpoint/resume.
+
+One local SQLite file remembers, per category, which date windows have
+been searched to completion and, globally, every bid_no already written to
+the output. A restarted or scheduled run then only searches the window
+since the last completed one and skips known rows before their modal (and
+captcha) is ever opened.
+"""
+
+import csv
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import config
+
+STATE_PATH = Path(__file__).resolve().parents[1] / "data" / "state" / "crawl_state.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS windows (
+    category     TEXT NOT NULL,
+    from_date    TEXT NOT NULL,
+    to_date      TEXT NOT NULL,
+    rows         INTEGER DEFAULT 0,
+    complete     INTEGER DEFAULT 0,
+    finished_at  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_windows_category ON windows (category, complete, to_date);
+
+CREATE TABLE IF NOT EXISTS density (
+    category    TEXT PRIMARY KEY,
+    per_day     REAL NOT NULL,
+    samples     INTEGER DEFAULT 1,
+    updated_at  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS seen_bids (
+    bid_no         TEXT PRIMARY KEY,
+    category       TEXT,
+    contract_date  TEXT,
+    first_seen     TEXT
+);
+"""
+
+
+class CrawlState:
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Shared by every process of a sharded run: wait on locks instead of failing
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        if str(path) != ":memory:":
+            # WAL: readers don't block the writer (mark_seen runs after every flush)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    # --------------------------------------------------
+    # DATE WINDOWS
+    # --------------------------------------------------
+    def last_crawled(self, category):
+        """to_date of the latest completed window, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(to_date) FROM windows WHERE category = ? AND complete = 1",
+                (category,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def next_window(self, category, today=None, initial_days=config.CRAWL_INITIAL_DAYS, since=None):
+        """
+        (from_date, to_date) still to search, or None if the category is up to date.
+
+        The new window starts ON the last completed day rather than after it:
+        contracts keep appearing during the day, and the overlap costs nothing
+        because known bids are skipped. `since` forces a backfill from that date.
+        """
+        today = datetime.combine((today or datetime.today()).date(), datetime.min.time())
+        if since:
+            return datetime.combine(since, datetime.min.time()), today
+        last = self.last_crawled(category)
+        if last is None:
+            return today - timedelta(days=initial_days), today
+        if last >= today:
+            return None
+        return last, today
+
+    def finish_window(self, category, from_date, to_date, rows, complete=True):
+        """Record a searched window; only complete ones advance next_window()"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO windows (category, from_date, to_date, rows, complete, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (category, from_date.date().isoformat(), to_date.date().isoformat(), rows,
+                 int(complete), datetime.now().isoformat(timespec="seconds"))
+            )
+
+    # --------------------------------------------------
+    # RESULT DENSITY (FOR THE WINDOW PLANNER)
+    # --------------------------------------------------
+    def density(self, category):
+        """Smoothed results per day seen for this category, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT per_day FROM density WHERE category = ?", (category,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def record_density(self, category, per_day, alpha=0.3):
+        """Exponentially weighted update so one odd window doesn't swing the plan"""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO density (category, per_day, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(category) DO UPDATE SET
+                    per_day = (1 - ?) * per_day + ? * excluded.per_day,
+                    samples = samples + 1, updated_at = excluded.updated_at
+                """,
+                (category, per_day, now, alpha, alpha)
+            )
+
+    # --------------------------------------------------
+    # SEEN BIDS
+    # --------------------------------------------------
+    def seen(self, bid_nos):
+        """Subset of bid_nos already stored (one query for a whole result page)"""
+        bid_nos = [b for b in bid_nos if b]
+        if not bid_nos:
+            return set()
+        found = set()
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(bid_nos), 500):
+                chunk = bid_nos[start:start + 500]
+                found.update(
+                    r[0] for r in self._conn.execute(
+                        f"SELECT bid_no FROM seen_bids WHERE bid_no IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                )
+        return found
+
+    def mark_seen(self, bid_no, category, contract_date=""):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO seen_bids (bid_no, category, contract_date, first_seen) "
+                "VALUES (?, ?, ?, ?)",
+                (bid_no, category, str(contract_date or ""), datetime.now().isoformat(timespec="seconds"))
+            )
+
+    def import_csv(self, csv_path):
+        """Seed seen_bids from an existing output CSV (first run with state enabled)"""
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = [
+                (r["bid_no"], r.get("category_name", ""), r.get("contract_date", ""), "imported")
+                for r in csv.DictReader(f) if r.get("bid_no")
+            ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_bids (bid_no, category, contract_date, first_seen) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def summary(self):
+        with self._lock:
+            bids = self._conn.execute("SELECT COUNT(*) FROM seen_bids").fetchone()[0]
+            categories = self._conn.execute(
+                "SELECT COUNT(DISTINCT category) FROM windows WHERE complete = 1"
+            ).fetchone()[0]
+        return {"seen_bids": bids, "categories": categories}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_state = None
+_state_lock = threading.Lock()
+
+
+def default_state():
+    """Shared store; in-memory (dedupe within this run only) when CRAWL_STATE is off"""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = CrawlState(STATE_PATH if config.CRAWL_STATE else ":memory:")
+        return _state
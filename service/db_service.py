@@ -0,0 +1,212 @@
+"""
+Database persistence for scraped contracts.
+
+SQLite (data/db/contracts.sqlite) by default, MySQL when DB_BACKEND="mysql"
+(connection settings from DB_HOST / DB_USER / DB_PASSWORD / DB_NAME /
+DB_PORT, optionally via a .env file). Rows are upserted in batches keyed on
+bid_no, so re-scraping a contract updates it instead of duplicating it.
+
+The controller does not call this per row: the output sink hands every
+flushed batch to upsert_many() (see ContractsController._init_output).
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import config
+from service.contract_schema import OUTPUT_COLUMNS, SCHEMA, typed_row
+
+SQLITE_PATH = Path(__file__).resolve().parents[1] / "data" / "db" / "contracts.sqlite"
+INDEXED = ("category_name", "state", "contract_date")
+
+
+# --------------------------------------------------
+# DIALECTS
+# --------------------------------------------------
+class SqliteDialect:
+    name = "sqlite"
+    placeholder = "?"
+    types = {int: "INTEGER", float: "REAL", datetime: "TEXT", str: "TEXT", "category": "TEXT"}
+    key_type = "TEXT"
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def upsert_sql(self, table, columns):
+        cols = ", ".join(columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "bid_no")
+        return (
+            f"INSERT INTO {table} ({cols}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(bid_no) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP"
+        )
+
+    def index_sql(self, table, column):
+        return f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})"
+
+    @staticmethod
+    def value(v):
+        return v.isoformat(" ") if isinstance(v, datetime) else v
+
+
+class MysqlDialect:
+    name = "mysql"
+    placeholder = "%s"
+    types = {int: "BIGINT", float: "DECIMAL(18, 3)", datetime: "DATETIME", str: "TEXT",
+             "category": "VARCHAR(255)"}
+    key_type = "VARCHAR(64)"
+
+    def __init__(self):
+        import mysql.connector
+
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+
+        self._mysql = mysql.connector
+        self.settings = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "user": os.getenv("DB_USER", "root"),
+            "password": os.getenv("DB_PASSWORD", ""),
+            "database": os.getenv("DB_NAME", "gem_contracts"),
+            "port": int(os.getenv("DB_PORT", "3306")),
+        }
+
+    def connect(self):
+        return self._mysql.connect(charset="utf8mb4", autocommit=False, **self.settings)
+
+    def upsert_sql(self, table, columns):
+        cols = ", ".join(f"`{c}`" for c in columns)
+        updates = ", ".join(f"`{c}` = VALUES(`{c}`)" for c in columns if c != "bid_no")
+        return (
+            f"INSERT INTO `{table}` ({cols}) VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
+    def index_sql(self, table, column):
+        # MySQL has no CREATE INDEX IF NOT EXISTS; create_table() tolerates "duplicate key name"
+        return f"CREATE INDEX idx_{table}_{column} ON `{table}` (`{column}`)"
+
+    @staticmethod
+    def value(v):
+        return v
+
+
+DIALECTS = {
+    "sqlite": SqliteDialect,
+    "mysql": MysqlDialect,
+}
+
+
+# --------------------------------------------------
+# CONNECTION POOL
+# --------------------------------------------------
+class ConnectionPool:
+    """At most `size` connections, opened lazily and reused across threads"""
+
+    def __init__(self, connect, size=config.DB_POOL_SIZE):
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._all = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                with self._lock:
+                    self._all.append(conn)
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._all.clear()
+
+
+# --------------------------------------------------
+# SERVICE
+# --------------------------------------------------
+class DatabaseService:
+    def __init__(self, backend=config.DB_BACKEND, table=config.DB_TABLE, pool_size=config.DB_POOL_SIZE,
+                 batch_size=config.DB_BATCH_SIZE, **dialect_kwargs):
+        self.dialect = DIALECTS[backend](**dialect_kwargs)
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self.pool = ConnectionPool(self.dialect.connect, pool_size)
+        self._upsert = self.dialect.upsert_sql(table, OUTPUT_COLUMNS)
+
+    def create_table(self):
+        d = self.dialect
+        cols = [
+            f"bid_no {d.key_type} PRIMARY KEY" if name == "bid_no" else f"{name} {d.types[kind]}"
+            for name, kind in SCHEMA
+        ]
+        cols.append("updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({', '.join(cols)})")
+            for column in INDEXED:
+                try:
+                    cur.execute(d.index_sql(self.table, column))
+                except Exception as e:
+                    if "duplicate" not in str(e).lower():
+                        raise
+            cur.close()
+        print(f"[DB] ✅ Table '{self.table}' ready ({d.name})")
+
+    def upsert_many(self, rows):
+        """Insert-or-update row dicts (converted with typed_row) in batches of batch_size; returns rows written"""
+        value = self.dialect.value
+        rows = [typed_row(row) for row in rows]
+        params = [[value(row.get(c)) for c in OUTPUT_COLUMNS] for row in rows if row.get("bid_no")]
+
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            for start in range(0, len(params), self.batch_size):
+                cur.executemany(self._upsert, params[start:start + self.batch_size])
+            cur.close()
+        return len(params)
+
+    def count(self):
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT COUNT(*) FROM {self.table}")
+            n = cur.fetchone()[0]
+            cur.close()
+        return n
+
+    def close(self):
+        self.pool.close()
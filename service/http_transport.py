@@ -0,0 +1,231 @@
+"""
+Direct HTTP transport for GeM contract searches.
+
+The browser is only used to bootstrap the session (cookies + user agent);
+the view_contracts search and the per-order captcha / download-link calls
+then go over one pooled keep-alive requests.Session and the HTML/JSON
+responses are parsed here.
+
+Endpoint URLs and form field names live in config.py. They follow the
+view_contracts form's element ids and have not been checked against a
+recorded portal session; tests/fixtures/gem_stub/ holds hand-written sample
+responses for tools/gem_stub_server.py that show the shapes this module
+parses (tests/test_http_transport.py runs a crawl against them).
+"""
+
+import base64
+import json
+import re
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+from controller.row_extractor import CARD_FIELDS
+from service.rate_limiter import default_limiter
+
+
+DATA_IMG_RE = re.compile(r'data:image/[a-z]+;base64,([A-Za-z0-9+/=]+)')
+CSRF_RE = re.compile(r'name=["\']csrf_[a-z_]*["\']\s+value=["\']([^"\']+)', re.I)
+
+
+class TransportError(Exception):
+    pass
+
+
+class CaptchaRejected(TransportError):
+    """The response carried neither results nor "No Result Found" """
+
+
+# --------------------------------------------------
+# HTML PARSING (NO BROWSER)
+# --------------------------------------------------
+class _CardParser(HTMLParser):
+    """
+    Collect ajxtag_* spans into per-card records.
+
+    Without a DOM tree, a card starts at each order-number span and owns the
+    spans that follow it until the next one (the portal renders the order
+    number first in every card).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cards = []
+        self._open = None
+        self._text = []
+        self._counts = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "span":
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        cls = next((c for c in classes if c in CARD_FIELDS), None)
+        if not cls:
+            return
+        if cls == "ajxtag_order_number":
+            self.cards.append({"index": len(self.cards)})
+            self._counts = {}
+        self._open = cls
+        self._text = []
+
+    def handle_data(self, data):
+        if self._open:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag != "span" or not self._open:
+            return
+        cls, self._open = self._open, None
+        if not self.cards:
+            return
+
+        k = self._counts.get(cls, 0)
+        self._counts[cls] = k + 1
+        names = CARD_FIELDS[cls]
+        if k < len(names):
+            self.cards[-1][names[k]] = " ".join("".join(self._text).split())
+
+
+def parse_cards(html):
+    parser = _CardParser()
+    parser.feed(html)
+    cards = parser.cards
+    for card in cards:
+        for names in CARD_FIELDS.values():
+            for name in names:
+                card.setdefault(name, "")
+    return cards
+
+
+def parse_captcha(body):
+    """Captcha image bytes from an HTML fragment or a JSON payload"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+
+    if isinstance(payload, dict):
+        for value in payload.values():
+            if isinstance(value, str):
+                match = DATA_IMG_RE.search(value)
+                if match:
+                    return base64.b64decode(match.group(1))
+
+    match = DATA_IMG_RE.search(body)
+    if not match:
+        raise TransportError("No captcha image in response")
+    return base64.b64decode(match.group(1))
+
+
+def parse_download_link(body):
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+
+    if isinstance(payload, dict):
+        for key in ("href", "url", "link", "download_link"):
+            if payload.get(key):
+                return payload[key]
+        body = payload.get("html", "") or ""
+
+    match = re.search(r'id=["\']dwnbtn["\'][^>]*href=["\']([^"\']+)', body) \
+        or re.search(r'href=["\']([^"\']+)["\'][^>]*id=["\']dwnbtn', body)
+    return match.group(1) if match else None
+
+
+def is_no_result(html):
+    return "No Result Found" in html
+
+
+# --------------------------------------------------
+# TRANSPORT
+# --------------------------------------------------
+class GemHttpTransport:
+    def __init__(self, base_url=config.GEM_HOME_URL, pool_size=config.HTTP_POOL_SIZE,
+                 timeout=config.HTTP_TIMEOUT, limiter=None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.timeout = timeout
+        self.csrf = None
+        self.limiter = limiter or default_limiter()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"X-Requested-With": "XMLHttpRequest"})
+
+    @classmethod
+    def from_browser(cls, browser, **kwargs):
+        """Reuse the cookies and user agent of a bootstrapped Playwright session"""
+        transport = cls(**kwargs)
+        transport.load_cookies(browser.page.context.cookies())
+        transport.session.headers["User-Agent"] = browser.page.evaluate("navigator.userAgent")
+        return transport
+
+    def load_cookies(self, cookies):
+        for c in cookies:
+            self.session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+
+    def _url(self, path):
+        return self.base_url + path.lstrip("/")
+
+    def _get(self, path, **params):
+        with self.limiter.request("http"):
+            resp = self.session.get(self._url(path), params=params or None, timeout=self.timeout)
+            resp.raise_for_status()
+        return resp.text
+
+    def _post(self, path, data):
+        if self.csrf:
+            data = {**data, config.HTTP_FIELDS["csrf"]: self.csrf}
+        with self.limiter.request("http"):
+            resp = self.session.post(self._url(path), data=data, timeout=self.timeout)
+            resp.raise_for_status()
+        return resp.text
+
+    # --------------------------------------------------
+    # SEARCH
+    # --------------------------------------------------
+    def search_captcha(self):
+        """Load the view_contracts form; returns the search captcha image bytes"""
+        html = self._get(config.HTTP_PATHS["contracts"])
+        match = CSRF_RE.search(html)
+        if match:
+            self.csrf = match.group(1)
+        return parse_captcha(html)
+
+    def search(self, category_id, from_date, to_date, captcha_text):
+        """category_id: the select2 option id (site id from the category catalog), not the name"""
+        f = config.HTTP_FIELDS
+        html = self._post(config.HTTP_PATHS["search"], {
+            f["category"]: category_id,
+            f["from_date"]: from_date.strftime("%d-%m-%Y"),
+            f["to_date"]: to_date.strftime("%d-%m-%Y"),
+            f["search_captcha"]: captcha_text,
+        })
+        if is_no_result(html):
+            return []
+        cards = parse_cards(html)
+        if not cards:
+            raise CaptchaRejected("Search returned no results block")
+        return cards
+
+    # --------------------------------------------------
+    # PER-ORDER CAPTCHA + DOWNLOAD LINK
+    # --------------------------------------------------
+    def order_captcha(self, bid_no):
+        body = self._post(config.HTTP_PATHS["order_captcha"], {config.HTTP_FIELDS["order"]: bid_no})
+        return parse_captcha(body)
+
+    def download_link(self, bid_no, captcha_text):
+        body = self._post(config.HTTP_PATHS["order_link"], {
+            config.HTTP_FIELDS["order"]: bid_no,
+            config.HTTP_FIELDS["order_captcha"]: captcha_text,
+        })
+        return parse_download_link(body)
+
+    def close(self):
+        self.session.close()
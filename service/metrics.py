@@ -0,0 +1,248 @@
+"""
+Run metrics: per-stage timers, counters and histograms.
+
+Every timed stage is appended to logs/metrics.log (untracked) as one JSON line
+({"ts", "event", "stage", "seconds", "ok", ...context}), so a long run can
+be sliced afterwards with jq/pandas. The same numbers are aggregated in
+memory, printed at the end of the run and, when METRICS_PORT is set,
+served as Prometheus text on http://127.0.0.1:<port>/metrics.
+
+Stages: browser_start, category (daemon), navigation, category_select, date_filter,
+captcha_solve (time the page waited for an answer), ocr (solver CPU time,
+overlaps captcha_solve when solved speculatively), captcha_submit,
+row_extract, modal, write.
+
+Prometheus labels stay low-cardinality (stage, kind, outcome); per-event
+context such as category or bid number only goes to the JSON log.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import config
+
+LOG_PATH = Path(__file__).resolve().parents[1] / "logs" / "metrics.log"
+
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+ATTEMPT_BUCKETS = (1, 2, 3, 4, 5, 7, 10)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # cumulative, like Prometheus "le" buckets
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Metrics:
+    def __init__(self, log_path=LOG_PATH, enabled_log=config.METRICS_LOG):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.logger = self._json_logger(log_path) if enabled_log else None
+        self._server = None
+
+    @staticmethod
+    def _json_logger(path):
+        logger = logging.getLogger(f"gem.metrics.{path}")
+        if not logger.handlers:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+        return logger
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    # --------------------------------------------------
+    # RECORDING
+    # --------------------------------------------------
+    def log(self, event, **fields):
+        if not self.logger:
+            return
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "event": event,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            **fields,
+        }
+        self.logger.info(json.dumps(record, default=str, ensure_ascii=False))
+
+    def count(self, name, n=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def observe(self, name, value, buckets=STAGE_BUCKETS, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges[self._key(name, labels)] = value
+
+    @contextmanager
+    def timer(self, stage, **context):
+        """Time a stage; the yielded dict can take extra context for the log line"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield context
+            ok = True
+        finally:
+            seconds = time.perf_counter() - started
+            self.observe("stage_seconds", seconds, stage=stage)
+            if not ok:
+                self.count("stage_errors", stage=stage)
+            self.log("stage", stage=stage, seconds=round(seconds, 4), ok=ok, **context)
+
+    def rows_per_minute(self):
+        rows = sum(v for (name, _), v in self.counters.items() if name == "rows_saved")
+        minutes = (time.time() - self.started) / 60
+        return rows / minutes if minutes else 0.0
+
+    # --------------------------------------------------
+    # PROMETHEUS TEXT
+    # --------------------------------------------------
+    @staticmethod
+    def _labels(labels, **extra):
+        items = list(labels) + list(extra.items())
+        if not items:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+    def render(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+            gauges = sorted(self.gauges.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f"gem_{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{self._labels(labels)} {value}")
+
+        for (name, labels), h in histograms:
+            metric = f"gem_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            for bound, n in zip(h.buckets, h.counts):
+                lines.append(f"{metric}_bucket{self._labels(labels, le=bound)} {n}")
+            lines.append(f"{metric}_bucket{self._labels(labels, le='+Inf')} {h.count}")
+            lines.append(f"{metric}_sum{self._labels(labels)} {h.sum:.6f}")
+            lines.append(f"{metric}_count{self._labels(labels)} {h.count}")
+
+        for (name, labels), value in gauges:
+            metric = f"gem_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} gauge")
+                typed.add(metric)
+            lines.append(f"{metric}{self._labels(labels)} {value}")
+
+        lines.append("# TYPE gem_rows_per_minute gauge")
+        lines.append(f"gem_rows_per_minute {self.rows_per_minute():.3f}")
+        lines.append("# TYPE gem_uptime_seconds gauge")
+        lines.append(f"gem_uptime_seconds {time.time() - self.started:.1f}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=config.METRICS_PORT, host="127.0.0.1"):
+        """Serve render() on /metrics from a daemon thread (no-op without a port)"""
+        if not port or self._server:
+            return
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            print(f"[METRICS] ⚠️  Cannot serve on {host}:{port}: {e}")
+            return
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"[METRICS] Prometheus text on http://{host}:{port}/metrics")
+
+    # --------------------------------------------------
+    # SUMMARY
+    # --------------------------------------------------
+    def print_summary(self):
+        with self._lock:
+            stages = {
+                dict(labels)["stage"]: h for (name, labels), h in self.histograms.items()
+                if name == "stage_seconds"
+            }
+            attempts = {
+                labels: h for (name, labels), h in self.histograms.items() if name == "captcha_attempts"
+            }
+        if not stages:
+            return
+
+        wall = time.time() - self.started
+        print("\n" + "=" * 70)
+        print("📊 STAGE METRICS")
+        print("=" * 70)
+        print(f"{'stage':<18}{'n':>7}{'total s':>10}{'avg s':>9}{'max s':>9}{'% wall':>8}")
+        for stage, h in sorted(stages.items(), key=lambda kv: kv[1].sum, reverse=True):
+            print(
+                f"{stage:<18}{h.count:>7}{h.sum:>10.1f}{h.sum / h.count:>9.2f}"
+                f"{h.max:>9.2f}{100 * h.sum / wall if wall else 0:>7.1f}%"
+            )
+        for labels, h in sorted(attempts.items()):
+            label = " ".join(f"{k}={v}" for k, v in labels)
+            print(f"[METRICS] captcha attempts {label}: avg {h.sum / h.count:.2f} over {h.count}")
+        print(f"[METRICS] {self.rows_per_minute():.1f} rows/min over {wall / 60:.1f} min")
+
+        self.log(
+            "summary",
+            wall_seconds=round(wall, 1),
+            rows_per_minute=round(self.rows_per_minute(), 2),
+            stages={s: {"n": h.count, "seconds": round(h.sum, 3)} for s, h in stages.items()},
+        )
+
+
+METRICS = Metrics()
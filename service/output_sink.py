@@ -0,0 +1,401 @@
+"""
+Batched output sink for scraped contract rows.
+
+Controllers put() row dicts; one writer thread per sink drains a queue,
+buffers rows in memory and hands them to the backend in batches (every
+OUTPUT_BATCH_SIZE rows or OUTPUT_FLUSH_SECONDS, whichever comes first), so
+the output file is opened once per run instead of once per row and
+concurrent workers never write to it directly.
+
+checkpoint() blocks until everything queued so far is written and fsynced
+and returns False if that failed (the rows stay buffered for the next
+flush, .error holds the cause); callbacks registered with on_flush() run
+only after rows are durable (crawl state marks bids as seen from there).
+
+Backends: csv (default, contracts_merged.csv), jsonl, parquet (one part
+file per flush, needs pyarrow) and sqlite. csv and jsonl write the rows as
+scraped; parquet and sqlite store contract rows with their schema types.
+"""
+
+import atexit
+import csv
+import io
+import json
+import os
+import queue
+import signal
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import config
+from service.contract_schema import OUTPUT_COLUMNS, arrow_schema, typed_row
+from service.metrics import METRICS
+
+_CHECKPOINT = object()
+_STOP = object()
+
+
+# --------------------------------------------------
+# BACKENDS
+# --------------------------------------------------
+class CsvBackend:
+    suffix = ".csv"
+
+    def __init__(self, path, columns):
+        self.path = Path(path)
+        self.columns = columns
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._f = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f)
+        if new:
+            self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows([[row.get(c, "") for c in self.columns] for row in rows])
+        self._f.flush()
+
+    def sync(self):
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+
+class JsonlBackend:
+    suffix = ".jsonl"
+
+    def __init__(self, path, columns):
+        self.path = Path(path)
+        self.columns = columns
+        self._f = open(self.path, "a", encoding="utf-8")
+
+    def write(self, rows):
+        self._f.writelines(
+            json.dumps({c: row.get(c, "") for c in self.columns}, ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        )
+        self._f.flush()
+
+    def sync(self):
+        os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+
+class ParquetBackend:
+    """Parquet files cannot be appended to: every flush becomes a part file in a directory"""
+    suffix = ""
+
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa, self._pq = pa, pq
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.columns = columns
+        self._run = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._parts = 0
+
+    def write(self, rows):
+        # Contract rows get the declared schema instead of per-batch inference
+        schema = None
+        if self.columns == OUTPUT_COLUMNS:
+            schema = arrow_schema(self._pa)
+            rows = [typed_row(row) for row in rows]
+        table = self._pa.Table.from_pylist([{c: row.get(c) for c in self.columns} for row in rows], schema=schema)
+        self._parts += 1
+        part = self.path / f"part-{self._run}-{os.getpid()}-{self._parts:05d}.parquet"
+        tmp = part.with_suffix(".tmp")
+        self._pq.write_table(table, tmp)
+        os.replace(tmp, part)  # readers never see a half-written part
+
+    def sync(self):
+        pass  # each part is complete once renamed
+
+    def close(self):
+        pass
+
+
+def _sql_value(value):
+    return value.isoformat(" ") if isinstance(value, datetime) else value
+
+
+class SqliteBackend:
+    suffix = ".sqlite"
+
+    def __init__(self, path, columns, table="contracts"):
+        self.path = Path(path)
+        self.columns = columns
+        self.table = table
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        cols = ", ".join(f'"{c}"' for c in columns)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({cols})')
+        self._insert = (
+            f'INSERT INTO "{table}" ({cols}) VALUES ({", ".join("?" * len(columns))})'
+        )
+
+    def write(self, rows):
+        if self.columns == OUTPUT_COLUMNS:
+            rows = [typed_row(row) for row in rows]
+        with self._conn:
+            self._conn.executemany(self._insert, [
+                [_sql_value(row.get(c)) for c in self.columns] for row in rows
+            ])
+
+    def sync(self):
+        pass  # committed transactions are already durable
+
+    def close(self):
+        self._conn.close()
+
+
+BACKENDS = {
+    "csv": CsvBackend,
+    "jsonl": JsonlBackend,
+    "parquet": ParquetBackend,
+    "sqlite": SqliteBackend,
+}
+
+
+# --------------------------------------------------
+# BATCHED WRITER
+# --------------------------------------------------
+class BatchedWriter:
+    def __init__(self, backend, batch_size=config.OUTPUT_BATCH_SIZE,
+                 flush_interval=config.OUTPUT_FLUSH_SECONDS):
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.error = None
+        self._callbacks = []
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def on_flush(self, callback):
+        """callback(rows) after each batch has been written"""
+        self._callbacks.append(callback)
+
+    def put(self, row):
+        if self._closed:
+            raise Exception("Output sink is closed")
+        self._queue.put(row)
+
+    def checkpoint(self, timeout=None):
+        """Block until every row queued so far is written and fsynced; False if it was not"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        result = {"ok": False}
+        self._queue.put((_CHECKPOINT, done, result))
+        return done.wait(timeout) and result["ok"]
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.backend.close()
+
+    # --------------------------------------------------
+    # WRITER THREAD
+    # --------------------------------------------------
+    def _flush(self, buffer):
+        """Write the buffer; False if the backend failed (rows are kept for the next flush)"""
+        if not buffer:
+            return True
+        try:
+            with METRICS.timer("write", rows=len(buffer), backend=type(self.backend).__name__):
+                self.backend.write(buffer)
+        except Exception as e:
+            self.error = e
+            print(f"[OUTPUT] ⚠️  Write failed ({len(buffer)} rows buffered): {e}")
+            return False
+        self.error = None
+        self.written += len(buffer)
+        for callback in self._callbacks:
+            try:
+                callback(list(buffer))
+            except Exception as e:
+                print(f"[OUTPUT] ⚠️  on_flush callback failed: {e}")
+        buffer.clear()
+        return True
+
+    def _sync(self, buffer):
+        """Flush and fsync; True only if nothing is left buffered"""
+        if not self._flush(buffer):
+            return False
+        try:
+            self.backend.sync()
+        except Exception as e:
+            self.error = e
+            print(f"[OUTPUT] ⚠️  Sync failed: {e}")
+            return False
+        return True
+
+    def _loop(self):
+        buffer = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                if not self._sync(buffer):
+                    print(f"[OUTPUT] ❌ Closing with {len(buffer)} rows not written")
+                return
+
+            if isinstance(item, tuple) and item and item[0] is _CHECKPOINT:
+                _, done, result = item
+                result["ok"] = self._sync(buffer)
+                done.set()
+                continue
+
+            if item is not None:
+                buffer.append(item)
+
+            if len(buffer) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(buffer)
+                deadline = time.monotonic() + self.flush_interval
+
+
+_open_sinks = []
+
+
+def open_sink(output_dir, columns, fmt=config.OUTPUT_FORMAT, name="contracts_merged"):
+    backend_cls = BACKENDS[fmt]
+    path = Path(output_dir) / f"{name}{backend_cls.suffix}"
+    writer = BatchedWriter(backend_cls(path, columns))
+    writer.path = path
+    _open_sinks.append(writer)
+    atexit.register(writer.close)
+    print(f"[OUTPUT] Writing {fmt} → {path}")
+    return writer
+
+
+# --------------------------------------------------
+# SHARD MERGE
+# --------------------------------------------------
+def _merge_text(target, shards, read_keys, read_rows, header=None):
+    seen = read_keys(target) if target.exists() else set()
+    new = not target.exists() or target.stat().st_size == 0
+    merged = 0
+    with open(target, "a", newline="", encoding="utf-8") as out:
+        if new and header:
+            out.write(header)
+        for shard in shards:
+            for key, line in read_rows(shard):
+                if key in seen:
+                    continue
+                seen.add(key)
+                out.write(line)
+                merged += 1
+        out.flush()
+        os.fsync(out.fileno())
+    return merged
+
+
+def _csv_keys(path, key="bid_no"):
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row[key] for row in csv.DictReader(f)}
+
+
+def _csv_rows(path, key="bid_no"):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        i = header.index(key)
+        for row in reader:
+            line = io.StringIO()
+            csv.writer(line).writerow(row)
+            yield row[i], line.getvalue()
+
+
+def _jsonl_rows(path, key="bid_no"):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)[key], line
+
+
+def merge_shards(output_dir, shard_names, columns=OUTPUT_COLUMNS, fmt=config.OUTPUT_FORMAT,
+                 name="contracts_merged"):
+    """
+    Fold per-process shard outputs into the main output, skipping bid_nos it
+    already has; merged shard files are removed. Returns rows added.
+    """
+    suffix = BACKENDS[fmt].suffix
+    target = Path(output_dir) / f"{name}{suffix}"
+    shards = [p for p in (Path(output_dir) / f"{s}{suffix}" for s in shard_names) if p.exists()]
+    if not shards:
+        return 0
+
+    if fmt == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(columns)
+        merged = _merge_text(target, shards, _csv_keys, _csv_rows, header=header.getvalue())
+    elif fmt == "jsonl":
+        merged = _merge_text(target, shards, lambda p: {k for k, _ in _jsonl_rows(p)}, _jsonl_rows)
+    elif fmt == "sqlite":
+        SqliteBackend(target, columns).close()  # creates the table if needed
+        merged = 0
+        with sqlite3.connect(target) as conn:
+            for shard in shards:
+                conn.execute("ATTACH DATABASE ? AS shard", (str(shard),))
+                merged += conn.execute(
+                    'INSERT INTO contracts SELECT * FROM shard.contracts '
+                    'WHERE bid_no NOT IN (SELECT bid_no FROM contracts)'
+                ).rowcount
+                conn.commit()
+                conn.execute("DETACH DATABASE shard")
+        conn.close()
+    else:
+        # Parquet parts already have unique (run, pid) names; crawl state keeps bids unique
+        target.mkdir(parents=True, exist_ok=True)
+        merged = 0
+        for shard in shards:
+            for part in shard.glob("*.parquet"):
+                os.replace(part, target / part.name)
+                merged += 1
+            shard.rmdir()
+        print(f"[OUTPUT] Moved {merged} parquet parts into {target}")
+        return merged
+
+    for shard in shards:
+        shard.unlink()
+    print(f"[OUTPUT] Merged {len(shards)} shards → {target} (+{merged} rows)")
+    return merged
+
+
+# --------------------------------------------------
+# CRASH SAFETY
+# --------------------------------------------------
+def flush_all(timeout=30):
+    for sink in list(_open_sinks):
+        if not sink.checkpoint(timeout=timeout):
+            print(f"[OUTPUT] ❌ {getattr(sink, 'path', 'output')} not fully written: {sink.error}")
+
+
+def install_signal_handlers():
+    """Flush every sink on SIGTERM/SIGHUP/SIGBREAK, then unwind like Ctrl-C (main thread only)"""
+    def handler(signum, frame):
+        print(f"\n[OUTPUT] Signal {signum} → flushing output")
+        flush_all()
+        raise KeyboardInterrupt
+
+    for name in ("SIGTERM", "SIGHUP", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), handler)
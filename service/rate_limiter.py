@@ -0,0 +1,235 @@
+"""
+Adaptive request rate against the GeM portal: a token bucket whose rate
+follows AIMD (additive increase, multiplicative decrease).
+
+Every request that reaches the portal (navigation, search/modal submits,
+result pages, plain HTTP calls) first takes a token, then reports how it
+went:
+
+- healthy (answered within RATE_LATENCY_TARGET, captcha not rejected):
+  the rate grows by about RATE_INCREASE requests/s per second of traffic;
+- slow or captcha rejected: the rate holds;
+- timeout, error page or very slow (2x target): the rate is multiplied by
+  RATE_DECREASE, at most once per cooldown so a burst of parallel
+  failures counts as one congestion signal;
+- throttled (HTTP 429/503, "Too Many Requests", access denied): the rate
+  drops and every request pauses for RATE_THROTTLE_PAUSE seconds,
+  doubling while throttling repeats.
+
+One limiter is shared by all workers of a process (default_limiter());
+sharded runs give each process its 1/N share of the configured rates.
+Schedulers read backpressure() before starting the next category.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+import config
+from service.metrics import METRICS
+
+THROTTLE_STATUS = (429, 503)
+THROTTLE_MARKERS = (
+    "too many requests", "rate limit", "service unavailable", "access denied",
+    "request blocked", "temporarily blocked", "bad gateway", "gateway timeout",
+)
+
+# Visible text of the portal's (or its proxy's) error pages
+ERROR_PAGE_JS = """
+(markers) => {
+    const text = ((document.title || '') + ' ' + (document.body ? document.body.innerText.slice(0, 2000) : ''))
+        .toLowerCase();
+    return markers.find(m => text.includes(m)) || null;
+}
+"""
+
+
+class PortalThrottled(Exception):
+    pass
+
+
+def classify(error):
+    """"throttled", "timeout" or "error" for an exception raised by a request"""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    text = str(error).lower()
+    if isinstance(error, PortalThrottled) or status in THROTTLE_STATUS or any(m in text for m in THROTTLE_MARKERS):
+        return "throttled"
+    if "timeout" in type(error).__name__.lower() or "timeout" in text or "timed out" in text:
+        return "timeout"
+    return "error"
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, rate=config.RATE_INITIAL, min_rate=config.RATE_MIN, max_rate=config.RATE_MAX,
+                 burst=config.RATE_BURST, increase=config.RATE_INCREASE, decrease=config.RATE_DECREASE,
+                 latency_target=config.RATE_LATENCY_TARGET, throttle_pause=config.RATE_THROTTLE_PAUSE):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.burst = max(1.0, burst)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.throttle_pause = throttle_pause
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._hold_until = 0.0      # no second decrease before this
+        self._pause_until = 0.0     # nobody sends before this (throttled)
+        self._throttle_streak = 0
+        self.latency = None         # EWMA of response time
+        self.waited = 0.0
+        self.counts = {"ok": 0, "slow": 0, "rejected": 0, "timeout": 0, "error": 0, "throttled": 0}
+        METRICS.gauge("rate_limit", self.rate)
+
+    # --------------------------------------------------
+    # TOKEN BUCKET
+    # --------------------------------------------------
+    def _reserve(self, cost):
+        """0 if a token was taken, else seconds to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if now < self._pause_until:
+                return self._pause_until - now
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return 0.0
+            return (cost - self._tokens) / self.rate
+
+    def acquire(self, cost=1.0):
+        started = time.perf_counter()
+        while True:
+            wait = self._reserve(cost)
+            if not wait:
+                break
+            time.sleep(wait)
+        self._waited(time.perf_counter() - started)
+
+    async def acquire_async(self, cost=1.0):
+        started = time.perf_counter()
+        while True:
+            wait = self._reserve(cost)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        self._waited(time.perf_counter() - started)
+
+    def _waited(self, seconds):
+        if seconds > 0.001:
+            with self._lock:
+                self.waited += seconds
+            METRICS.observe("rate_wait_seconds", seconds)
+
+    # --------------------------------------------------
+    # FEEDBACK (AIMD)
+    # --------------------------------------------------
+    def record(self, outcome, latency=None, kind="request"):
+        """outcome: ok | rejected | timeout | error | throttled (a slow ok is downgraded)"""
+        with self._lock:
+            now = time.monotonic()
+            if latency is not None:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                if outcome == "ok" and latency > 2 * self.latency_target:
+                    outcome = "timeout"  # answered, but slow enough to count as congestion
+                elif outcome == "ok" and latency > self.latency_target:
+                    outcome = "slow"
+            self.counts[outcome] += 1
+            before = self.rate
+
+            if outcome == "ok":
+                self._throttle_streak = 0
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            elif outcome in ("timeout", "error", "throttled") and now >= self._hold_until:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._hold_until = now + max(self.latency_target, 1.0 / self.rate)
+            if outcome == "throttled":
+                pause = min(self.throttle_pause * 2 ** self._throttle_streak, 600)
+                self._throttle_streak += 1
+                self._pause_until = max(self._pause_until, now + pause)
+                self._tokens = 0.0
+            rate = self.rate
+
+        METRICS.count("portal_requests", kind=kind, outcome=outcome)
+        if rate != before:
+            METRICS.gauge("rate_limit", rate)
+            if rate < before:
+                print(f"[RATE] ⬇️  {outcome} → {before:.2f} → {rate:.2f} req/s")
+                METRICS.log("rate", outcome=outcome, before=round(before, 3), rate=round(rate, 3))
+        return outcome
+
+    @contextmanager
+    def request(self, kind):
+        """Take a token, run the request, report its latency/outcome (exceptions are classified)"""
+        self.acquire()
+        started = time.perf_counter()
+        result = {"outcome": "ok"}
+        try:
+            yield result
+        except Exception as e:
+            self.record(classify(e), time.perf_counter() - started, kind)
+            raise
+        self.record(result["outcome"], time.perf_counter() - started, kind)
+
+    @asynccontextmanager
+    async def request_async(self, kind):
+        await self.acquire_async()
+        started = time.perf_counter()
+        result = {"outcome": "ok"}
+        try:
+            yield result
+        except Exception as e:
+            self.record(classify(e), time.perf_counter() - started, kind)
+            raise
+        self.record(result["outcome"], time.perf_counter() - started, kind)
+
+    # --------------------------------------------------
+    # SCHEDULER FEEDBACK
+    # --------------------------------------------------
+    def backpressure(self):
+        """Seconds a scheduler should wait before starting new work (0 when healthy)"""
+        with self._lock:
+            pause = max(0.0, self._pause_until - time.monotonic())
+            if not pause and self.rate <= self.min_rate and self._throttle_streak:
+                pause = self.throttle_pause
+        return pause
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "latency": round(self.latency, 3) if self.latency is not None else None,
+                "paused": round(max(0.0, self._pause_until - time.monotonic()), 1),
+                "waited": round(self.waited, 1),
+                **self.counts,
+            }
+
+    def print_summary(self):
+        s = self.snapshot()
+        total = sum(self.counts.values())
+        if not total:
+            return
+        print(f"\n[RATE] {s['rate']:.2f} req/s now | {total} requests | ok {s['ok']} | slow {s['slow']} | "
+              f"rejected {s['rejected']} | timeout {s['timeout']} | error {s['error']} | "
+              f"throttled {s['throttled']} | waited {s['waited']:.1f}s")
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def default_limiter():
+    """One limiter per process, shared by every worker thread / coroutine"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            # Read at first use: a shard process sets RATE_SHARE after import
+            share = config.RATE_SHARE
+            _limiter = AdaptiveRateLimiter(
+                rate=config.RATE_INITIAL * share, min_rate=config.RATE_MIN * share,
+                max_rate=config.RATE_MAX * share, increase=config.RATE_INCREASE * share
+            )
+        return _limiter
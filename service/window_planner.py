@@ -0,0 +1,88 @@
+"""
+Adaptive date-window planner for contract searches.
+
+One search = one captcha, and the portal only returns up to
+SEARCH_RESULT_CAP cards per search. The planner cuts a date range into
+windows sized from the category's remembered density (results per day) so
+a window is expected to fill about WINDOW_TARGET_FILL of the cap:
+
+- a window whose listing was truncated (see ResultsWalker.truncated) is
+  split in half and re-searched (until it is a single day);
+- after an empty window, the next pending windows are merged while their
+  expected results still fit;
+- every complete window updates the density in the crawl state, so the
+  next run plans good sizes up front.
+
+Windows are (from_date, to_date) datetimes, both days inclusive.
+"""
+
+from datetime import timedelta
+
+import config
+
+DAY = timedelta(days=1)
+
+
+def window_days(window):
+    from_date, to_date = window
+    return (to_date - from_date).days + 1
+
+
+class WindowPlanner:
+    def __init__(self, state, cap=config.SEARCH_RESULT_CAP, fill=config.WINDOW_TARGET_FILL,
+                 max_days=config.WINDOW_MAX_DAYS):
+        self.state = state
+        self.cap = cap
+        self.target = max(1.0, fill * cap)
+        self.max_days = max(1, max_days)
+
+    def _size(self, category):
+        per_day = self.state.density(category)
+        if not per_day:
+            # Unknown or empty so far: go wide, splitting corrects an overshoot
+            return self.max_days
+        return max(1, min(self.max_days, int(self.target / per_day)))
+
+    def expected(self, category, window):
+        return (self.state.density(category) or 0) * window_days(window)
+
+    # --------------------------------------------------
+    # PLAN / SPLIT / MERGE
+    # --------------------------------------------------
+    def plan(self, category, from_date, to_date):
+        """Oldest-first list of windows covering from_date..to_date"""
+        size = self._size(category)
+        windows = []
+        start = from_date
+        while start <= to_date:
+            end = min(to_date, start + (size - 1) * DAY)
+            windows.append((start, end))
+            start = end + DAY
+        return windows
+
+    def should_split(self, window, truncated):
+        return truncated and window_days(window) > 1
+
+    def split(self, window):
+        from_date, to_date = window
+        mid = from_date + (window_days(window) // 2 - 1) * DAY
+        return [(from_date, mid), (mid + DAY, to_date)]
+
+    def merge_pending(self, category, pending):
+        """Merge adjacent pending windows in place while the combined window is expected to fit"""
+        merged = 0
+        while len(pending) >= 2:
+            candidate = (pending[0][0], pending[1][1])
+            if window_days(candidate) > self.max_days or self.expected(category, candidate) > self.target:
+                break
+            pending[:2] = [candidate]
+            merged += 1
+        return merged
+
+    # --------------------------------------------------
+    # FEEDBACK
+    # --------------------------------------------------
+    def observe(self, category, window, results, truncated=False):
+        # A truncated window only gives a lower bound, so it doesn't teach density
+        if not truncated:
+            self.state.record_density(category, results / window_days(window))
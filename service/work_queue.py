@@ -0,0 +1,205 @@
+"""
+Durable category work queue for the daemon.
+
+One local SQLite file holds a row per category with a priority, a
+not-before time and a lease. lease() hands the highest-priority ready
+category to one owner until its lease expires, so a killed daemon loses
+nothing: its leased category becomes ready again once the lease runs out
+(or at once, for the same owner, via release_owner()). Failures are
+re-queued with exponential backoff; after QUEUE_MAX_ATTEMPTS a category
+is parked as "dead" until the next scheduled cycle enqueues it again.
+
+A sharded run (controller/shard_launcher.py) tags each category with a
+shard; lease(owner, shard) prefers the caller's own shard and steals from
+the others once it is empty, so uneven shards still finish together.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+import config
+
+QUEUE_PATH = Path(__file__).resolve().parents[1] / "data" / "state" / "work_queue.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    category     TEXT PRIMARY KEY,
+    priority     INTEGER DEFAULT 0,
+    shard        INTEGER,
+    status       TEXT DEFAULT 'queued',
+    attempts     INTEGER DEFAULT 0,
+    not_before   REAL DEFAULT 0,
+    lease_owner  TEXT,
+    lease_until  REAL,
+    last_error   TEXT,
+    updated_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority, not_before);
+"""
+
+Job = namedtuple("Job", "category priority attempts shard")
+
+
+def _now_iso():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class WorkQueue:
+    def __init__(self, path=QUEUE_PATH, lease_seconds=config.QUEUE_LEASE_SECONDS,
+                 max_attempts=config.QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        if str(path) != ":memory:":
+            # Leased and renewed concurrently by every shard process
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "shard" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN shard INTEGER")
+
+    # --------------------------------------------------
+    # PRODUCER
+    # --------------------------------------------------
+    def enqueue(self, category, priority=0, shard=None):
+        """Queue a category for a new cycle; a queued or leased one keeps its place"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (category, priority, shard, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(category) DO UPDATE SET
+                    priority = MAX(priority, excluded.priority),
+                    shard = excluded.shard,
+                    status = CASE WHEN status IN ('done', 'dead') THEN 'queued' ELSE status END,
+                    attempts = CASE WHEN status IN ('done', 'dead') THEN 0 ELSE attempts END,
+                    not_before = CASE WHEN status IN ('done', 'dead') THEN 0 ELSE not_before END,
+                    updated_at = excluded.updated_at
+                """,
+                (category, priority, shard, _now_iso())
+            )
+
+    # --------------------------------------------------
+    # CONSUMER
+    # --------------------------------------------------
+    def lease(self, owner, shard=None):
+        """Next ready category leased to owner (own shard first, then highest priority), or None"""
+        now = time.time()
+        with self._lock, self._conn:
+            # BEGIN IMMEDIATE: another process cannot lease the same row in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                """
+                SELECT category, priority, attempts, shard FROM jobs
+                WHERE (status = 'queued' AND not_before <= ?)
+                   OR (status = 'leased' AND lease_until < ?)
+                ORDER BY shard IS ? DESC, priority DESC, not_before, category
+                LIMIT 1
+                """,
+                (now, now, shard)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_until = ?, updated_at = ? "
+                "WHERE category = ?",
+                (owner, now + self.lease_seconds, _now_iso(), row[0])
+            )
+        return Job(*row)
+
+    def renew(self, category, owner):
+        """Extend a lease still held by owner (heartbeat); False if it was lost"""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE category = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + self.lease_seconds, category, owner)
+            )
+        return cur.rowcount == 1
+
+    def complete(self, category):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', attempts = 0, lease_owner = NULL, lease_until = NULL, "
+                "last_error = NULL, updated_at = ? WHERE category = ?",
+                (_now_iso(), category)
+            )
+
+    def fail(self, category, error, base=config.QUEUE_BACKOFF_BASE, cap=config.QUEUE_BACKOFF_MAX):
+        """Re-queue after base * 2^(attempts-1) seconds (jittered); "dead" after max_attempts"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT attempts FROM jobs WHERE category = ?", (category,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            delay = min(cap, base * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            status = "dead" if attempts >= self.max_attempts else "queued"
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, not_before = ?, lease_owner = NULL, "
+                "lease_until = NULL, last_error = ?, updated_at = ? WHERE category = ?",
+                (status, attempts, time.time() + delay, str(error)[:500], _now_iso(), category)
+            )
+        return status, delay
+
+    def release(self, category):
+        """Give a lease back without counting an attempt (e.g. the browser crashed)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE category = ? AND status = 'leased'",
+                (_now_iso(), category)
+            )
+
+    def release_owner(self, owner):
+        """Re-queue every lease an earlier run of this owner left behind"""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_owner = ?",
+                (_now_iso(), owner)
+            )
+        return cur.rowcount
+
+    def release_all(self):
+        """Re-queue every lease; only safe while no consumer is running"""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE status = 'leased'",
+                (_now_iso(),)
+            )
+        return cur.rowcount
+
+    # --------------------------------------------------
+    # INSPECTION
+    # --------------------------------------------------
+    def next_ready_in(self):
+        """Seconds until the next queued category becomes ready (None if nothing is queued)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(CASE WHEN status = 'queued' THEN not_before ELSE lease_until END) FROM jobs "
+                "WHERE status IN ('queued', 'leased')"
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def pending(self):
+        """Categories queued or leased (i.e. the current cycle is not finished)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'leased')"
+            ).fetchone()[0]
+
+    def summary(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,170 @@
+"""
+Pool of warmed browser sessions parked on view_contracts.
+
+Every slot is its own browser context (own cookies, so its own server-side
+captcha state) whose storage_state is saved to data/browser/storage_state/
+and restored on the next launch, so a restart skips the homepage warm-up.
+
+checkout() hands out a page that is already on view_contracts and sends
+the previously used page back there with a commit-only goto: the reload
+finishes in the background while the next category runs on another slot,
+replacing the per-category home -> menu -> submenu navigation.
+
+Sessions are recycled only when they are closed, older than
+SESSION_MAX_AGE, used SESSION_MAX_USES times, or fail to become ready.
+Sync Playwright: one pool per browser-owning thread.
+"""
+
+import time
+
+import config
+from browser_profile import BROWSER_DATA_DIR, block_requests, context_options
+from service.rate_limiter import default_limiter
+
+CONTRACTS_URL = config.GEM_HOME_URL + "view_contracts"
+READY_SELECTOR = "#captchaimg1"
+STATE_DIR = BROWSER_DATA_DIR / "storage_state"
+
+
+class WarmSession:
+    def __init__(self, slot, context, page):
+        self.slot = slot
+        self.context = context
+        self.page = page
+        self.created = time.monotonic()
+        self.uses = 0
+        self.broken = False
+
+
+class SessionPool:
+    def __init__(self, manager, size=None, max_age=config.SESSION_MAX_AGE,
+                 max_uses=config.SESSION_MAX_USES, name="0", limiter=None):
+        self.manager = manager
+        self.limiter = limiter or default_limiter()
+        # Read at construction: SESSION_POOL_SIZE is off by default and enabled at runtime
+        self.size = max(1, config.SESSION_POOL_SIZE if size is None else size)
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.name = name
+        self.slots = [None] * self.size
+        self.current = None
+        self.checkout_times = []
+        self.recycled = 0
+        self.restored = 0
+
+    # --------------------------------------------------
+    # SESSION LIFECYCLE
+    # --------------------------------------------------
+    def _state_path(self, slot):
+        return STATE_DIR / f"{self.name}-{slot}.json"
+
+    def _open(self, slot):
+        options = context_options(self.manager.profile)
+        path = self._state_path(slot)
+        if path.exists() and time.time() - path.stat().st_mtime < self.max_age:
+            options["storage_state"] = str(path)
+            self.restored += 1
+
+        context = self.manager.browser.new_context(**options)
+        page = context.new_page()
+        block_requests(context, page, self.manager.profile)
+
+        session = WarmSession(slot, context, page)
+        self._park(session)
+        self.slots[slot] = session
+        return session
+
+    def _park(self, session):
+        """Send the page to view_contracts; returns at commit, loading continues in the background"""
+        # A real portal request, so it takes a token (no latency feedback: it finishes later)
+        self.limiter.acquire()
+        try:
+            session.page.goto(CONTRACTS_URL, wait_until="commit", timeout=60000)
+        except Exception as e:
+            print(f"[SESSION] ⚠️  Slot {session.slot} failed to park: {e}")
+            session.broken = True
+
+    def _healthy(self, session):
+        return (
+            not session.broken
+            and not session.page.is_closed()
+            and time.monotonic() - session.created < self.max_age
+            and session.uses < self.max_uses
+        )
+
+    def _ready(self, session, timeout=15000):
+        try:
+            session.page.wait_for_selector(READY_SELECTOR, state="attached", timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def _recycle(self, session):
+        print(f"[SESSION] ♻️  Recycling slot {session.slot} (uses {session.uses})")
+        self.recycled += 1
+        try:
+            session.context.close()
+        except Exception:
+            pass
+        self._state_path(session.slot).unlink(missing_ok=True)
+        return self._open(session.slot)
+
+    def _save_state(self, session):
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            session.context.storage_state(path=str(self._state_path(session.slot)))
+        except Exception:
+            pass
+
+    # --------------------------------------------------
+    # CHECKOUT
+    # --------------------------------------------------
+    def checkout(self):
+        """Page ready on view_contracts; the previous one is re-parked for later"""
+        started = time.perf_counter()
+        previous = self.current
+        if previous:
+            previous.uses += 1
+            self._park(previous)
+
+        # Round robin, starting with the slot that has been loading the longest
+        first = (previous.slot + 1) % self.size if previous else 0
+        for offset in range(self.size):
+            slot = (first + offset) % self.size
+            session = self.slots[slot] or self._open(slot)
+            if not self._healthy(session):
+                session = self._recycle(session)
+
+            if not self._ready(session):
+                session = self._recycle(session)
+                if not self._ready(session):
+                    continue
+
+            if session.uses == 0:
+                self._save_state(session)
+            self.current = session
+            self.checkout_times.append(time.perf_counter() - started)
+            return session.page
+
+        raise Exception("No healthy browser session available")
+
+    def print_summary(self):
+        if not self.checkout_times:
+            return
+        times = sorted(self.checkout_times)
+        print(f"\n[SESSION] {len(times)} checkouts | avg {sum(times) / len(times) * 1000:.0f} ms | "
+              f"max {times[-1] * 1000:.0f} ms | {self.restored} restored from storage_state | "
+              f"{self.recycled} recycled")
+
+    def close(self):
+        for session in self.slots:
+            if session is None:
+                continue
+            if self._healthy(session):
+                self._save_state(session)
+            try:
+                session.context.close()
+            except Exception:
+                pass
+        self.slots = [None] * self.size
+        self.current = None
@@ -0,0 +1,136 @@
+"""
+Captcha ground-truth corpus.
+
+Every captcha the scraper solves is stored once (deduplicated by SHA-1 of
+the image bytes) in a single SQLite file together with the guessed text,
+the solver confidence and whether the portal accepted it. Accepted guesses
+are ground truth: benchmarks/bench_captcha_corpus.py replays them through
+any solver configuration, and tools/train_glyph_classifier.py can train
+from them.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import config
+from solver.pass_stats import PASS_STATS, image_hash
+
+CORPUS_PATH = Path(__file__).resolve().parents[1] / "data" / "captchas" / "corpus.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captchas (
+    sha1        TEXT PRIMARY KEY,
+    image       BLOB NOT NULL,
+    kind        TEXT,
+    guess       TEXT,
+    confidence  REAL,
+    outcome     TEXT DEFAULT 'pending',
+    label       TEXT,
+    seen        INTEGER DEFAULT 1,
+    first_seen  TEXT,
+    last_seen   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_captchas_outcome ON captchas (outcome);
+"""
+
+
+class CaptchaCorpus:
+    def __init__(self, path=CORPUS_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Shared by every process of a sharded run: wait on locks instead of failing
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        # WAL: a capture in one shard does not block outcome updates in another
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    # --------------------------------------------------
+    # CAPTURE
+    # --------------------------------------------------
+    def capture(self, image_bytes, kind, guess, confidence):
+        """Store a captcha and the solver's guess; returns its content hash"""
+        sha1 = image_hash(image_bytes)
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO captchas (sha1, image, kind, guess, confidence, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(sha1) DO UPDATE SET
+                    seen = seen + 1, guess = excluded.guess,
+                    confidence = excluded.confidence, last_seen = excluded.last_seen
+                """,
+                (sha1, image_bytes, kind, guess, confidence, now, now)
+            )
+        return sha1
+
+    def record_outcome(self, sha1, accepted):
+        """Mark the guess accepted (it becomes the label) or rejected"""
+        if sha1 is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE captchas SET outcome = ?, label = CASE WHEN ? THEN guess ELSE label END "
+                "WHERE sha1 = ?",
+                ("accepted" if accepted else "rejected", int(accepted), sha1)
+            )
+
+    # --------------------------------------------------
+    # READ BACK
+    # --------------------------------------------------
+    def labelled(self, kind=None, limit=None):
+        """[(image_bytes, label, kind)] for accepted captchas"""
+        sql = "SELECT image, label, kind FROM captchas WHERE label IS NOT NULL"
+        params = []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY first_seen"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def summary(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT outcome, COUNT(*) FROM captchas GROUP BY outcome"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def default_corpus():
+    global _corpus
+    with _corpus_lock:
+        if _corpus is None:
+            _corpus = CaptchaCorpus()
+        return _corpus
+
+
+def capture(image_bytes, kind, guess, confidence):
+    """Store in the default corpus (if config.CAPTURE_CAPTCHAS); returns the image hash either way"""
+    if not config.CAPTURE_CAPTCHAS:
+        return image_hash(image_bytes)
+    return default_corpus().capture(image_bytes, kind, guess, confidence)
+
+
+def record_outcome(sha1, accepted):
+    """Portal verdict on a submitted guess: scores the solver's passes and labels the corpus entry"""
+    if not sha1:
+        return
+    PASS_STATS.record_outcome(sha1, accepted)
+    if config.CAPTURE_CAPTCHAS:
+        default_corpus().record_outcome(sha1, accepted)
@@ -6,56 +6,40 @@ Advanced GeM CAPTCHA Solver
 - Confidence voting
 """
 
-import io
-import cv2
-import numpy as np
-from PIL import Image, ImageOps, ImageFilter
-import pytesseract
+import asyncio
+import threading
 from collections import Counter
 
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+import config
+from service.metrics import METRICS
+from solver.glyph_classifier import classify
+from solver.ocr_backends import get_backend
+from solver.pass_stats import PASS_STATS, image_hash
+from solver.preprocess import VARIANT_NAMES, preprocess
 
 ALLOWED = "abcdefghijklmnopqrstuvwxyz0123456789"
 
-# --------------------------------------------------
-# IMAGE VARIANTS (KEY IMPROVEMENT)
-# --------------------------------------------------
-def generate_variants(img: Image.Image):
-    variants = []
 
-    gray = img.convert("L")
-    variants.append(gray)
+class PassCounter:
+    """Total OCR passes run in this process (benchmarks read passes per solve)"""
 
-    # High contrast
-    variants.append(ImageOps.autocontrast(gray, cutoff=1))
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
 
-    # Sharpen
-    variants.append(gray.filter(ImageFilter.SHARPEN))
+    def add(self, n=1):
+        with self._lock:
+            self.value += n
 
-    # Blur + threshold
-    arr = np.array(gray)
-    th = cv2.adaptiveThreshold(
-        arr, 255,
-        cv2.ADAPTIVE_THRESH_MEAN_C,
-        cv2.THRESH_BINARY,
-        31, 5
-    )
-    variants.append(Image.fromarray(th))
 
-    # Inverted
-    variants.append(ImageOps.invert(gray))
-
-    return variants
+PASS_COUNTER = PassCounter()
 
 # --------------------------------------------------
 # OCR PASS
 # --------------------------------------------------
-def ocr_pass(img, psm):
-    cfg = (
-        f"--psm {psm} --oem 3 "
-        f"-c tessedit_char_whitelist={ALLOWED}"
-    )
-    txt = pytesseract.image_to_string(img, config=cfg)
+def ocr_pass(img, psm, backend=None):
+    PASS_COUNTER.add()
+    txt = get_backend(ALLOWED, backend).recognize(img, psm)
     return "".join(c for c in txt.lower() if c in ALLOWED)
 
 # --------------------------------------------------
@@ -81,29 +65,140 @@ def smart_vote(results):
     return final
 
 # --------------------------------------------------
-# MAIN SOLVER
+# CONFIDENCE (REAL VOTE MARGIN)
 # --------------------------------------------------
-def ensemble_solve(img_pil):
-    if not isinstance(img_pil, Image.Image):
-        img_pil = Image.open(io.BytesIO(img_pil))
+def vote_confidence(results, final):
+    """
+    Share of passes that back the answer: length agreement times the weakest
+    per-character agreement, damped when only a few passes produced text.
+    """
+    valid = [r for r in results if r]
+    if not valid or not final:
+        return 0.0
+
+    same_len = [r for r in valid if len(r) == len(final)]
+    len_share = len(same_len) / len(valid)
+    char_share = min(
+        sum(r[i] == final[i] for r in same_len) / len(same_len)
+        for i in range(len(final))
+    )
+    support = len(valid) / (len(valid) + 1)
+
+    return round(len_share * char_share * support, 3)
 
-    img_pil = img_pil.resize(
-        (img_pil.width * 3, img_pil.height * 3),
-        Image.Resampling.LANCZOS
+
+def agreement_reached(results):
+    """Early-exit test: enough passes produced exactly the voted answer"""
+    valid = [r for r in results if r]
+    if len(valid) < config.SOLVER_AGREE_VOTES:
+        return False
+    final, confidence = vote(valid)
+    return (
+        Counter(valid)[final] >= config.SOLVER_AGREE_VOTES
+        and confidence >= config.SOLVER_EARLY_CONFIDENCE
     )
 
-    results = []
+# --------------------------------------------------
+# MAIN SOLVER
+# --------------------------------------------------
+PSM_MODES = [6, 7, 8, 10, 13]
+
+
+def ocr_passes(img, ranked=False, variants=None):
+    """
+    All (key, variant, psm) OCR passes; best track record first when ranked.
+    variants: a precomputed (5, H, W) stack from preprocess/preprocess_batch.
+    """
+    if variants is None:
+        variants = preprocess(img)
+    passes = [
+        (f"{name}/psm{psm}", variant, psm)
+        for name, variant in zip(VARIANT_NAMES, variants)
+        for psm in PSM_MODES
+    ]
+    if ranked:
+        order = {key: i for i, key in enumerate(PASS_STATS.rank(p[0] for p in passes))}
+        passes.sort(key=lambda p: order[p[0]])
+    return passes
+
+
+def safe_ocr_pass(img, psm, backend=None):
+    """ocr_pass that returns "" for failures and out-of-range lengths"""
+    try:
+        txt = ocr_pass(img, psm, backend)
+    except Exception:
+        return ""
+    return txt if 4 <= len(txt) <= 6 else ""
+
 
-    for variant in generate_variants(img_pil):
-        for psm in [6, 7, 8, 10, 13]:
-            try:
-                txt = ocr_pass(variant, psm)
-                if 4 <= len(txt) <= 6:
-                    results.append(txt)
-            except:
-                pass
+def counted_ocr_pass(img, psm, backend=None):
+    """
+    safe_ocr_pass plus the number of OCR calls it made. A process pool child
+    counts into its own PASS_COUNTER, so the parent adds this up instead.
+    """
+    before = PASS_COUNTER.value
+    text = safe_ocr_pass(img, psm, backend)
+    return text, PASS_COUNTER.value - before
 
+
+def vote(results):
+    results = [r for r in results if r]
     final = smart_vote(results)
-    confidence = min(0.95, 0.4 + 0.1 * len(results))
+    return final, vote_confidence(results, final)
+
 
-    return final, confidence
\ No newline at end of file
+def remember_passes(img, results, final):
+    """Hold the pass outputs until the portal judges final (captcha_corpus.record_outcome)"""
+    if isinstance(img, (bytes, bytearray)):
+        PASS_STATS.remember(image_hash(img), results, final)
+
+
+def classifier_first(img):
+    """Glyph classifier answer if it is confident enough, else None"""
+    text, confidence = classify(img)
+    if text and confidence >= config.CLASSIFIER_MIN_CONFIDENCE:
+        return text, confidence
+    return None
+
+
+def ensemble_solve(img_pil):
+    with METRICS.timer("ocr") as span:
+        text, confidence, span["path"] = _ensemble_solve(img_pil, span)
+        span["confidence"] = round(confidence, 3)
+    METRICS.count("ocr_solves", path=span["path"])
+    return text, confidence
+
+
+def _ensemble_solve(img_pil, span):
+    from solver.solver_service import default_service
+
+    fast = classifier_first(img_pil)
+    if fast:
+        return (*fast, "classifier")
+
+    service = default_service()
+    if service is not None:
+        return (*service.solve(img_pil), "service")
+
+    adaptive = config.SOLVER_ADAPTIVE
+
+    results = {}
+
+    for key, variant, psm in ocr_passes(img_pil, ranked=adaptive):
+        results[key] = safe_ocr_pass(variant, psm)
+        if adaptive and agreement_reached(results.values()):
+            break
+
+    final, confidence = vote(results.values())
+    remember_passes(img_pil, results, final)
+
+    span["passes"] = len(results)
+    return final, confidence, "ensemble"
+
+# --------------------------------------------------
+# ASYNC WRAPPER
+# --------------------------------------------------
+async def ensemble_solve_async(img_pil, executor=None):
+    """Run ensemble_solve off the event loop (OCR is CPU/subprocess bound)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, ensemble_solve, img_pil)
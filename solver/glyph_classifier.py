@@ -0,0 +1,172 @@
+"""
+Fast first-pass captcha solver: segmentation + k-NN over glyph templates.
+
+GeM captchas use a fixed alphabet (ALLOWED, 4-6 characters), so instead of
+running generic tesseract we cut the captcha into glyphs and classify each
+one against templates harvested from labelled captchas. Pure NumPy/OpenCV,
+CPU only, a few milliseconds per captcha. ensemble_solve() falls back to the
+tesseract ensemble when the classifier is not confident.
+
+Train with: python -m tools.train_glyph_classifier --images labelled/
+"""
+
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+import config
+from solver.preprocess import to_gray
+
+MODEL_PATH = Path(__file__).resolve().parents[1] / "data" / "solver" / "glyph_model.npz"
+GLYPH_SIZE = 20
+MIN_CHARS, MAX_CHARS = 4, 6
+
+
+# --------------------------------------------------
+# SEGMENTATION
+# --------------------------------------------------
+def _binarize(gray):
+    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    if bw.mean() > 127:  # light text on dark background
+        bw = cv2.bitwise_not(bw)
+    return bw
+
+
+def _merge_overlapping(boxes):
+    # Dots of i/j and broken strokes share most of their x-range with a neighbour
+    merged = []
+    for x, y, w, h in sorted(boxes):
+        if merged:
+            mx, my, mw, mh = merged[-1]
+            overlap = min(mx + mw, x + w) - max(mx, x)
+            if overlap > 0.5 * min(mw, w):
+                nx, ny = min(mx, x), min(my, y)
+                merged[-1] = (nx, ny, max(mx + mw, x + w) - nx, max(my + mh, y + h) - ny)
+                continue
+        merged.append((x, y, w, h))
+    return merged
+
+
+def _split_wide(boxes):
+    # Touching characters come out as one wide blob: halve the widest until plausible
+    boxes = list(boxes)
+    while MIN_CHARS > len(boxes) > 0:
+        widths = [b[2] for b in boxes]
+        i = int(np.argmax(widths))
+        if widths[i] < 1.6 * float(np.median(widths)) and len(boxes) > 1:
+            break
+        x, y, w, h = boxes[i]
+        half = w // 2
+        boxes[i:i + 1] = [(x, y, half, h), (x + half, y, w - half, h)]
+    return boxes
+
+
+def segment(gray):
+    """Glyph crops (left to right) from a grayscale captcha"""
+    bw = _binarize(gray)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(bw, connectivity=8)
+
+    min_area = 0.002 * bw.size
+    min_height = 0.3 * bw.shape[0]
+    boxes = [
+        tuple(int(v) for v in stats[i, :4])
+        for i in range(1, n)
+        if stats[i, cv2.CC_STAT_AREA] >= min_area or stats[i, cv2.CC_STAT_HEIGHT] >= min_height
+    ]
+    boxes = _split_wide(_merge_overlapping(boxes))
+
+    return [bw[y:y + h, x:x + w] for x, y, w, h in boxes]
+
+
+def glyph_vector(crop):
+    h, w = crop.shape
+    side = max(h, w)
+    square = np.zeros((side, side), dtype=np.uint8)
+    square[(side - h) // 2:(side - h) // 2 + h, (side - w) // 2:(side - w) // 2 + w] = crop
+    small = cv2.resize(square, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA)
+    return small.astype(np.float32).ravel() / 255.0
+
+
+# --------------------------------------------------
+# MODEL
+# --------------------------------------------------
+class GlyphClassifier:
+    def __init__(self, templates=None, labels=None, k=config.CLASSIFIER_K):
+        self.k = k
+        self.templates = templates if templates is not None else np.empty((0, GLYPH_SIZE ** 2), np.float32)
+        self.labels = labels if labels is not None else np.empty(0, dtype="<U1")
+        self._norms = (self.templates ** 2).sum(axis=1)
+
+    @classmethod
+    def train(cls, samples, k=config.CLASSIFIER_K):
+        """samples: iterable of (image, label); captchas that don't segment into len(label) glyphs are skipped"""
+        vectors, labels, used = [], [], 0
+        for img, label in samples:
+            crops = segment(to_gray(img))
+            if len(crops) != len(label):
+                continue
+            used += 1
+            vectors.extend(glyph_vector(c) for c in crops)
+            labels.extend(label)
+
+        model = cls(np.array(vectors, dtype=np.float32).reshape(-1, GLYPH_SIZE ** 2),
+                    np.array(labels, dtype="<U1"), k=k)
+        model.trained_on = used
+        return model
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        data = np.load(path)
+        return cls(data["templates"], data["labels"], k=int(data["k"]))
+
+    def save(self, path=MODEL_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, templates=self.templates, labels=self.labels, k=self.k)
+
+    def classify(self, img):
+        """(text, confidence); confidence = weakest per-glyph neighbour agreement"""
+        if not len(self.labels):
+            return "", 0.0
+
+        crops = segment(to_gray(img))
+        if not MIN_CHARS <= len(crops) <= MAX_CHARS:
+            return "", 0.0
+
+        x = np.stack([glyph_vector(c) for c in crops])
+        # Squared euclidean distances for all glyphs x templates in one product
+        dists = (x ** 2).sum(axis=1)[:, None] + self._norms[None, :] - 2 * x @ self.templates.T
+
+        k = min(self.k, len(self.labels))
+        nearest = np.argpartition(dists, k - 1, axis=1)[:, :k]
+
+        text, confidence = "", 1.0
+        for row in self.labels[nearest]:
+            chars, counts = np.unique(row, return_counts=True)
+            best = int(np.argmax(counts))
+            text += chars[best]
+            confidence = min(confidence, counts[best] / k)
+
+        return text, float(confidence)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def default_classifier():
+    """Trained model from MODEL_PATH, or None if none has been trained yet"""
+    global _model
+    with _model_lock:
+        if _model is None and MODEL_PATH.exists():
+            _model = GlyphClassifier.load(MODEL_PATH)
+        return _model
+
+
+def classify(img):
+    model = default_classifier() if config.CLASSIFIER_ENABLED else None
+    if model is None:
+        return "", 0.0
+    return model.classify(img)
@@ -0,0 +1,100 @@
+"""
+OCR backends for the captcha ensemble.
+
+- TesserocrBackend: in-process tesseract through the C API (tesserocr). One
+  initialised TessBaseAPI per worker thread with the whitelist set once;
+  images go in as raw NumPy buffers, no subprocess and no temp files.
+- PytesseractBackend: the original path (forks the tesseract binary and
+  round-trips a PNG per call). Always available as the fallback.
+"""
+
+import threading
+
+import numpy as np
+from PIL import Image
+
+import config
+
+
+def _as_gray_array(img):
+    if isinstance(img, Image.Image):
+        img = np.asarray(img.convert("L"))
+    return np.ascontiguousarray(img, dtype=np.uint8)
+
+
+class PytesseractBackend:
+    name = "pytesseract"
+
+    def __init__(self, whitelist):
+        import pytesseract
+
+        if config.TESSERACT_CMD:
+            pytesseract.pytesseract.tesseract_cmd = config.TESSERACT_CMD
+        self._pytesseract = pytesseract
+        self.whitelist = whitelist
+
+    def recognize(self, img, psm):
+        cfg = (
+            f"--psm {psm} --oem 3 "
+            f"-c tessedit_char_whitelist={self.whitelist}"
+        )
+        return self._pytesseract.image_to_string(img, config=cfg)
+
+
+class TesserocrBackend:
+    name = "tesserocr"
+
+    def __init__(self, whitelist):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self.whitelist = whitelist
+        self._local = threading.local()
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            kwargs = {"lang": "eng", "oem": self._tesserocr.OEM.DEFAULT}
+            if config.TESSDATA_PATH:
+                kwargs["path"] = config.TESSDATA_PATH
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            api.SetVariable("tessedit_char_whitelist", self.whitelist)
+            self._local.api = api
+        return api
+
+    def recognize(self, img, psm):
+        arr = _as_gray_array(img)
+        height, width = arr.shape[:2]
+
+        api = self._api()
+        api.SetPageSegMode(psm)
+        api.SetImageBytes(arr.tobytes(), width, height, 1, width)
+        return api.GetUTF8Text()
+
+
+BACKENDS = {
+    "tesserocr": TesserocrBackend,
+    "pytesseract": PytesseractBackend,
+}
+
+_backends = {}
+_lock = threading.Lock()
+
+
+def get_backend(whitelist, name=None):
+    """
+    Shared backend instance. name "auto" (default from config.OCR_BACKEND)
+    picks tesserocr when it imports and falls back to pytesseract.
+    """
+    name = name or config.OCR_BACKEND
+    with _lock:
+        if name not in _backends:
+            if name == "auto":
+                try:
+                    backend = TesserocrBackend(whitelist)
+                except ImportError:
+                    backend = PytesseractBackend(whitelist)
+            else:
+                backend = BACKENDS[name](whitelist)
+            _backends[name] = backend
+        return _backends[name]
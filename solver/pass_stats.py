@@ -0,0 +1,165 @@
+"""
+Per-pass track record for the captcha ensemble.
+
+Each (variant, psm) pass is scored against the portal's verdict, not the
+ensemble's own vote: a solve's pass outputs are remembered by image hash
+until the answer is submitted (captcha_corpus.record_outcome). If it was
+accepted, passes that produced it score a hit and every other pass a miss;
+if it was rejected, passes that agreed with it score a miss. Adaptive
+solving runs the best passes first so the agreement threshold is usually
+met after a handful of tesseract calls.
+
+Counts live in SQLite and are saved as increments, so the processes of a
+sharded run (--processes N) add up their scores instead of overwriting
+each other's file.
+"""
+
+import atexit
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+STATS_PATH = Path(__file__).resolve().parents[1] / "data" / "solver" / "pass_stats.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pass_stats (
+    pass_key  TEXT PRIMARY KEY,
+    hits      INTEGER NOT NULL,
+    tries     INTEGER NOT NULL
+);
+"""
+
+
+def image_hash(image_bytes):
+    """Key of a captcha image (same SHA-1 the captcha corpus stores it under)"""
+    return hashlib.sha1(image_bytes).hexdigest()
+
+
+class PassStats:
+    def __init__(self, path=STATS_PATH, save_every=50, max_pending=256):
+        self.path = Path(path)
+        self.save_every = save_every
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._pending = OrderedDict()  # image hash → (pass results, submitted answer)
+        self._unsaved = {}             # pass key → (hits, tries) scored since the last save
+        self.counts = {}
+        self._conn = None
+        if self.path.exists() or self.path.with_suffix(".json").exists():
+            self.load()
+
+    def _connect(self):
+        # Opened on first use: importing the solver creates no files
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared by every process of a sharded run: wait on locks instead of failing
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._import_json(self.path.with_suffix(".json"))
+        return self._conn
+
+    def _import_json(self, legacy_path):
+        # Earlier single-process format: imported once into an empty database
+        if not legacy_path.exists():
+            return
+        try:
+            counts = json.loads(legacy_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        with self._conn:
+            if self._conn.execute("SELECT 1 FROM pass_stats LIMIT 1").fetchone():
+                return
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pass_stats (pass_key, hits, tries) VALUES (?, ?, ?)",
+                [(key, hits, tries) for key, (hits, tries) in counts.items()]
+            )
+
+    def load(self):
+        """Totals of every process so far, plus this one's unsaved scores"""
+        with self._lock:
+            self._load()
+
+    def _load(self):
+        counts = {key: (hits, tries) for key, hits, tries in
+                  self._connect().execute("SELECT pass_key, hits, tries FROM pass_stats")}
+        for key, (hits, tries) in self._unsaved.items():
+            saved_hits, saved_tries = counts.get(key, (0, 0))
+            counts[key] = (saved_hits + hits, saved_tries + tries)
+        self.counts = counts
+
+    def save(self):
+        """Add this process's scores to the shared totals, then pick up the other processes' ones"""
+        with self._lock:
+            if not self._dirty:
+                return
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO pass_stats (pass_key, hits, tries) VALUES (?, ?, ?)
+                    ON CONFLICT(pass_key) DO UPDATE SET
+                        hits = hits + excluded.hits, tries = tries + excluded.tries
+                    """,
+                    [(key, hits, tries) for key, (hits, tries) in self._unsaved.items()]
+                )
+            self._unsaved.clear()
+            self._dirty = 0
+            self._load()
+
+    def hit_rate(self, key):
+        # Laplace-smoothed so unseen passes sit in the middle, not at the end
+        hits, tries = self.counts.get(key, (0, 0))
+        return (hits + 1) / (tries + 2)
+
+    def rank(self, keys):
+        return sorted(keys, key=self.hit_rate, reverse=True)
+
+    def remember(self, image_key, results, final):
+        """Keep a solve's {pass_key: text} until the portal has judged final"""
+        if not final:
+            return
+        with self._lock:
+            self._pending[image_key] = (dict(results), final)
+            self._pending.move_to_end(image_key)
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)  # never submitted (skipped, abandoned)
+
+    def record_outcome(self, image_key, accepted):
+        """Score the remembered solve of this image; False if there was none"""
+        with self._lock:
+            solve = self._pending.pop(image_key, None)
+        if solve is None:
+            return False
+        self.update(*solve, accepted=accepted)
+        return True
+
+    def update(self, results, answer, accepted=True):
+        """
+        results: {pass_key: text}. Accepted: a pass was right if it produced
+        answer. Rejected: passes that produced answer were wrong, the others
+        tell nothing.
+        """
+        if not answer:
+            return
+        with self._lock:
+            for key, text in results.items():
+                if not accepted and text != answer:
+                    continue
+                hit = int(accepted and text == answer)
+                for counts in (self.counts, self._unsaved):
+                    hits, tries = counts.get(key, (0, 0))
+                    counts[key] = (hits + hit, tries + 1)
+            self._dirty += 1
+            due = self._dirty >= self.save_every
+        if due:
+            self.save()
+
+
+PASS_STATS = PassStats()
+atexit.register(PASS_STATS.save)
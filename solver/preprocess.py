@@ -0,0 +1,102 @@
+"""
+NumPy/OpenCV preprocessing for captcha variants.
+
+The captcha is decoded to one grayscale array, upscaled once, and the five
+ensemble variants are written into a single preallocated (5, H, W) uint8
+buffer - no PIL round-trips, no per-variant images. The buffer rows are
+handed straight to the OCR backends. preprocess_batch() stacks several
+same-sized captchas into one (N, 5, H, W) buffer.
+"""
+
+import io
+
+import cv2
+import numpy as np
+from PIL import Image
+
+SCALE = 3
+VARIANT_NAMES = ("gray", "autocontrast", "sharpen", "threshold", "invert")
+
+# PIL's ImageFilter.SHARPEN kernel
+SHARPEN_KERNEL = np.array(
+    [[-2, -2, -2],
+     [-2, 32, -2],
+     [-2, -2, -2]],
+    dtype=np.float32
+) / 16
+
+
+def to_gray(img):
+    """Grayscale uint8 array from PNG/JPEG bytes, a PIL image or an array"""
+    if isinstance(img, (bytes, bytearray)):
+        arr = cv2.imdecode(np.frombuffer(img, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if arr is None:
+            # Formats OpenCV can't decode (e.g. GIF) still go through PIL
+            arr = np.asarray(Image.open(io.BytesIO(img)).convert("L"))
+        return arr
+    if isinstance(img, Image.Image):
+        return np.asarray(img.convert("L"))
+
+    arr = np.asarray(img, dtype=np.uint8)
+    if arr.ndim == 3:
+        code = cv2.COLOR_RGBA2GRAY if arr.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        arr = cv2.cvtColor(arr, code)
+    return arr
+
+
+def _autocontrast(gray, out, cutoff=1):
+    # Same as ImageOps.autocontrast(cutoff=1): clip 1% at each end, stretch the rest
+    cum = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+    cut = gray.size * cutoff / 100
+    lo = int(np.searchsorted(cum, cut, side="right"))
+    hi = int(np.searchsorted(cum, gray.size - cut, side="left"))
+
+    if hi <= lo:
+        out[...] = gray
+        return
+
+    lut = np.clip((np.arange(256) - lo) * (255.0 / (hi - lo)), 0, 255).astype(np.uint8)
+    cv2.LUT(gray, lut, dst=out)
+
+
+def preprocess(img, out=None):
+    """Upscaled (5, H, W) variant stack in VARIANT_NAMES order"""
+    gray = to_gray(img)
+    h, w = gray.shape[:2]
+    shape = (len(VARIANT_NAMES), h * SCALE, w * SCALE)
+
+    if out is None:
+        out = np.empty(shape, dtype=np.uint8)
+
+    cv2.resize(gray, (w * SCALE, h * SCALE), dst=out[0], interpolation=cv2.INTER_LANCZOS4)
+    up = out[0]
+
+    _autocontrast(up, out[1])
+    cv2.filter2D(up, -1, SHARPEN_KERNEL, dst=out[2])
+    cv2.adaptiveThreshold(
+        up, 255,
+        cv2.ADAPTIVE_THRESH_MEAN_C,
+        cv2.THRESH_BINARY,
+        31, 5,
+        dst=out[3]
+    )
+    cv2.bitwise_not(up, dst=out[4])
+
+    return out
+
+
+def preprocess_batch(imgs):
+    """
+    Variant stacks for several captchas. Same-sized captchas (the normal
+    case) share one (N, 5, H, W) buffer; mixed sizes come back as a list.
+    """
+    grays = [to_gray(img) for img in imgs]
+    shapes = {g.shape for g in grays}
+    if len(shapes) != 1:
+        return [preprocess(g) for g in grays]
+
+    h, w = shapes.pop()
+    buf = np.empty((len(grays), len(VARIANT_NAMES), h * SCALE, w * SCALE), dtype=np.uint8)
+    for i, g in enumerate(grays):
+        preprocess(g, out=buf[i])
+    return buf
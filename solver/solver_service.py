@@ -0,0 +1,138 @@
+"""
+Captcha solver service: runs the ensemble's OCR passes on a shared pool.
+
+Every solve fans its (variant, psm) passes out to a thread or process pool
+instead of running 25 tesseract calls back to back. All controllers share
+one service, so captchas coming from different workers are solved together
+on the same pool; solve_batch() submits several captchas in one go.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import config
+from solver.captcha_solver import (
+    PASS_COUNTER, agreement_reached, classifier_first, counted_ocr_pass, ocr_passes, remember_passes,
+    safe_ocr_pass, vote
+)
+from solver.preprocess import preprocess_batch
+
+
+def timed_pass(ocr, img, psm):
+    """Run one OCR pass in the pool worker; returns (result, seconds spent on it there)"""
+    started = time.perf_counter()
+    return ocr(img, psm), time.perf_counter() - started
+
+
+class CaptchaSolverService:
+    def __init__(self, workers=config.SOLVER_WORKERS, mode=config.SOLVER_POOL):
+        self.workers = max(1, workers)
+        self.mode = mode
+        if mode == "process":
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+
+        self._lock = threading.Lock()
+        self.timings = deque(maxlen=1000)
+
+    # --------------------------------------------------
+    # SOLVING
+    # --------------------------------------------------
+    def solve(self, img):
+        return self._ensemble([img])[0]
+
+    def solve_batch(self, imgs):
+        """Solve several captchas at once; returns [(text, confidence), ...]"""
+        solved = [classifier_first(img) for img in imgs]
+        unsure = [i for i, s in enumerate(solved) if s is None]
+        if unsure:
+            for i, result in zip(unsure, self._ensemble([imgs[i] for i in unsure])):
+                solved[i] = result
+        return solved
+
+    def _ensemble(self, imgs):
+        adaptive = config.SOLVER_ADAPTIVE
+
+        # One preprocessing pass for the whole batch; passes are queued
+        # best-first so the pool starts on the likeliest ones
+        # Child processes count passes into their own PASS_COUNTER: theirs come back with each result
+        counted = self.mode == "process"
+        ocr = counted_ocr_pass if counted else safe_ocr_pass
+        batches = [
+            {
+                self.executor.submit(timed_pass, ocr, variant, psm): key
+                for key, variant, psm in ocr_passes(None, ranked=adaptive, variants=stack)
+            }
+            for stack in preprocess_batch(imgs)
+        ]
+
+        solved = []
+        for img, futures in zip(imgs, batches):
+            results = self._collect(futures, adaptive, counted)
+            final, confidence = vote(results.values())
+            remember_passes(img, results, final)
+            solved.append((final, confidence))
+
+        return solved
+
+    def _collect(self, futures, adaptive, counted=False):
+        results = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                result, seconds = f.result()
+                if counted:
+                    result, passes = result
+                    PASS_COUNTER.add(passes)
+                results[futures[f]] = result
+                # Timed in the worker: queueing behind other passes is not charged to this one
+                self._record(seconds)
+            if adaptive and agreement_reached(results.values()):
+                for f in pending:
+                    f.cancel()
+                break
+        return results
+
+    # --------------------------------------------------
+    # TIMING
+    # --------------------------------------------------
+    def _record(self, seconds):
+        with self._lock:
+            self.timings.append(seconds)
+
+    def timing_summary(self):
+        with self._lock:
+            runs = sorted(self.timings)
+        if not runs:
+            return {"passes": 0}
+        return {
+            "passes": len(runs),
+            "mean_ms": 1000 * sum(runs) / len(runs),
+            "p50_ms": 1000 * runs[len(runs) // 2],
+            "p95_ms": 1000 * runs[min(len(runs) - 1, int(len(runs) * 0.95))],
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+# --------------------------------------------------
+# SHARED INSTANCE
+# --------------------------------------------------
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_service():
+    """Process-wide service, or None when config.SOLVER_WORKERS <= 1"""
+    global _default
+    if config.SOLVER_WORKERS <= 1:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = CaptchaSolverService()
+        return _default
@@ -0,0 +1,9 @@
+import pytest
+
+from service.metrics import METRICS
+
+
+@pytest.fixture(autouse=True)
+def _no_metrics_log(monkeypatch):
+    # Tests exercise timed code paths; keep their events out of logs/metrics.log
+    monkeypatch.setattr(METRICS, "logger", None)
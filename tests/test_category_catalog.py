@@ -0,0 +1,48 @@
+import json
+
+from service.category_catalog import CategoryCatalog, normalize, signature
+
+
+def catalog(tmp_path, *entries):
+    path = tmp_path / "category_catalog.json"
+    path.write_text(json.dumps({"version": 1, "categories": list(entries)}), encoding="utf-8")
+    return CategoryCatalog(path)
+
+
+SUTURES = {"name": "Surgical Sutures", "site_id": "4157", "aliases": ["Sutures"]}
+TROCARS = {"name": "Trocars, Surgical", "site_id": "88", "aliases": []}
+
+
+def test_keys():
+    assert normalize("  Trocars,  Surgical ") == "trocars surgical"
+    assert signature("Trocars, Surgical") == signature("surgical trocar")
+
+
+def test_lookup_by_exact_signature_and_alias(tmp_path):
+    c = catalog(tmp_path, SUTURES, TROCARS)
+    assert c.lookup("surgical sutures")["site_id"] == "4157"
+    assert c.lookup("Surgical Trocar")["site_id"] == "88"
+    assert c.lookup("SUTURES")["site_id"] == "4157"
+    assert c.lookup("Surgical Trocar", fuzzy=False) is None
+
+
+def test_close_spelling_is_a_hint_not_a_match(tmp_path):
+    c = catalog(tmp_path, SUTURES, TROCARS)
+    assert c.lookup("Surgical Suture Kit") is None
+    assert c.lookup("Surgical Sutres") is None
+    assert c.closest("Surgical Sutres") == "Surgical Sutures"
+    assert c.closest("Ventilators") is None
+
+
+def test_harvest_fills_ids_and_keeps_the_query_as_alias(tmp_path):
+    c = catalog(tmp_path, {"name": "Sutures", "site_id": None, "aliases": []})
+    changed = c.harvest([{"id": "4157", "text": "Suture"}, {"id": "9", "text": "Suture Kit"}], query="Sutures")
+    assert changed
+    assert c.lookup("Sutures") == c.lookup("Suture")
+    assert c.lookup("Sutures")["site_id"] == "4157"
+    assert c.missing_ids() == []
+
+    c.save()
+    reloaded = CategoryCatalog(c.path)
+    assert reloaded.lookup("suture kit")["site_id"] == "9"
+    assert not reloaded.harvest([{"id": "9", "text": "Suture Kit"}])
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from service.contract_schema import OUTPUT_COLUMNS, parse_datetime, parse_number, typed_row
+
+SCRAPED = {
+    "serial_no": "3", "category_name": " Sutures ", "bid_no": "GEMC-511687710653203",
+    "ordered_quantity": "1,200", "price": "198000.000", "total_value": "N/A",
+    "contract_date": "07/1/2026 14:12", "state": "-",
+}
+
+
+def test_numbers_drop_separators_and_units():
+    assert parse_number("54,000.000") == 54000.0
+    assert parse_number("₹ 1,500.50 INR") == 1500.5
+    assert parse_number("na") is None
+    assert parse_number(7) == 7
+
+
+def test_dates_are_day_first():
+    assert parse_datetime("07/1/2026 14:12") == datetime(2026, 1, 7, 14, 12)
+    assert parse_datetime("07-Jan-2026") == datetime(2026, 1, 7)
+    assert parse_datetime("2026-01-07T14:12:00") == datetime(2026, 1, 7, 14, 12)
+    assert parse_datetime("soon") is None
+
+
+def test_typed_row_converts_every_column():
+    row = typed_row(SCRAPED)
+    assert list(row) == OUTPUT_COLUMNS
+    assert row["serial_no"] == 3 and row["ordered_quantity"] == 1200.0 and row["price"] == 198000.0
+    assert row["category_name"] == "Sutures"
+    assert row["contract_date"] == datetime(2026, 1, 7, 14, 12)
+    # Missing markers and absent columns both become None
+    assert row["total_value"] is None and row["state"] is None and row["brand"] is None
+
+
+def test_typed_row_is_idempotent():
+    row = typed_row(SCRAPED)
+    assert typed_row(row) == row
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+# The daemon imports the browser manager and the controllers (OCR solver modules)
+pytest.importorskip("playwright")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+
+from controller import crawl_daemon
+from controller.crawl_daemon import CrawlDaemon
+from service.work_queue import WorkQueue
+
+
+class Page:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class Context:
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "close"
+        self.handlers.append(handler)
+
+    def close(self):
+        for handler in self.handlers:
+            handler(self)
+
+
+class PersistentManager:
+    """PlaywrightManager with a persistent context: no Browser object"""
+    started = 0
+
+    def __init__(self, **kwargs):
+        self.browser = None
+        self.context = Context()
+        self.page = Page()
+
+    def start(self, open_home=True):
+        PersistentManager.started += 1
+
+    def stop(self):
+        pass
+
+
+class Contracts:
+    def __init__(self, browser, sessions=None):
+        self.browser = browser
+        self.page = browser.page
+        self.error = None
+        self.crash = False
+
+    def crawl_category(self, category):
+        if self.crash:
+            self.browser.context.close()
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_daemon.config, "SESSION_POOL_SIZE", 0)
+    monkeypatch.setattr(crawl_daemon, "PlaywrightManager", PersistentManager)
+    monkeypatch.setattr(crawl_daemon, "ContractsController", Contracts)
+    monkeypatch.setattr(PersistentManager, "started", 0)
+    queue = WorkQueue(tmp_path / "work_queue.sqlite")
+    queue.enqueue("sutures")
+    return CrawlDaemon(work_queue=queue, name="test")
+
+
+def test_persistent_context_is_alive_without_a_browser_object(daemon):
+    daemon._ensure_browser()
+    daemon._ensure_browser()
+    assert daemon._browser_alive()
+    assert PersistentManager.started == 1 and daemon.restarts == 0
+
+
+def test_ordinary_error_fails_the_job(daemon):
+    daemon._ensure_browser()
+    daemon.contracts.error = Exception("Main captcha failed")
+    assert daemon.process(daemon.queue.lease(daemon.owner)) == "failed"
+    assert daemon.restarts == 0
+
+
+def test_closed_context_is_a_crash(daemon):
+    daemon._ensure_browser()
+    daemon.contracts.error = Exception("Something went wrong")
+    daemon.contracts.crash = True
+    assert daemon.process(daemon.queue.lease(daemon.owner)) == "released"
+    assert daemon.restarts == 1 and daemon._browser_alive()
@@ -0,0 +1,50 @@
+import sqlite3
+from datetime import date, datetime
+
+from service.crawl_state import CrawlState
+
+
+def day(n):
+    return datetime(2026, 1, n)
+
+
+def test_file_state_uses_wal(tmp_path):
+    state = CrawlState(tmp_path / "crawl_state.sqlite")
+    state.close()
+    with sqlite3.connect(tmp_path / "crawl_state.sqlite") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_next_window_resumes_on_the_last_complete_day():
+    state = CrawlState(":memory:")
+    assert state.next_window("sutures", today=day(20), initial_days=10) == (day(10), day(20))
+
+    state.finish_window("sutures", day(10), day(15), rows=4, complete=True)
+    state.finish_window("sutures", day(15), day(18), rows=2, complete=False)
+    assert state.last_crawled("sutures") == day(15)
+    assert state.next_window("sutures", today=day(20)) == (day(15), day(20))
+
+    state.finish_window("sutures", day(15), day(20), rows=0)
+    assert state.next_window("sutures", today=day(20)) is None
+    assert state.next_window("sutures", today=day(20), since=date(2026, 1, 1)) == (day(1), day(20))
+
+
+def test_seen_bids_and_density():
+    state = CrawlState(":memory:")
+    state.mark_seen("GEMC-1", "sutures", "07/1/2026 14:12")
+    state.mark_seen("GEMC-1", "sutures")
+    assert state.seen(["GEMC-1", "GEMC-2", ""]) == {"GEMC-1"}
+    assert state.summary()["seen_bids"] == 1
+
+    assert state.density("sutures") is None
+    state.record_density("sutures", 10.0)
+    state.record_density("sutures", 20.0)
+    assert state.density("sutures") == 13.0
+
+
+def test_import_csv_seeds_seen_bids(tmp_path):
+    path = tmp_path / "contracts_merged.csv"
+    path.write_text("bid_no,category_name,contract_date\nGEMC-1,sutures,07/1/2026\n,sutures,\n", encoding="utf-8")
+    state = CrawlState(":memory:")
+    assert state.import_csv(path) == 1
+    assert state.seen(["GEMC-1"]) == {"GEMC-1"}
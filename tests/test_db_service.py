@@ -0,0 +1,110 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from service.contract_schema import OUTPUT_COLUMNS
+from service.db_service import DatabaseService
+
+
+def database(tmp_path, **kwargs):
+    db = DatabaseService("sqlite", path=tmp_path / "contracts.sqlite", **kwargs)
+    db.create_table()
+    return db
+
+
+def row(bid_no, price="198000.000"):
+    return {"serial_no": "1", "category_name": "Sutures", "bid_no": bid_no, "price": price,
+            "contract_date": "07/1/2026 14:12"}
+
+
+class CountingConnection:
+    """sqlite3 connection that records the size of every executemany batch"""
+
+    def __init__(self, conn, batches):
+        self.conn = conn
+        self.batches = batches
+
+    def cursor(self):
+        cursor = self.conn.cursor()
+        batches = self.batches
+
+        class Cursor:
+            def executemany(self, sql, params):
+                batches.append(len(params))
+                return cursor.executemany(sql, params)
+
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+
+        return Cursor()
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def test_create_table_keys_on_bid_no(tmp_path):
+    database(tmp_path).close()
+    database(tmp_path).close()  # idempotent
+
+    with sqlite3.connect(tmp_path / "contracts.sqlite") as conn:
+        columns = [r[1] for r in conn.execute("PRAGMA table_info(contracts)")]
+        unique = [r[1] for r in conn.execute("PRAGMA index_list(contracts)") if r[2]]
+        keyed = [conn.execute(f"PRAGMA index_info({name})").fetchone()[2] for name in unique]
+    assert columns == OUTPUT_COLUMNS + ["updated_at"]
+    assert keyed == ["bid_no"]
+
+
+def test_upsert_updates_instead_of_duplicating(tmp_path):
+    db = database(tmp_path)
+    assert db.upsert_many([row("GEMC-1"), {"bid_no": ""}]) == 1
+    assert db.upsert_many([row("GEMC-1", price="1,500.50")]) == 1
+    assert db.count() == 1
+
+    with db.pool.connection() as conn:
+        price, date = conn.execute("SELECT price, contract_date FROM contracts").fetchone()
+    assert price == 1500.5 and date == "2026-01-07 14:12:00"
+    db.close()
+
+
+def test_upsert_runs_in_batches(tmp_path):
+    database(tmp_path).close()
+    db = DatabaseService("sqlite", path=tmp_path / "contracts.sqlite", batch_size=2)
+    batches = []
+    db.pool._connect = lambda: CountingConnection(db.dialect.connect(), batches)
+
+    assert db.upsert_many([row(f"GEMC-{n}") for n in range(5)]) == 5
+    assert batches == [2, 2, 1]
+    assert db.count() == 5
+    db.close()
+
+
+def test_flushed_rows_reach_the_database(tmp_path, monkeypatch):
+    # The controllers import the OCR solver modules
+    pytest.importorskip("numpy")
+    pytest.importorskip("cv2")
+    pytest.importorskip("PIL")
+
+    import config
+    from controller import contracts_controller
+    from service.category_catalog import CategoryCatalog
+    from service.crawl_state import CrawlState
+
+    db = DatabaseService("sqlite", path=tmp_path / "contracts.sqlite")
+    monkeypatch.setattr(config, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(contracts_controller, "DatabaseService", lambda backend: db)
+    monkeypatch.setattr(contracts_controller, "_SINK", None)
+    monkeypatch.setattr(contracts_controller.ContractsController, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(contracts_controller, "default_catalog", lambda: CategoryCatalog(tmp_path / "catalog.json"))
+
+    state = CrawlState(":memory:")
+    controller = contracts_controller.ContractsController(SimpleNamespace(page=None), state=state)
+    card = {col: "" for col in OUTPUT_COLUMNS}
+    card["bid_no"] = "GEMC-1"
+    controller._append_row(controller._build_row(1, "Sutures", card, "https://gem/link"))
+    assert db.count() == 0  # buffered until the sink flushes
+
+    controller._checkpoint()
+    assert db.count() == 1
+    assert state.seen(["GEMC-1"]) == {"GEMC-1"}
+    controller.sink.close()
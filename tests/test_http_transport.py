@@ -0,0 +1,98 @@
+import csv
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("requests")
+# The controllers import the OCR solver modules
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+
+import config
+from controller import contracts_controller
+from controller.http_contracts_controller import HttpContractsController
+from service.category_catalog import CategoryCatalog
+from service.crawl_state import CrawlState
+from service.http_transport import GemHttpTransport, parse_cards
+from service.rate_limiter import AdaptiveRateLimiter
+from tools.gem_stub_server import serve
+
+FIXTURES = Path(__file__).parent / "fixtures" / "gem_stub"
+BIDS = ["GEMC-511687710653203", "GEMC-511687710653999"]
+
+
+@pytest.fixture
+def stub():
+    server = serve(FIXTURES, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def contracts(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_BACKEND", None)
+    monkeypatch.setattr(contracts_controller, "_SINK", None)
+    monkeypatch.setattr(contracts_controller.ContractsController, "OUTPUT_DIR", tmp_path)
+
+    catalog = CategoryCatalog(tmp_path / "category_catalog.json")
+    catalog.add("sutures", site_id="4157")
+    monkeypatch.setattr(contracts_controller, "default_catalog", lambda: catalog)
+
+    limiter = AdaptiveRateLimiter(rate=100, max_rate=100, burst=100)
+    transport = GemHttpTransport(base_url=f"http://127.0.0.1:{stub.server_port}/", limiter=limiter)
+    controller = HttpContractsController(
+        SimpleNamespace(page=None), transport=transport, state=CrawlState(":memory:"), limiter=limiter
+    )
+    # OCR is not under test: every captcha reads as the same confident guess
+    monkeypatch.setattr(controller, "_solve", lambda img_bytes, kind: ("ab12c", 0.99, None))
+    yield controller
+    controller.sink.close()
+    transport.close()
+
+
+def test_parse_cards_sample():
+    cards = parse_cards((FIXTURES / "view_contracts__contract_search.html").read_text(encoding="utf-8"))
+    assert [c["bid_no"] for c in cards] == BIDS
+    assert cards[0]["brand"] == "NETGUT"
+    assert cards[1]["price"] == "1500.000"
+    assert cards[1]["office_zone"] == "AIIMS New Delhi"
+
+
+def test_crawl_category_against_stub(contracts, stub, tmp_path):
+    contracts.crawl_category("sutures")
+
+    with open(tmp_path / "contracts_merged.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["bid_no"] for r in rows] == BIDS
+    assert all(r["download_link"].endswith("orderId=STUBSAMPLE") for r in rows)
+
+    searches = [form for path, form in stub.posted if path.endswith("contract_search")]
+    assert len(searches) == 1
+    assert searches[0][config.HTTP_FIELDS["category"]] == "4157"  # site id, not the name
+    assert searches[0][config.HTTP_FIELDS["csrf"]] == "stub-csrf-token"
+    assert searches[0][config.HTTP_FIELDS["search_captcha"]] == "ab12c"
+
+    orders = [form[config.HTTP_FIELDS["order"]] for path, form in stub.posted if path.endswith("order_details")]
+    assert orders == BIDS
+
+
+def test_search_needs_a_site_id(contracts):
+    with pytest.raises(Exception, match="No site id"):
+        contracts.search("unknown category")
+
+
+def test_rejected_order_captcha_is_retried_then_requeued(contracts, monkeypatch):
+    answers = iter([None, None, "https://stub/link"])
+    monkeypatch.setattr(contracts.transport, "download_link", lambda bid_no, text: next(answers, None))
+    assert contracts.fetch_download_link(BIDS[0], max_attempts=2) is None
+    assert contracts.fetch_download_link(BIDS[0], max_attempts=2) == "https://stub/link"
+
+    # Every attempt of every round fails: the row is given up after ROW_RETRY_ROUNDS
+    monkeypatch.setattr(contracts, "fetch_download_link", lambda bid_no: None)
+    contracts.process_rows("sutures", [{"bid_no": BIDS[0]}])
+    assert contracts.failed_rows == [("sutures", BIDS[0])]
@@ -0,0 +1,138 @@
+import csv
+import json
+import sqlite3
+
+from service.contract_schema import OUTPUT_COLUMNS
+from service.output_sink import BatchedWriter, CsvBackend, JsonlBackend, SqliteBackend, merge_shards
+
+COLUMNS = ["bid_no", "total"]
+
+
+class FlakyBackend:
+    """Fails the first `failures` writes, then stores rows in memory"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.rows = []
+        self.syncs = 0
+
+    def write(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.rows.extend(rows)
+
+    def sync(self):
+        self.syncs += 1
+
+    def close(self):
+        pass
+
+
+def writer(backend, **kwargs):
+    kwargs.setdefault("batch_size", 100)
+    kwargs.setdefault("flush_interval", 60)
+    return BatchedWriter(backend, **kwargs)
+
+
+def test_checkpoint_makes_queued_rows_durable():
+    backend = FlakyBackend()
+    w = writer(backend)
+    flushed = []
+    w.on_flush(flushed.extend)
+    w.put({"bid_no": "A"})
+    w.put({"bid_no": "B"})
+    assert w.checkpoint(timeout=5)
+    assert [r["bid_no"] for r in backend.rows] == ["A", "B"]
+    assert flushed == backend.rows and backend.syncs == 1
+    w.close()
+
+
+def test_full_batch_is_written_without_a_checkpoint():
+    backend = FlakyBackend()
+    w = writer(backend, batch_size=2)
+    flushed = []
+    w.on_flush(flushed.append)
+    for bid in "ABC":
+        w.put({"bid_no": bid})
+    w.checkpoint(timeout=5)
+    assert [len(batch) for batch in flushed] == [2, 1]
+    w.close()
+
+
+def test_failed_write_fails_the_checkpoint_and_keeps_the_rows():
+    backend = FlakyBackend(failures=1)
+    w = writer(backend)
+    flushed = []
+    w.on_flush(flushed.extend)
+    w.put({"bid_no": "A"})
+    assert not w.checkpoint(timeout=5)
+    assert isinstance(w.error, OSError)
+    # Nothing counts as written (or seen) until the backend took the rows
+    assert backend.rows == [] and flushed == [] and backend.syncs == 0
+
+    assert w.checkpoint(timeout=5)
+    assert [r["bid_no"] for r in backend.rows] == ["A"] and w.error is None
+    assert flushed == backend.rows
+    w.close()
+
+
+def test_failed_sync_fails_the_checkpoint():
+    backend = FlakyBackend()
+    backend.sync = lambda: (_ for _ in ()).throw(OSError("fsync failed"))
+    w = writer(backend)
+    w.put({"bid_no": "A"})
+    assert not w.checkpoint(timeout=5)
+    w.close()
+
+
+def test_csv_and_jsonl_backends_append_across_runs(tmp_path):
+    for backend_cls, read in (
+        (CsvBackend, lambda p: [r["bid_no"] for r in csv.DictReader(open(p, encoding="utf-8"))]),
+        (JsonlBackend, lambda p: [json.loads(line)["bid_no"] for line in open(p, encoding="utf-8")]),
+    ):
+        path = tmp_path / f"out{backend_cls.suffix}"
+        for bid in ("A", "B"):
+            w = writer(backend_cls(path, COLUMNS))
+            w.put({"bid_no": bid, "total": "1"})
+            w.close()
+        assert read(path) == ["A", "B"]
+
+
+def test_merge_shards_skips_known_bids(tmp_path):
+    for name, bids in (("contracts_merged", "A"), ("shard-0", "AB"), ("shard-1", "BC")):
+        w = writer(CsvBackend(tmp_path / f"{name}.csv", COLUMNS))
+        for bid in bids:
+            w.put({"bid_no": bid, "total": "1"})
+        w.close()
+
+    assert merge_shards(tmp_path, ["shard-0", "shard-1"], COLUMNS, fmt="csv") == 2
+    with open(tmp_path / "contracts_merged.csv", encoding="utf-8") as f:
+        assert [r["bid_no"] for r in csv.DictReader(f)] == ["A", "B", "C"]
+    assert not (tmp_path / "shard-0.csv").exists()
+
+
+def test_merge_sqlite_shards(tmp_path):
+    for name, bids in (("shard-0", "AB"), ("shard-1", "BC")):
+        w = writer(SqliteBackend(tmp_path / f"{name}.sqlite", COLUMNS))
+        for bid in bids:
+            w.put({"bid_no": bid, "total": 1})
+        w.close()
+
+    assert merge_shards(tmp_path, ["shard-0", "shard-1"], COLUMNS, fmt="sqlite") == 3
+    with sqlite3.connect(tmp_path / "contracts_merged.sqlite") as conn:
+        assert sorted(r[0] for r in conn.execute("SELECT bid_no FROM contracts")) == ["A", "B", "C"]
+
+
+def test_csv_keeps_scraped_strings_while_sqlite_stores_types(tmp_path):
+    row = {"bid_no": "GEMC-1", "price": "54,000.000", "contract_date": "07/1/2026 14:12"}
+    for backend_cls in (CsvBackend, SqliteBackend):
+        w = writer(backend_cls(tmp_path / f"out{backend_cls.suffix}", OUTPUT_COLUMNS))
+        w.put(dict(row))
+        w.close()
+
+    with open(tmp_path / "out.csv", newline="", encoding="utf-8") as f:
+        written = next(csv.DictReader(f))
+    assert written["price"] == "54,000.000" and written["contract_date"] == "07/1/2026 14:12"
+    with sqlite3.connect(tmp_path / "out.sqlite") as conn:
+        assert conn.execute("SELECT price, contract_date FROM contracts").fetchone() == (54000.0, "2026-01-07 14:12:00")
@@ -0,0 +1,102 @@
+import config
+from solver import captcha_corpus
+from solver.pass_stats import PassStats, image_hash
+
+RESULTS = {"otsu/psm7": "ab12c", "adaptive/psm8": "ab12c", "raw/psm6": "ab1zc", "clean/psm13": ""}
+
+
+def stats(tmp_path, **kwargs):
+    return PassStats(tmp_path / "pass_stats.sqlite", **kwargs)
+
+
+def test_nothing_is_scored_before_the_verdict(tmp_path):
+    s = stats(tmp_path)
+    s.remember("img", RESULTS, "ab12c")
+    assert s.counts == {}
+
+
+def test_accepted_answer_scores_every_pass(tmp_path):
+    s = stats(tmp_path)
+    s.remember("img", RESULTS, "ab12c")
+    assert s.record_outcome("img", accepted=True)
+    assert s.counts == {
+        "otsu/psm7": (1, 1), "adaptive/psm8": (1, 1), "raw/psm6": (0, 1), "clean/psm13": (0, 1),
+    }
+    assert s.rank(RESULTS)[:2] == ["otsu/psm7", "adaptive/psm8"]
+
+
+def test_agreeing_with_a_rejected_answer_is_a_miss(tmp_path):
+    s = stats(tmp_path)
+    s.remember("img", RESULTS, "ab12c")
+    s.record_outcome("img", accepted=False)
+    # Only the passes behind the rejected answer learn something
+    assert s.counts == {"otsu/psm7": (0, 1), "adaptive/psm8": (0, 1)}
+    assert s.rank(RESULTS)[-2:] == ["otsu/psm7", "adaptive/psm8"]
+
+
+def test_majority_alone_does_not_promote_passes(tmp_path):
+    s = stats(tmp_path)
+    for n in range(5):
+        s.remember(f"img{n}", RESULTS, "ab12c")
+        s.record_outcome(f"img{n}", accepted=False)
+    assert s.hit_rate("otsu/psm7") < s.hit_rate("raw/psm6")
+
+
+def test_outcome_is_applied_once_and_unknown_images_are_ignored(tmp_path):
+    s = stats(tmp_path)
+    s.remember("img", RESULTS, "ab12c")
+    assert s.record_outcome("img", accepted=True)
+    assert not s.record_outcome("img", accepted=True)
+    assert not s.record_outcome("other", accepted=True)
+    assert s.counts["otsu/psm7"] == (1, 1)
+
+
+def test_empty_answers_are_not_remembered(tmp_path):
+    s = stats(tmp_path)
+    s.remember("img", {"raw/psm6": ""}, "")
+    assert not s.record_outcome("img", accepted=False)
+
+
+def test_pending_solves_are_bounded(tmp_path):
+    s = stats(tmp_path, max_pending=2)
+    for n in range(3):
+        s.remember(f"img{n}", RESULTS, "ab12c")
+    assert not s.record_outcome("img0", accepted=True)
+    assert s.record_outcome("img2", accepted=True)
+
+
+def test_counts_survive_save_and_load(tmp_path):
+    s = stats(tmp_path)
+    s.remember("img", RESULTS, "ab12c")
+    s.record_outcome("img", accepted=True)
+    s.save()
+    assert {k: tuple(v) for k, v in stats(tmp_path).counts.items()} == s.counts
+
+
+def test_processes_add_up_instead_of_overwriting(tmp_path):
+    # Two shards scoring against the same file
+    a, b = stats(tmp_path), stats(tmp_path)
+    a.update(RESULTS, "ab12c", accepted=True)
+    b.update(RESULTS, "ab12c", accepted=True)
+    a.save()
+    b.save()
+    assert b.counts["otsu/psm7"] == (2, 2)
+    assert stats(tmp_path).counts["raw/psm6"] == (0, 2)
+
+
+def test_json_counts_are_imported_once(tmp_path):
+    (tmp_path / "pass_stats.json").write_text('{"otsu/psm7": [3, 4]}', encoding="utf-8")
+    assert stats(tmp_path).counts == {"otsu/psm7": (3, 4)}
+    assert stats(tmp_path).counts == {"otsu/psm7": (3, 4)}
+
+
+def test_corpus_outcome_feeds_the_pass_ranking(tmp_path, monkeypatch):
+    s = stats(tmp_path)
+    monkeypatch.setattr(captcha_corpus, "PASS_STATS", s)
+    monkeypatch.setattr(config, "CAPTURE_CAPTCHAS", False)
+
+    image = b"captcha image bytes"
+    s.remember(image_hash(image), RESULTS, "ab12c")
+    sha1 = captcha_corpus.capture(image, "search", "ab12c", 0.9)
+    captcha_corpus.record_outcome(sha1, True)
+    assert s.counts["otsu/psm7"] == (1, 1)
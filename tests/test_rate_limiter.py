@@ -0,0 +1,87 @@
+import pytest
+
+from service.rate_limiter import AdaptiveRateLimiter, PortalThrottled, classify
+
+
+class HttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = type("Response", (), {"status_code": status})()
+
+
+def limiter(**kwargs):
+    kwargs = {"rate": 1.0, "min_rate": 0.1, "max_rate": 4.0, "burst": 2, "increase": 0.1, "decrease": 0.5,
+              "latency_target": 2.0, "throttle_pause": 30.0, **kwargs}
+    return AdaptiveRateLimiter(**kwargs)
+
+
+def test_classify():
+    assert classify(PortalThrottled("error page")) == "throttled"
+    assert classify(HttpError(429)) == "throttled"
+    assert classify(Exception("403 Access Denied")) == "throttled"
+    assert classify(TimeoutError("navigation")) == "timeout"
+    assert classify(Exception("Timeout 30000ms exceeded")) == "timeout"
+    assert classify(HttpError(500)) == "error"
+
+
+def test_healthy_requests_raise_the_rate_additively():
+    r = limiter()
+    r.record("ok", latency=0.5)
+    assert r.rate == pytest.approx(1.1)
+    for _ in range(100):
+        r.record("ok", latency=0.5)
+    assert r.rate == 4.0
+
+
+def test_slow_answers_hold_or_count_as_congestion():
+    r = limiter()
+    assert r.record("ok", latency=3.0) == "slow"
+    assert r.rate == 1.0
+    assert r.record("ok", latency=5.0) == "timeout"
+    assert r.rate == 0.5
+
+
+def test_a_burst_of_failures_decreases_once():
+    r = limiter()
+    for _ in range(5):
+        r.record("error")
+    assert r.rate == 0.5
+    r._hold_until = 0.0
+    r.record("timeout")
+    assert r.rate == 0.25
+
+
+def test_rejected_captcha_holds_the_rate():
+    r = limiter()
+    r.record("rejected", latency=0.5)
+    assert r.rate == 1.0
+
+
+def test_throttling_pauses_everyone_and_doubles():
+    r = limiter()
+    r.record("throttled")
+    assert 29 < r.backpressure() <= 30
+    assert r._reserve(1.0) > 29  # no token while paused
+    r._hold_until = 0.0
+    r.record("throttled")
+    assert 59 < r.backpressure() <= 60
+    assert r.rate == 0.25
+
+
+def test_backpressure_persists_at_the_floor_after_the_pause():
+    r = limiter(rate=0.1)
+    r.record("throttled")
+    r._pause_until = 0.0
+    assert r.backpressure() == 30.0
+    r.record("ok", latency=0.1)
+    assert r.backpressure() == 0.0
+
+
+def test_request_classifies_exceptions():
+    r = limiter(rate=4.0, burst=4)
+    with r.request("search") as portal:
+        portal["outcome"] = "rejected"
+    with pytest.raises(HttpError):
+        with r.request("search"):
+            raise HttpError(503)
+    assert r.counts["rejected"] == 1 and r.counts["throttled"] == 1
@@ -0,0 +1,110 @@
+import asyncio
+
+from controller.results_walker import MORE_LOADED_JS, NEXT_CONTROL_JS, SCROLL_JS, AsyncResultsWalker, ResultsWalker
+from controller.row_extractor import EXTRACT_CARDS_JS
+
+
+class LoadMorePage:
+    """Result list that appends one batch per "load more" click"""
+
+    def __init__(self, batches, endless=False, broken=False):
+        self.batches = batches
+        self.endless = endless
+        self.broken = broken
+        self.loaded = 1
+
+    def cards(self):
+        count = sum(self.batches[:self.loaded])
+        return [{"bid_no": f"GEMC-{n}"} for n in range(count)]
+
+    def evaluate(self, js, arg=None):
+        if js == NEXT_CONTROL_JS:
+            more = self.endless or self.loaded < len(self.batches)
+            return {"mode": "more", "selector": "#more"} if more else None
+        if js == EXTRACT_CARDS_JS:
+            return self.cards()
+        assert js == SCROLL_JS
+        return False  # the list fits the viewport
+
+    def click(self, selector):
+        if self.broken:
+            raise Exception("Element is not attached to the DOM")
+        if self.endless:
+            self.batches.append(10)
+        self.loaded += 1
+
+
+class Waits:
+    def __init__(self, page):
+        self.page = page
+        self.calls = 0
+
+    def condition(self, step, js, budget_ms, arg=None, fallback_ms=None):
+        assert js == MORE_LOADED_JS
+        self.calls += 1
+        return len(self.page.cards()) > arg
+
+
+def walk(page, **kwargs):
+    walker = ResultsWalker(page, Waits(page), cap=100, **kwargs)
+    handed_out = [len(p.rows) for p in walker.pages()]
+    return walker, handed_out
+
+
+def test_every_batch_is_handed_out_once():
+    walker, handed_out = walk(LoadMorePage([30, 30, 10]))
+    assert handed_out == [30, 30, 10]
+    assert walker.listed == 70 and not walker.truncated
+
+
+def test_more_than_the_cap_across_pages_is_not_truncated():
+    walker, _ = walk(LoadMorePage([60, 60, 30]))
+    assert walker.listed == 150 and not walker.truncated
+
+
+def test_listing_ending_at_the_cap_is_truncated():
+    walker, _ = walk(LoadMorePage([50, 50]))
+    assert walker.listed == 100 and walker.truncated
+
+
+def test_stopping_at_max_pages_is_truncated():
+    walker, handed_out = walk(LoadMorePage([10], endless=True), max_pages=3)
+    assert handed_out == [10, 10, 10]
+    assert walker.truncated
+
+
+def test_failed_click_ends_after_the_batch():
+    walker, handed_out = walk(LoadMorePage([30, 30], broken=True))
+    assert handed_out == [30]
+    assert walker.listed == 30 and not walker.truncated
+
+
+def test_no_control_and_no_scroll_ends_without_waiting():
+    page = LoadMorePage([20])
+    waits = Waits(page)
+    walker = ResultsWalker(page, waits, cap=100)
+    assert [len(p.rows) for p in walker.pages()] == [20]
+    assert waits.calls == 0
+
+
+class AsyncLoadMorePage(LoadMorePage):
+    async def evaluate(self, js, arg=None):
+        return LoadMorePage.evaluate(self, js, arg)
+
+    async def click(self, selector):
+        LoadMorePage.click(self, selector)
+
+
+class AsyncWaits(Waits):
+    async def condition(self, step, js, budget_ms, arg=None, fallback_ms=None):
+        return Waits.condition(self, step, js, budget_ms, arg, fallback_ms)
+
+
+def test_async_walker_matches_the_sync_one():
+    async def walk_async(page):
+        walker = AsyncResultsWalker(page, AsyncWaits(page), cap=100)
+        return walker, [len(p.rows) async for p in walker.pages()]
+
+    walker, handed_out = asyncio.run(walk_async(AsyncLoadMorePage([50, 30, 20])))
+    assert handed_out == [50, 30, 20]
+    assert walker.listed == 100 and walker.truncated
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from service.crawl_state import CrawlState
+from service.window_planner import WindowPlanner, window_days
+
+
+def planner(**kwargs):
+    kwargs.setdefault("cap", 100)
+    kwargs.setdefault("fill", 0.5)
+    kwargs.setdefault("max_days", 31)
+    return WindowPlanner(CrawlState(":memory:"), **kwargs)
+
+
+def day(n):
+    return datetime(2026, 1, n)
+
+
+def test_unknown_density_plans_the_widest_windows():
+    windows = planner(max_days=10).plan("sutures", day(1), day(25))
+    assert windows == [(day(1), day(10)), (day(11), day(20)), (day(21), day(25))]
+
+
+def test_density_sizes_windows_to_the_target_fill():
+    p = planner()
+    p.state.record_density("sutures", 10.0)
+    # 50 expected results per window at 10 a day
+    assert {window_days(w) for w in p.plan("sutures", day(1), day(20))} == {5}
+
+
+def test_only_a_truncated_listing_splits():
+    p = planner()
+    week = (day(1), day(7))
+    assert not p.should_split(week, truncated=False)
+    assert p.should_split(week, truncated=True)
+    assert not p.should_split((day(3), day(3)), truncated=True)
+
+
+def test_split_covers_the_window_without_overlap():
+    p = planner()
+    assert p.split((day(1), day(7))) == [(day(1), day(3)), (day(4), day(7))]
+    assert p.split((day(1), day(2))) == [(day(1), day(1)), (day(2), day(2))]
+
+
+def test_merge_pending_while_expected_results_fit():
+    p = planner()
+    p.state.record_density("sutures", 5.0)
+    pending = [(day(1), day(3)), (day(4), day(6)), (day(7), day(9)), (day(10), day(30))]
+    assert p.merge_pending("sutures", pending) == 2
+    assert pending == [(day(1), day(9)), (day(10), day(30))]
+
+
+def test_observe_learns_only_from_complete_listings():
+    p = planner()
+    p.observe("sutures", (day(1), day(10)), 100, truncated=True)
+    assert p.state.density("sutures") is None
+    # More than the cap across pages is still a real count
+    p.observe("sutures", (day(1), day(10)), 150, truncated=False)
+    assert p.state.density("sutures") == 15.0
@@ -0,0 +1,78 @@
+import sqlite3
+
+from service.work_queue import WorkQueue
+
+
+def queue(tmp_path, **kwargs):
+    return WorkQueue(tmp_path / "work_queue.sqlite", **kwargs)
+
+
+def test_file_queue_uses_wal(tmp_path):
+    queue(tmp_path).close()
+    with sqlite3.connect(tmp_path / "work_queue.sqlite") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_lease_prefers_own_shard_then_priority(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("gloves", priority=1, shard=0)
+    q.enqueue("sutures", priority=5, shard=1)
+    q.enqueue("masks", priority=9, shard=1)
+    assert q.lease("a", shard=0).category == "gloves"
+    assert q.lease("a", shard=0).category == "masks"  # own shard empty: steal
+    assert q.lease("b").category == "sutures"
+    assert q.lease("b") is None
+    assert q.summary() == {"leased": 3}
+
+
+def test_renew_only_for_the_lease_holder(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("sutures")
+    q.lease("a")
+    assert q.renew("sutures", "a")
+    assert not q.renew("sutures", "b")
+
+
+def test_expired_lease_is_leased_again(tmp_path):
+    q = queue(tmp_path, lease_seconds=-1)
+    q.enqueue("sutures")
+    q.lease("a")
+    assert q.lease("b").category == "sutures"
+    assert not q.renew("sutures", "a")
+
+
+def test_failure_is_retried_after_a_backoff(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("sutures")
+    q.lease("a")
+    status, delay = q.fail("sutures", "boom", base=60)
+    assert status == "queued" and 48 <= delay <= 72
+    assert q.lease("a") is None and q.next_ready_in() > 40
+
+
+def test_last_attempt_parks_the_category_until_the_next_cycle(tmp_path):
+    q = queue(tmp_path, max_attempts=2)
+    q.enqueue("sutures")
+    for outcome in ("queued", "dead"):
+        q.lease("a")
+        assert q.fail("sutures", "boom", base=0)[0] == outcome
+    assert not q.pending()
+
+    q.enqueue("sutures")
+    assert q.lease("a").attempts == 0
+
+
+def test_release_gives_leases_back_without_an_attempt(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("gloves")
+    q.enqueue("sutures")
+    assert q.lease("a").category == "gloves"
+    assert q.lease("old-run").category == "sutures"
+
+    q.release("gloves")
+    assert q.release_owner("old-run") == 1
+    assert q.summary() == {"queued": 2}
+    assert q.lease("a").attempts == 0
+
+    q.complete("gloves")
+    assert q.pending() == 1 and q.summary() == {"done": 1, "queued": 1}
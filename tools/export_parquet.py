@@ -0,0 +1,125 @@
+"""
+Export / compact scraped contracts into a partitioned Parquet dataset.
+
+    python -m tools.export_parquet [--input data/scrapped/contracts_merged.csv]
+                                   [--out data/parquet/contracts]
+
+Input may be the merged CSV, a .jsonl / .sqlite sink file, or a directory
+of Parquet part files written by the parquet sink. Rows are converted with
+service/contract_schema.py (old string-only CSV rows included), deduplicated
+on bid_no (last one wins) and written hive-style as
+
+    contract_month=2026-01/category_name=sutures/part-0.parquet
+
+with state, buying_mode, order_status (and the other "category" columns)
+dictionary-encoded. Partitions present in the input are rewritten, others
+are left alone, so re-running after each crawl compacts the new rows.
+
+Reading a slice only touches the matching partitions and columns:
+
+    pq.read_table("data/parquet/contracts", columns=["bid_no", "total_value"],
+                  filters=[("contract_month", "=", "2026-01"), ("category_name", "=", "sutures")])
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from service.contract_schema import OUTPUT_COLUMNS, arrow_schema, dictionary_columns, typed_row
+
+BASE_PATH = Path(__file__).resolve().parents[1]
+DEFAULT_INPUT = BASE_PATH / "data" / "scrapped" / "contracts_merged.csv"
+DEFAULT_OUT = BASE_PATH / "data" / "parquet" / "contracts"
+PARTITION_COLS = ["contract_month", "category_name"]
+
+
+# --------------------------------------------------
+# INPUT
+# --------------------------------------------------
+def read_rows(path):
+    path = Path(path)
+    if path.is_dir():
+        return pq.read_table(path).to_pylist()
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if path.suffix == ".sqlite":
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(r) for r in conn.execute("SELECT * FROM contracts")]
+        finally:
+            conn.close()
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def to_table(rows):
+    """Typed, bid_no-deduplicated Arrow table with the partition column added"""
+    latest = {}
+    for raw in rows:
+        row = typed_row(raw)
+        key = row["bid_no"] or id(raw)
+        date = row["contract_date"]
+        row["contract_month"] = date.strftime("%Y-%m") if date else "unknown"
+        latest[key] = row
+
+    schema = arrow_schema(pa, extra=[("contract_month", pa.string())])
+    return pa.Table.from_pylist(list(latest.values()), schema=schema)
+
+
+# --------------------------------------------------
+# OUTPUT
+# --------------------------------------------------
+def write_dataset(table, out):
+    # Partition values live in the directory names; the other categorical
+    # columns stay dictionary-encoded inside the files
+    ds.write_dataset(
+        table,
+        out,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([(c, pa.string()) for c in PARTITION_COLS]), flavor="hive"
+        ),
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression="zstd",
+            use_dictionary=[c for c in dictionary_columns() if c not in PARTITION_COLS],
+        ),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=str(DEFAULT_INPUT), help="merged CSV, .jsonl, .sqlite or parquet part dir")
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="dataset root")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = read_rows(args.input)
+    table = to_table(rows)
+
+    # Partition columns are plain strings in the directory names
+    for name in PARTITION_COLS:
+        i = table.schema.get_field_index(name)
+        table = table.set_column(i, name, table.column(name).cast(pa.string()))
+
+    write_dataset(table, args.out)
+
+    partitions = len({(r["contract_month"], r["category_name"])
+                      for r in table.select(PARTITION_COLS).to_pylist()})
+    print(f"[EXPORT] {len(rows)} rows in → {table.num_rows} unique bids | "
+          f"{partitions} partitions | {len(OUTPUT_COLUMNS)} columns "
+          f"→ {args.out} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
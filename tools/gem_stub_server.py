@@ -0,0 +1,86 @@
+"""
+Local stand-in for the GeM portal that replays recorded responses.
+
+    python -m tools.gem_stub_server --pages recorded/ --port 8765
+
+Each request path maps to a file in --pages: "view_contracts/contract_search"
+is served from "view_contracts__contract_search.html" (or ".json"). GET and
+POST are treated the same; POST bodies are logged (and kept in
+server.posted as (path, form dict)) so runs can be checked.
+Point the HTTP transport at it with GemHttpTransport(base_url="http://127.0.0.1:8765/").
+
+tests/fixtures/gem_stub/ is a hand-written sample set, not a recording.
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
+
+
+def recorded_file(pages_dir, path):
+    slug = urlparse(path).path.strip("/").replace("/", "__") or "index"
+    for ext, ctype in ((".json", "application/json"), (".html", "text/html; charset=utf-8")):
+        candidate = pages_dir / f"{slug}{ext}"
+        if candidate.exists():
+            return candidate, ctype
+    return None, None
+
+
+def make_handler(pages_dir, posted=None):
+    class RecordedPagesHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real portal
+
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if body:
+                print(f"[STUB] {self.command} {self.path} ← {body.decode(errors='replace')}")
+            if posted is not None and self.command == "POST":
+                posted.append((urlparse(self.path).path, dict(parse_qsl(body.decode(errors="replace")))))
+
+            path, ctype = recorded_file(pages_dir, self.path)
+            if path is None:
+                payload, status, ctype = b"not recorded", 404, "text/plain"
+            else:
+                payload, status = path.read_bytes(), 200
+
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Set-Cookie", "ci_session=stub; Path=/")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = _serve
+        do_POST = _serve
+
+    return RecordedPagesHandler
+
+
+def serve(pages_dir, host="127.0.0.1", port=8765):
+    posted = []
+    server = ThreadingHTTPServer((host, port), make_handler(Path(pages_dir), posted))
+    server.posted = posted
+    print(f"[STUB] Serving {pages_dir} on http://{host}:{server.server_port}/")
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded GeM pages")
+    parser.add_argument("--pages", required=True, help="directory of recorded responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = serve(args.pages, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
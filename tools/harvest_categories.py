@@ -0,0 +1,72 @@
+"""
+Fill the category catalog with site ids in one browser session.
+
+    python -m tools.harvest_categories             # catalog entries still missing an id
+    python -m tools.harvest_categories --all       # refresh every entry
+    python -m tools.harvest_categories --query surg --query stapl
+
+Each query is typed into the view_contracts category dropdown once and
+every suggestion it returns (id + name) is merged into
+data/Datasets/category_catalog.json (see service/category_catalog.py).
+Afterwards the scraper selects those categories directly.
+"""
+
+import argparse
+import time
+
+import config
+from playwright_manager import PlaywrightManager
+from controller.contracts_controller import SELECT2_OPTIONS_JS, ContractsController
+from service.category_catalog import default_catalog
+
+
+def harvest(contracts, queries):
+    page, catalog = contracts.page, contracts.catalog
+    changed = 0
+    for n, query in enumerate(queries, start=1):
+        page.click(".select2-selection")
+        page.wait_for_selector("input.select2-search__field")
+        search = page.locator("input.select2-search__field")
+        search.fill(query)
+        contracts.waits.select2_results(budget_ms=1500)
+
+        options = page.evaluate(SELECT2_OPTIONS_JS)
+        new = catalog.harvest(options, query=query)
+        changed += new
+        print(f"[HARVEST] {n}/{len(queries)} '{query}' → {len(options)} suggestions"
+              f"{' (catalog updated)' if new else ''}")
+        search.press("Escape")
+
+    catalog.save()
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="re-query every catalog entry")
+    parser.add_argument("--query", action="append", default=[], help="extra dropdown query (repeatable)")
+    args = parser.parse_args()
+
+    catalog = default_catalog()
+    queries = args.query or ([e["name"] for e in catalog.entries] if args.all else catalog.missing_ids())
+    if not queries:
+        print("[HARVEST] Every catalog entry already has a site id")
+        return
+
+    browser = PlaywrightManager(headless=config.HEADLESS)
+    browser.start()
+    try:
+        contracts = ContractsController(browser)
+        contracts.reset_to_home()
+        contracts.go_to_gem_contracts()
+
+        started = time.perf_counter()
+        harvest(contracts, queries)
+        print(f"[HARVEST] {len(catalog.entries)} categories, {len(catalog.missing_ids())} without id "
+              f"({time.perf_counter() - started:.1f}s)")
+    finally:
+        browser.stop()
+
+
+if __name__ == "__main__":
+    main()
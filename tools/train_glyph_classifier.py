@@ -0,0 +1,97 @@
+"""
+Train / evaluate the glyph classifier from labelled captchas.
+
+    python -m tools.train_glyph_classifier --images labelled/ [--holdout 0.2]
+    python -m tools.train_glyph_classifier --corpus
+
+Labels come from file names ("k3x9p.png" or "k3x9p_0042.png" -> "k3x9p") or,
+with --corpus, from captchas the portal accepted (solver/captcha_corpus.py).
+The model is written to data/solver/glyph_model.npz (see glyph_classifier).
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from solver.captcha_corpus import CORPUS_PATH, CaptchaCorpus
+from solver.captcha_solver import ALLOWED
+from solver.glyph_classifier import MAX_CHARS, MIN_CHARS, MODEL_PATH, GlyphClassifier
+
+
+def load_labelled(folder):
+    samples = []
+    for path in sorted(Path(folder).iterdir()):
+        if path.suffix.lower() not in (".png", ".jpg", ".jpeg", ".gif"):
+            continue
+        label = path.stem.split("_")[0].lower()
+        if MIN_CHARS <= len(label) <= MAX_CHARS and all(c in ALLOWED for c in label):
+            samples.append((Image.open(path).copy(), label))
+    return samples
+
+
+def load_corpus(path=CORPUS_PATH, kind=None):
+    corpus = CaptchaCorpus(path)
+    try:
+        return [(image, label) for image, label, _ in corpus.labelled(kind=kind)]
+    finally:
+        corpus.close()
+
+
+def evaluate(model, samples):
+    correct = chars_ok = chars_total = 0
+    runs = []
+    for img, label in samples:
+        started = time.perf_counter()
+        text, _ = model.classify(img)
+        runs.append(time.perf_counter() - started)
+
+        correct += text == label
+        chars_total += len(label)
+        if len(text) == len(label):
+            chars_ok += sum(a == b for a, b in zip(text, label))
+
+    runs.sort()
+    n = max(1, len(samples))
+    return {
+        "captchas": len(samples),
+        "accuracy": correct / n,
+        "char_accuracy": chars_ok / max(1, chars_total),
+        "p50_ms": 1000 * runs[len(runs) // 2] if runs else 0.0,
+        "p95_ms": 1000 * runs[min(len(runs) - 1, int(len(runs) * 0.95))] if runs else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--images", help="directory of labelled captchas")
+    source.add_argument("--corpus", action="store_true", help="use accepted captchas from the corpus")
+    parser.add_argument("--holdout", type=float, default=0.2, help="share kept out for evaluation")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--out", default=str(MODEL_PATH))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    samples = load_corpus() if args.corpus else load_labelled(args.images)
+    random.Random(args.seed).shuffle(samples)
+    split = int(len(samples) * (1 - args.holdout))
+    train, holdout = samples[:split], samples[split:]
+
+    model = GlyphClassifier.train(train, k=args.k)
+    print(f"[TRAIN] {model.trained_on}/{len(train)} captchas segmented cleanly "
+          f"→ {len(model.labels)} glyph templates")
+
+    if holdout:
+        stats = evaluate(model, holdout)
+        print(f"[EVAL] {stats['captchas']} held-out | accuracy {stats['accuracy']:.1%} | "
+              f"chars {stats['char_accuracy']:.1%} | p50 {stats['p50_ms']:.1f} ms | p95 {stats['p95_ms']:.1f} ms")
+
+    model.save(args.out)
+    print(f"[TRAIN] Saved model → {args.out}")
+
+
+if __name__ == "__main__":
+    main()